@@ -1,5 +1,7 @@
 from .animation import Animation
 from .easing import Easing
 from .transition import Transition
+from .ticker import AnimationTicker
+from .group import AnimationGroup
 
-__all__ = ['Animation', 'Easing', 'Transition'] 
\ No newline at end of file
+__all__ = ['Animation', 'Easing', 'Transition', 'AnimationTicker', 'AnimationGroup'] 
\ No newline at end of file
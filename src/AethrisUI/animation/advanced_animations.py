@@ -1,7 +1,9 @@
-from typing import Dict, Any, List, Callable, Optional
+from typing import Dict, Any, List, Callable, Optional, Union
 from dataclasses import dataclass
 import math
-import time
+import numpy as np
+from .easing import Easing
+from .ticker import AnimationTicker
 
 @dataclass
 class AnimationKeyframe:
@@ -22,13 +24,67 @@ class AdvancedAnimation:
         self.repeat: bool = False
         self.reverse: bool = False
         self.on_complete: Optional[Callable] = None
+        self._on_update: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._ticker: Optional[AnimationTicker] = None
+        self._start_time = 0.0
+        self._is_running = False
+        self._finished = False
     
-    def add_keyframe(self, properties: Dict[str, Any], time: float, easing: Callable = None):
-        if easing is None:
-            easing = lambda x: x  # Linear
+    def add_keyframe(self, properties: Dict[str, Any], time: float, easing: Union[Callable, str] = None):
+        easing = Easing.get_easing_function(easing)
         self.keyframes.append(AnimationKeyframe(properties, time, easing))
         self.keyframes.sort(key=lambda k: k.time)
     
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+    
+    def start(self, on_update: Callable[[Dict[str, Any]], None], ticker: Optional[AnimationTicker] = None):
+        """Avvia l'animazione: on_update riceve le proprietà interpolate a ogni frame"""
+        self.stop()
+        self._on_update = on_update
+        self._ticker = ticker if ticker is not None else AnimationTicker.get_current()
+        self._start_time = self._ticker.time()
+        self._is_running = True
+        self._finished = False
+        self._ticker.add(self)
+    
+    def stop(self):
+        self._is_running = False
+        if self._ticker is not None:
+            self._ticker.remove(self)
+    
+    def progress_at(self, now: float) -> float:
+        """
+        Progress (0-1) al timestamp now. Con repeat l'animazione ricomincia a
+        ogni ciclo e con reverse i cicli dispari vanno all'indietro
+        """
+        elapsed = (now - self._start_time) / (self.duration / 1000) if self.duration > 0 else 1.0
+        if not self.repeat:
+            return min(1.0, max(0.0, elapsed))
+        cycle = int(elapsed)
+        progress = elapsed - cycle
+        if self.reverse and cycle % 2 == 1:
+            progress = 1.0 - progress
+        return progress
+    
+    def advance(self, now: float) -> Optional[Dict[str, Any]]:
+        if not self._is_running:
+            return None
+        progress = self.progress_at(now)
+        if not self.repeat and progress >= 1.0:
+            self._is_running = False
+            self._finished = True
+        return self.interpolate(progress)
+    
+    def dispatch(self, values: Dict[str, Any]):
+        if self._on_update is not None:
+            self._on_update(values)
+        if self._finished:
+            self._finished = False
+            if self.on_complete is not None:
+                self.on_complete()
+    
     def interpolate(self, progress: float) -> Dict[str, Any]:
         if not self.keyframes:
             return {}
@@ -64,11 +120,196 @@ class AdvancedAnimation:
         return result 
 
 class SpringAnimation:
-    def __init__(self, tension: float = 170, friction: float = 26):
+    """
+    Molle smorzate (massa, tension, friction) risolte in forma chiusa.
+
+    Ogni proprietà segue l'oscillatore armonico smorzato verso il proprio
+    target: posizione e velocità si calcolano dalla soluzione analitica al
+    tempo trascorso dall'ultimo cambio di target, quindi il risultato non
+    dipende dalla frequenza dei frame. Tutte le molle di un'istanza
+    avanzano insieme in un passaggio NumPy per frame; una molla è a riposo
+    quando spostamento e velocità scendono sotto le soglie, e a quel punto
+    viene fissata sul target. animate() durante il movimento cambia il
+    target conservando posizione e velocità correnti.
+
+    on_update riceve a ogni frame {proprietà: valore} delle molle in moto.
+    """
+    
+    def __init__(self, tension: float = 170, friction: float = 26, mass: float = 1.0,
+                 on_update: Optional[Callable[[Dict[str, float]], Any]] = None,
+                 ticker: Optional[AnimationTicker] = None,
+                 rest_displacement: float = 0.01, rest_velocity: float = 0.01):
+        if tension <= 0 or mass <= 0 or friction < 0:
+            raise ValueError("tension e mass devono essere positivi, friction non negativo")
         self.tension = tension
         self.friction = friction
+        self.mass = mass
+        self.on_update = on_update
+        self.rest_displacement = rest_displacement
+        self.rest_velocity = rest_velocity
         self.states: Dict[str, AnimationState] = {}
+        self._ticker = ticker
+        self._is_running = False
+        # Una colonna per proprietà: spostamento e velocità all'ultimo
+        # cambio di target, target e istante del cambio
+        self._slots: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._x0 = np.zeros(0)
+        self._v0 = np.zeros(0)
+        self._targets = np.zeros(0)
+        self._t0 = np.zeros(0)
+        self._moving = np.zeros(0, dtype=bool)
+    
+    @property
+    def ticker(self) -> AnimationTicker:
+        if self._ticker is None:
+            self._ticker = AnimationTicker.get_current()
+        return self._ticker
+    
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+    
+    def _slot(self, property: str) -> int:
+        slot = self._slots.get(property)
+        if slot is None:
+            slot = self._slots[property] = len(self._names)
+            self._names.append(property)
+            if slot >= len(self._x0):
+                capacity = max(8, 2 * len(self._x0))
+                for name in ("_x0", "_v0", "_targets", "_t0", "_moving"):
+                    array = getattr(self, name)
+                    grown = np.zeros(capacity, dtype=array.dtype)
+                    grown[:len(array)] = array
+                    setattr(self, name, grown)
+        return slot
+    
+    def _solve(self, x0: np.ndarray, v0: np.ndarray, t: np.ndarray):
+        """Spostamento e velocità dopo t secondi partendo da (x0, v0)"""
+        omega = math.sqrt(self.tension / self.mass)
+        zeta = self.friction / (2 * math.sqrt(self.tension * self.mass))
+        if zeta < 1:
+            # Sottosmorzata: oscillazione che si attenua
+            omega_d = omega * math.sqrt(1 - zeta * zeta)
+            decay = np.exp(-zeta * omega * t)
+            a = x0
+            b = (v0 + zeta * omega * x0) / omega_d
+            cos = np.cos(omega_d * t)
+            sin = np.sin(omega_d * t)
+            x = decay * (a * cos + b * sin)
+            v = decay * ((b * omega_d - zeta * omega * a) * cos - (a * omega_d + zeta * omega * b) * sin)
+        elif zeta == 1:
+            # Smorzamento critico
+            decay = np.exp(-omega * t)
+            b = v0 + omega * x0
+            x = decay * (x0 + b * t)
+            v = decay * (b - omega * (x0 + b * t))
+        else:
+            # Sovrasmorzata: somma di due esponenziali
+            root = omega * math.sqrt(zeta * zeta - 1)
+            r1 = -zeta * omega + root
+            r2 = -zeta * omega - root
+            a = (v0 - r2 * x0) / (r1 - r2)
+            b = x0 - a
+            e1 = np.exp(r1 * t)
+            e2 = np.exp(r2 * t)
+            x = a * e1 + b * e2
+            v = a * r1 * e1 + b * r2 * e2
+        return x, v
+    
+    def _current(self, slot: int, now: float):
+        if not self._moving[slot]:
+            return float(self._targets[slot]), 0.0
+        x, v = self._solve(self._x0[slot:slot + 1], self._v0[slot:slot + 1],
+                           np.array([max(0.0, now - self._t0[slot])]))
+        return float(self._targets[slot] + x[0]), float(v[0])
+    
+    def set_value(self, property: str, value: float):
+        """Porta subito la proprietà a value, ferma"""
+        slot = self._slot(property)
+        self._targets[slot] = value
+        self._x0[slot] = self._v0[slot] = 0.0
+        self._moving[slot] = False
+        self.states[property] = AnimationState(value, 0.0, value)
+    
+    def get_value(self, property: str, now: Optional[float] = None) -> float:
+        slot = self._slots[property]
+        return self._current(slot, self.ticker.time() if now is None else now)[0]
+    
+    def animate(self, property: str, target: Any, from_value: Optional[float] = None,
+                velocity: Optional[float] = None):
+        """
+        Muove la proprietà verso target. Se è già in moto la molla riparte
+        da posizione e velocità correnti, salvo from_value/velocity espliciti;
+        una proprietà mai vista senza from_value parte già sul target
+        """
+        now = self.ticker.time()
+        slot = self._slots.get(property)
+        if slot is None:
+            slot = self._slot(property)
+            value, current_velocity = (target if from_value is None else from_value), 0.0
+        else:
+            value, current_velocity = self._current(slot, now)
+        if from_value is not None:
+            value = from_value
+        if velocity is not None:
+            current_velocity = velocity
+        
+        self._targets[slot] = target
+        self._x0[slot] = value - target
+        self._v0[slot] = current_velocity
+        self._t0[slot] = now
+        self.states[property] = AnimationState(value, current_velocity, target)
+        if self._at_rest(value - target, current_velocity):
+            self._moving[slot] = False
+            self.states[property].value = target
+            return
+        self._moving[slot] = True
+        if not self._is_running:
+            self._is_running = True
+            self.ticker.add(self)
+    
+    def _at_rest(self, displacement, velocity):
+        return (np.abs(displacement) < self.rest_displacement) & (np.abs(velocity) < self.rest_velocity)
+    
+    def stop(self, property: Optional[str] = None):
+        """Ferma la proprietà (o tutte) nella posizione corrente"""
+        now = self.ticker.time()
+        for name in ([property] if property is not None else list(self._names)):
+            slot = self._slots[name]
+            if self._moving[slot]:
+                self.set_value(name, self._current(slot, now)[0])
+        if not self._moving[:len(self._names)].any() and self._is_running:
+            self._is_running = False
+            self.ticker.remove(self)
+    
+    def advance(self, now: float) -> Optional[Dict[str, float]]:
+        count = len(self._names)
+        slots = np.flatnonzero(self._moving[:count])
+        if len(slots) == 0:
+            self._is_running = False
+            return None
+        
+        x, v = self._solve(self._x0[slots], self._v0[slots], np.maximum(0.0, now - self._t0[slots]))
+        rest = self._at_rest(x, v)
+        if rest.any():
+            # A riposo: la molla si ferma esattamente sul target
+            x[rest] = 0.0
+            v[rest] = 0.0
+            self._moving[slots[rest]] = False
+            self._is_running = bool(self._moving[:count].any())
+        values = self._targets[slots] + x
+        
+        result = {}
+        names, states = self._names, self.states
+        for slot, value, velocity in zip(slots.tolist(), values.tolist(), v.tolist()):
+            name = names[slot]
+            state = states[name]
+            state.value = value
+            state.velocity = velocity
+            result[name] = value
+        return result
     
-    def animate(self, property: str, target: Any):
-        # Implementare animazioni spring physics
-        pass
\ No newline at end of file
+    def dispatch(self, values: Dict[str, float]):
+        if self.on_update is not None:
+            self.on_update(values)
\ No newline at end of file
@@ -1,7 +1,7 @@
-from typing import Dict, Any, List, Callable, Optional
+from typing import Dict, Any, List, Callable, Optional, Union
 from dataclasses import dataclass
 from .easing import Easing
-import time
+from .ticker import AnimationTicker
 
 @dataclass
 class KeyFrame:
@@ -16,49 +16,67 @@ class Animation:
         self._start_time = 0
         self._is_running = False
         self._on_update: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._ticker: Optional[AnimationTicker] = None
     
-    def add_keyframe(self, properties: Dict[str, Any], time: float, easing: Callable = None):
-        if easing is None:
-            easing = Easing.linear
+    def add_keyframe(self, properties: Dict[str, Any], time: float, easing: Union[Callable, str] = None):
+        easing = Easing.get_easing_function(easing)
         self.keyframes.append(KeyFrame(properties, time, easing))
         self.keyframes.sort(key=lambda k: k.time)
     
-    def start(self, on_update: Callable[[Dict[str, Any]], None]):
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+    
+    def start(self, on_update: Callable[[Dict[str, Any]], None], ticker: Optional[AnimationTicker] = None):
+        """
+        Avvia l'animazione sul ticker indicato (di default quello corrente):
+        on_update riceve i valori interpolati una volta per frame
+        """
+        self.stop()
         self._on_update = on_update
-        self._start_time = time.time()
+        self._ticker = ticker if ticker is not None else AnimationTicker.get_current()
+        self._start_time = self._ticker.time()
         self._current_frame = 0
-        self._is_running = True
-        self._update()
+        self._is_running = bool(self.keyframes)
+        if self._is_running:
+            self._ticker.add(self)
+    
+    def stop(self):
+        self._is_running = False
+        if self._ticker is not None:
+            self._ticker.remove(self)
     
-    def _update(self):
+    def advance(self, now: float) -> Optional[Dict[str, Any]]:
+        """Avanza al timestamp del frame e restituisce i valori interpolati"""
         if not self._is_running:
-            return
+            return None
+        return self._update(now - self._start_time)
+    
+    def dispatch(self, values: Dict[str, Any]):
+        if self._on_update:
+            self._on_update(values)
+    
+    def _update(self, current_time: float) -> Dict[str, Any]:
+        keyframes = self.keyframes
+        # Un frame in ritardo può superare più keyframe
+        while self._current_frame + 1 < len(keyframes) and current_time >= keyframes[self._current_frame + 1].time:
+            self._current_frame += 1
         
-        current_time = time.time() - self._start_time
-        current_frame = self.keyframes[self._current_frame]
-        next_frame = self.keyframes[self._current_frame + 1] if self._current_frame + 1 < len(self.keyframes) else None
+        if self._current_frame >= len(keyframes) - 1:
+            self._is_running = False
+            return keyframes[-1].properties
         
-        if next_frame and current_time >= next_frame.time:
-            self._current_frame += 1
-            if self._current_frame >= len(self.keyframes) - 1:
-                self._is_running = False
-                if self._on_update:
-                    self._on_update(self.keyframes[-1].properties)
-                return
+        current_frame = keyframes[self._current_frame]
+        next_frame = keyframes[self._current_frame + 1]
+        progress = (current_time - current_frame.time) / (next_frame.time - current_frame.time)
+        progress = min(1.0, max(0.0, progress))
+        eased_progress = next_frame.easing(progress)
         
-        if next_frame:
-            progress = (current_time - current_frame.time) / (next_frame.time - current_frame.time)
-            progress = min(1.0, max(0.0, progress))
-            eased_progress = next_frame.easing(progress)
-            
-            interpolated = self._interpolate(
-                current_frame.properties,
-                next_frame.properties,
-                eased_progress
-            )
-            
-            if self._on_update:
-                self._on_update(interpolated)
+        return self._interpolate(
+            current_frame.properties,
+            next_frame.properties,
+            eased_progress
+        )
     
     def _interpolate(self, start: Dict[str, Any], end: Dict[str, Any], progress: float) -> Dict[str, Any]:
         result = {}
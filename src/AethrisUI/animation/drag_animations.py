@@ -1,13 +1,14 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Callable, Optional
 from ..core import VirtualNode
-from .easing import Easing
+from .advanced_animations import SpringAnimation
+from .ticker import AnimationTicker
 
 class DragAnimations:
     @staticmethod
     def create_lift_animation(scale: float = 1.05, duration: int = 200) -> Dict[str, Any]:
         return {
             "transform": f"scale({scale})",
-            "transition": f"transform {duration}ms {Easing.ease_out}",
+            "transition": f"transform {duration}ms ease-out",
             "box-shadow": "0 8px 16px rgba(0,0,0,0.2)",
             "z-index": 1000
         }
@@ -16,7 +17,42 @@ class DragAnimations:
     def create_drop_animation(original_position: Tuple[int, int], duration: int = 300) -> Dict[str, Any]:
         return {
             "transform": "scale(1)",
-            "transition": f"all {duration}ms {Easing.ease_out}",
+            "transition": f"all {duration}ms ease-out",
             "left": f"{original_position[0]}px",
             "top": f"{original_position[1]}px"
-        } 
\ No newline at end of file
+        }
+    
+    @staticmethod
+    def create_drag_spring(on_update: Callable[[Dict[str, float]], Any], tension: float = 300,
+                           friction: float = 30, ticker: Optional[AnimationTicker] = None) -> SpringAnimation:
+        """
+        Molla per l'elemento trascinato: on_update riceve a ogni frame i
+        valori in moto tra left, top e scale
+        """
+        return SpringAnimation(tension, friction, on_update=on_update, ticker=ticker)
+    
+    @staticmethod
+    def _move(spring: SpringAnimation, property: str, target: float, initial: float):
+        if property not in spring.states:
+            spring.set_value(property, initial)
+        spring.animate(property, target)
+    
+    @staticmethod
+    def lift(spring: SpringAnimation, scale: float = 1.05):
+        DragAnimations._move(spring, "scale", scale, 1.0)
+    
+    @staticmethod
+    def follow(spring: SpringAnimation, position: Tuple[float, float]):
+        """
+        Insegue il puntatore: ogni nuova posizione cambia il target della
+        molla senza azzerarne la velocità
+        """
+        DragAnimations._move(spring, "left", position[0], position[0])
+        DragAnimations._move(spring, "top", position[1], position[1])
+    
+    @staticmethod
+    def drop(spring: SpringAnimation, position: Tuple[float, float]):
+        """Rilascia l'elemento: torna in scala 1 e si assesta su position"""
+        DragAnimations._move(spring, "left", position[0], position[0])
+        DragAnimations._move(spring, "top", position[1], position[1])
+        DragAnimations._move(spring, "scale", 1.0, 1.0)
\ No newline at end of file
@@ -1,6 +1,75 @@
+from typing import Callable, Dict, Union
 import math
+import re
+import numpy as np
+
+EasingFunction = Callable[[float], float]
+
+_CUBIC_BEZIER = re.compile(r"^cubic-bezier\(\s*([^,\s]+)\s*,\s*([^,\s]+)\s*,\s*([^,\s]+)\s*,\s*([^,\s)]+)\s*\)$")
+_CAMEL_CASE = re.compile(r"(?<=[a-z0-9])([A-Z])")
+
+class CubicBezier:
+    """
+    Curva di easing cubic-bezier(x1, y1, x2, y2) come nelle transizioni CSS.
+
+    La curva viene risolta una sola volta alla creazione in una tabella di
+    samples + 1 valori su progress equidistanti; la valutazione è una
+    ricerca nella tabella con interpolazione lineare. Accetta anche array
+    NumPy di progress.
+    """
+    
+    def __init__(self, x1: float, y1: float, x2: float, y2: float, samples: int = 256):
+        if not (0 <= x1 <= 1 and 0 <= x2 <= 1):
+            raise ValueError("Le ascisse dei punti di controllo devono essere tra 0 e 1")
+        self.points = (x1, y1, x2, y2)
+        self.samples = samples
+        self._grid = np.linspace(0.0, 1.0, samples + 1)
+        table = self._solve(self._grid)
+        self._table = table
+        self._values = table.tolist()
+    
+    @staticmethod
+    def _bezier(p1: float, p2: float, t: np.ndarray) -> np.ndarray:
+        # Coordinata di una cubica con estremi 0 e 1
+        u = 1 - t
+        return 3 * u * u * t * p1 + 3 * u * t * t * p2 + t * t * t
+    
+    def _solve(self, x: np.ndarray) -> np.ndarray:
+        x1, y1, x2, y2 = self.points
+        # Stima iniziale di t per ogni x dalla curva campionata fittamente
+        dense = np.linspace(0.0, 1.0, 8 * self.samples + 1)
+        t = np.interp(x, self._bezier(x1, x2, dense), dense)
+        # Affinamento con Newton dove la derivata non è troppo piccola
+        for _ in range(4):
+            error = self._bezier(x1, x2, t) - x
+            u = 1 - t
+            slope = 3 * u * u * x1 + 6 * u * t * (x2 - x1) + 3 * t * t * (1 - x2)
+            step = np.where(np.abs(slope) > 1e-6, error / np.where(slope == 0, 1, slope), 0.0)
+            t = np.clip(t - step, 0.0, 1.0)
+        y = self._bezier(y1, y2, t)
+        y[0], y[-1] = 0.0, 1.0
+        return y
+    
+    def __call__(self, t):
+        if isinstance(t, np.ndarray):
+            return np.interp(np.clip(t, 0.0, 1.0), self._grid, self._table)
+        if t <= 0:
+            return 0.0
+        if t >= 1:
+            return 1.0
+        position = t * self.samples
+        index = int(position)
+        values = self._values
+        start = values[index]
+        return start + (values[index + 1] - start) * (position - index)
+    
+    def __repr__(self) -> str:
+        return "cubic-bezier({}, {}, {}, {})".format(*self.points)
 
 class Easing:
+    # Funzioni già risolte, per nome o per definizione cubic-bezier
+    _registry: Dict[str, EasingFunction] = {}
+    
     @staticmethod
     def linear(t: float) -> float:
         return t
@@ -26,4 +95,73 @@ class Easing:
         elif t < 9/10:
             return (4356/361 * t * t) - (35442/1805 * t) + 16061/1805
         else:
-            return (54/5 * t * t) - (513/25 * t) + 268/25 
\ No newline at end of file
+            return (54/5 * t * t) - (513/25 * t) + 268/25
+    
+    @classmethod
+    def cubic_bezier(cls, x1: float, y1: float, x2: float, y2: float) -> EasingFunction:
+        """Curva cubic-bezier condivisa: ogni definizione viene risolta una volta"""
+        key = f"cubic-bezier({float(x1)},{float(y1)},{float(x2)},{float(y2)})"
+        function = cls._registry.get(key)
+        if function is None:
+            if (x1, y1, x2, y2) == (0, 0, 1, 1):
+                function = cls.linear
+            else:
+                function = CubicBezier(x1, y1, x2, y2)
+            cls._registry[key] = function
+        return function
+    
+    @classmethod
+    def register(cls, name: str, function: EasingFunction):
+        """Registra una funzione di easing con un nome"""
+        cls._registry[name] = function
+    
+    @classmethod
+    def get_easing_function(cls, easing: Union[str, EasingFunction, None]) -> EasingFunction:
+        """
+        Restituisce la funzione di easing per un nome ("ease-out",
+        "ease_in_out", "easeOutCubic"), una definizione
+        "cubic-bezier(x1, y1, x2, y2)" o una funzione già pronta.
+
+        Le grafie di uno stesso nome sono equivalenti: "ease-in", "ease_in"
+        e "easeIn" sono tutte la curva CSS cubic-bezier(0.42, 0, 1, 1), come
+        negli stili. I metodi Easing.ease_in, ease_out e ease_in_out restano
+        le curve polinomiali, da passare direttamente come funzioni.
+        """
+        if easing is None:
+            return cls.linear
+        if callable(easing):
+            return easing
+        function = cls._registry.get(easing)
+        if function is not None:
+            return function
+        
+        name = easing.strip()
+        match = _CUBIC_BEZIER.match(name)
+        if match:
+            try:
+                points = [float(value) for value in match.groups()]
+            except ValueError:
+                raise ValueError(f"cubic-bezier non valida: {easing}") from None
+            function = cls.cubic_bezier(*points)
+        else:
+            # easeOutCubic e ease-out-cubic -> ease_out_cubic
+            function = cls._registry.get(_CAMEL_CASE.sub(r"_\1", name).lower().replace("-", "_"))
+            if function is None:
+                raise ValueError(f"Easing sconosciuto: {easing}")
+        cls._registry[easing] = function
+        return function
+
+# Parole chiave CSS, registrate con la grafia a underscore a cui si
+# riconducono anche "ease-in" e "easeIn"
+for _name in ("linear", "bounce"):
+    Easing.register(_name, getattr(Easing, _name))
+for _name, _points in {
+    "ease": (0.25, 0.1, 0.25, 1.0),
+    "ease_in": (0.42, 0.0, 1.0, 1.0),
+    "ease_out": (0.0, 0.0, 0.58, 1.0),
+    "ease_in_out": (0.42, 0.0, 0.58, 1.0),
+    "ease_in_cubic": (0.32, 0.0, 0.67, 0.0),
+    "ease_out_cubic": (0.33, 1.0, 0.68, 1.0),
+    "ease_in_out_cubic": (0.65, 0.0, 0.35, 1.0),
+}.items():
+    Easing.register(_name, Easing.cubic_bezier(*_points))
\ No newline at end of file
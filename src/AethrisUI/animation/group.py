@@ -0,0 +1,203 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+import numpy as np
+from .easing import Easing
+from .ticker import AnimationTicker
+
+EasingFunction = Callable[[float], float]
+
+def _apply_easing(easing: EasingFunction, progress: np.ndarray) -> np.ndarray:
+    """Applica l'easing a un array di progress"""
+    try:
+        result = easing(progress)
+    except (TypeError, ValueError):
+        # Easing con rami su valori scalari (es. bounce): un elemento alla volta
+        return np.frompyfunc(easing, 1, 1)(progress).astype(np.float64)
+    return np.broadcast_to(np.asarray(result, dtype=np.float64), progress.shape)
+
+class AnimationGroup:
+    """
+    Gruppo di animazioni a keyframe numeriche eseguite insieme, es. il
+    riordino di una lista o la transizione dei punti di un grafico.
+
+    Gli elementi condividono i tempi dei keyframe (in secondi) e le
+    proprietà animate; i valori sono in un array elementi × keyframe ×
+    proprietà. A ogni frame i segmenti di tutti gli elementi vengono trovati
+    con searchsorted e tutte le proprietà interpolate in un solo passaggio
+    vettoriale. Ogni elemento può avere un ritardo, per animazioni sfalsate.
+
+    easing è una funzione unica o una per segmento (len(times) - 1), come
+    l'easing di un KeyFrame verso il keyframe successivo. on_update riceve
+    un array elementi × proprietà con le colonne nell'ordine di properties.
+    """
+
+    def __init__(self, properties: Sequence[str], times: Sequence[float],
+                 easing: Union[EasingFunction, str, Sequence[Union[EasingFunction, str]], None] = None):
+        if not properties:
+            raise ValueError("Serve almeno una proprietà")
+        self.properties = list(properties)
+        self._property_index = {name: index for index, name in enumerate(self.properties)}
+        self.times = np.asarray(times, dtype=np.float64)
+        if self.times.ndim != 1 or len(self.times) == 0:
+            raise ValueError("times deve essere una sequenza non vuota")
+        if np.any(np.diff(self.times) < 0):
+            raise ValueError("I tempi dei keyframe devono essere crescenti")
+        segments = max(len(self.times) - 1, 1)
+        spans = np.diff(self.times) if len(self.times) > 1 else np.ones(1)
+        # Segmenti di durata nulla: il salto avviene subito
+        self._spans = np.where(spans > 0, spans, 1.0)
+
+        easings = list(easing) if isinstance(easing, (list, tuple)) else [easing] * segments
+        # Accetta anche nomi e definizioni cubic-bezier
+        easings = [Easing.get_easing_function(function) for function in easings]
+        if len(easings) != segments:
+            raise ValueError(f"Servono {segments} funzioni di easing, una per segmento")
+        # Le funzioni distinte vengono applicate una volta ciascuna per frame
+        self._easings: List[EasingFunction] = []
+        ids = []
+        for function in easings:
+            if function not in self._easings:
+                self._easings.append(function)
+            ids.append(self._easings.index(function))
+        self._easing_ids = np.asarray(ids, dtype=np.intp)
+
+        self._values = np.zeros((0, len(self.times), len(self.properties)), dtype=np.float64)
+        self._delays = np.zeros(0, dtype=np.float64)
+        self._count = 0
+
+        self._on_update: Optional[Callable[[np.ndarray], Any]] = None
+        self._ticker: Optional[AnimationTicker] = None
+        self._start_time = 0.0
+        self._is_running = False
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def duration(self) -> float:
+        """Durata complessiva in secondi, ritardi compresi"""
+        last_delay = self._delays[:self._count].max() if self._count else 0.0
+        return float(self.times[-1] + last_delay)
+
+    # Elementi
+
+    def _reserve(self, count: int):
+        capacity = len(self._values)
+        if count <= capacity:
+            return
+        capacity = max(count, capacity * 2, 16)
+        values = np.zeros((capacity,) + self._values.shape[1:], dtype=np.float64)
+        values[:self._count] = self._values[:self._count]
+        delays = np.zeros(capacity, dtype=np.float64)
+        delays[:self._count] = self._delays[:self._count]
+        self._values, self._delays = values, delays
+
+    def _as_tracks(self, values: Any, count: int) -> np.ndarray:
+        tracks = np.asarray(values, dtype=np.float64)
+        shape = (count, len(self.times), len(self.properties))
+        if tracks.shape != shape:
+            raise ValueError(f"Valori di forma {tracks.shape}, attesa {shape}")
+        return tracks
+
+    def add(self, values: Any, delay: float = 0.0) -> int:
+        """
+        Aggiunge un elemento con i valori keyframe × proprietà;
+        restituisce il suo indice
+        """
+        return self.add_many([values], [delay])
+
+    def add_many(self, values: Any, delays: Optional[Sequence[float]] = None) -> int:
+        """
+        Aggiunge più elementi (elementi × keyframe × proprietà);
+        restituisce l'indice del primo
+        """
+        values = np.asarray(values, dtype=np.float64)
+        count = len(values)
+        tracks = self._as_tracks(values, count)
+        first = self._count
+        self._reserve(first + count)
+        self._values[first:first + count] = tracks
+        self._delays[first:first + count] = 0.0 if delays is None else delays
+        self._count += count
+        return first
+
+    def set_values(self, index: int, values: Any, delay: Optional[float] = None):
+        """Sostituisce i keyframe dell'elemento index"""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        self._values[index] = self._as_tracks(values, 1)[0]
+        if delay is not None:
+            self._delays[index] = delay
+
+    def clear(self):
+        self._count = 0
+
+    # Interpolazione
+
+    def values_at(self, elapsed: float) -> np.ndarray:
+        """Valori di tutti gli elementi dopo elapsed secondi dall'avvio"""
+        count = self._count
+        values = self._values[:count]
+        times = self.times
+        if len(times) == 1:
+            return values[:, 0].copy()
+
+        local = np.clip(elapsed - self._delays[:count], times[0], times[-1])
+        # Segmento [times[k], times[k + 1]) di ciascun elemento
+        segments = np.searchsorted(times, local, side='right') - 1
+        np.clip(segments, 0, len(times) - 2, out=segments)
+        progress = (local - times[segments]) / self._spans[segments]
+        np.clip(progress, 0.0, 1.0, out=progress)
+
+        if len(self._easings) == 1:
+            eased = _apply_easing(self._easings[0], progress)
+        else:
+            eased = np.empty_like(progress)
+            easing_ids = self._easing_ids[segments]
+            for easing_id, easing in enumerate(self._easings):
+                mask = easing_ids == easing_id
+                if mask.any():
+                    eased[mask] = _apply_easing(easing, progress[mask])
+
+        rows = np.arange(count)
+        start = values[rows, segments]
+        end = values[rows, segments + 1]
+        return start + (end - start) * eased[:, None]
+
+    def property_values(self, values: np.ndarray, name: str) -> np.ndarray:
+        """Colonna della proprietà name in un risultato di values_at"""
+        return values[:, self._property_index[name]]
+
+    def element_values(self, values: np.ndarray, index: int) -> Dict[str, float]:
+        """Proprietà dell'elemento index come dizionario, come Animation"""
+        return dict(zip(self.properties, values[index].tolist()))
+
+    # Esecuzione sul ticker
+
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+
+    def start(self, on_update: Callable[[np.ndarray], Any], ticker: Optional[AnimationTicker] = None):
+        self.stop()
+        self._on_update = on_update
+        self._ticker = ticker if ticker is not None else AnimationTicker.get_current()
+        self._start_time = self._ticker.time()
+        self._is_running = True
+        self._ticker.add(self)
+
+    def stop(self):
+        self._is_running = False
+        if self._ticker is not None:
+            self._ticker.remove(self)
+
+    def advance(self, now: float) -> Optional[np.ndarray]:
+        if not self._is_running:
+            return None
+        elapsed = now - self._start_time
+        if elapsed >= self.duration:
+            self._is_running = False
+        return self.values_at(elapsed)
+
+    def dispatch(self, values: np.ndarray):
+        if self._on_update is not None:
+            self._on_update(values)
@@ -0,0 +1,101 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..core.scheduler import FrameScheduler
+
+class AnimationTicker:
+    """
+    Orologio condiviso delle animazioni, pilotato dal FrameScheduler.
+
+    Tutte le animazioni attive avanzano nella stessa callback
+    requestAnimationFrame e ricevono il timestamp del frame, unica lettura
+    del clock per frame. I valori vengono prima calcolati per tutte le
+    animazioni e poi consegnati insieme: le callback di aggiornamento e
+    on_frame (con l'intero lotto) vengono chiamate una dopo l'altra, così i
+    setter di stato che richiamano confluiscono in un unico task dello
+    scheduler, eseguito nello stesso frame. Senza animazioni attive il
+    ticker non richiede frame e lo scheduler resta inattivo.
+
+    Un'animazione gestita dal ticker espone:
+    - advance(now): avanza al timestamp e restituisce i valori del frame
+      (None se non ce ne sono)
+    - dispatch(values): consegna i valori alla propria callback
+    - is_running: False quando è terminata
+    """
+
+    _current: Optional['AnimationTicker'] = None
+
+    def __init__(self, scheduler: Optional[FrameScheduler] = None,
+                 on_frame: Optional[Callable[[List[Tuple[Any, Any]]], Any]] = None):
+        self.scheduler = scheduler if scheduler is not None else FrameScheduler()
+        # Riceve [(animazione, valori), ...] una volta per frame
+        self.on_frame = on_frame
+        self.frame_time: Optional[float] = None
+        self._animations: Dict[int, Any] = {}
+        self._handle: Optional[int] = None
+        self._in_frame = False
+
+    @classmethod
+    def get_current(cls) -> 'AnimationTicker':
+        """Ticker usato dalle animazioni avviate senza indicarne uno"""
+        if cls._current is None:
+            cls._current = cls()
+        return cls._current
+
+    @classmethod
+    def set_current(cls, ticker: Optional['AnimationTicker']):
+        cls._current = ticker
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self._animations)
+
+    def __len__(self) -> int:
+        return len(self._animations)
+
+    def time(self) -> float:
+        """Timestamp del frame in corso, altrimenti il clock dello scheduler"""
+        return self.frame_time if self._in_frame else self.scheduler.clock()
+
+    def add(self, animation: Any):
+        self._animations[id(animation)] = animation
+        self._request_frame()
+
+    def remove(self, animation: Any):
+        if self._animations.pop(id(animation), None) is not None and not self._animations:
+            self._cancel_frame()
+
+    def clear(self):
+        self._animations.clear()
+        self._cancel_frame()
+
+    def _request_frame(self):
+        if self._handle is None and self._animations:
+            self._handle = self.scheduler.request_animation_frame(self._tick)
+
+    def _cancel_frame(self):
+        if self._handle is not None:
+            self.scheduler.cancel_animation_frame(self._handle)
+            self._handle = None
+
+    def _tick(self, now: float):
+        self._handle = None
+        self.frame_time = now
+        self._in_frame = True
+        try:
+            updates = []
+            for key, animation in list(self._animations.items()):
+                values = animation.advance(now)
+                if values is not None:
+                    updates.append((animation, values))
+                # Le animazioni terminate escono prima della consegna, così una
+                # callback può riavviarle
+                if not animation.is_running:
+                    self._animations.pop(key, None)
+
+            for animation, values in updates:
+                animation.dispatch(values)
+            if updates and self.on_frame is not None:
+                self.on_frame(updates)
+        finally:
+            self._in_frame = False
+            # Il frame successivo viene richiesto solo se resta qualcosa da animare
+            self._request_frame()
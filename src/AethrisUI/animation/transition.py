@@ -1,7 +1,7 @@
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 from dataclasses import dataclass
 from .easing import Easing
-import time
+from .ticker import AnimationTicker
 
 @dataclass
 class Transition:
@@ -17,17 +17,59 @@ class Transition:
         self._start_value = None
         self._end_value = None
         self._start_time = None
+        self._is_running = False
+        self._on_update: Optional[Callable[[Any], Any]] = None
+        self._ticker: Optional[AnimationTicker] = None
     
-    def start(self, start_value: Any, end_value: Any):
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+    
+    def start(self, start_value: Any, end_value: Any,
+              on_update: Optional[Callable[[Any], Any]] = None,
+              ticker: Optional[AnimationTicker] = None):
+        """
+        Avvia la transizione. Con on_update il valore viene consegnato a
+        ogni frame dal ticker; senza, si legge con get_current_value()
+        """
+        self.stop()
         self._start_value = start_value
         self._end_value = end_value
-        self._start_time = time.time()
+        self._on_update = on_update
+        self._ticker = ticker if ticker is not None else AnimationTicker.get_current()
+        self._start_time = self._ticker.time()
+        self._is_running = True
+        if on_update is not None:
+            self._ticker.add(self)
+    
+    def stop(self):
+        self._is_running = False
+        if self._ticker is not None:
+            self._ticker.remove(self)
+    
+    def advance(self, now: float) -> Any:
+        value = self.get_current_value(now)
+        if self._progress(now) >= 1:
+            self._is_running = False
+        return value
     
-    def get_current_value(self) -> Any:
-        if not self._start_time:
+    def dispatch(self, value: Any):
+        if self._on_update is not None:
+            self._on_update(value)
+    
+    def _progress(self, now: float) -> float:
+        if self.duration <= 0:
+            return 1.0
+        return (now - self._start_time) / (self.duration / 1000)
+    
+    def get_current_value(self, now: Optional[float] = None) -> Any:
+        """Valore al timestamp now (di default il tempo corrente del ticker)"""
+        if self._start_time is None:
             return self._end_value
-            
-        progress = (time.time() - self._start_time) / (self.duration / 1000)
+        
+        if now is None:
+            now = self._ticker.time()
+        progress = self._progress(now)
         if progress >= 1:
             return self._end_value
             
@@ -36,5 +78,6 @@ class Transition:
     
     def _interpolate(self, start: Any, end: Any, progress: float) -> Any:
         if isinstance(start, (int, float)) and isinstance(end, (int, float)):
-            return start + (end - start) * Easing.get_easing_function(self.easing)(progress)
+            # progress è già passato per l'easing in get_current_value
+            return start + (end - start) * progress
         return end if progress > 0.5 else start 
\ No newline at end of file
@@ -2,14 +2,23 @@ from .state import State
 from .component import Component
 from .virtual_node import VirtualNode
 from .renderer import Renderer
+from .scheduler import FrameScheduler
+from .memo import memo, shallow_equal, MemoComponent
 from .components import Container, Button, Text
+from .virtual_list import VirtualList, VirtualGrid
 
 __all__ = [
     'State', 
     'Component', 
     'VirtualNode', 
     'Renderer',
+    'FrameScheduler',
+    'memo',
+    'shallow_equal',
+    'MemoComponent',
     'Container',
     'Button',
-    'Text'
+    'Text',
+    'VirtualList',
+    'VirtualGrid'
 ] 
\ No newline at end of file
@@ -1,41 +1,123 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Callable, Hashable, Tuple
+from collections import OrderedDict
 import time
 import logging
-from functools import lru_cache
-import hashlib
 
 logger = logging.getLogger(__name__)
 
 class RenderCache:
-    def __init__(self, max_size: int = 1000, ttl: int = 300):
-        self._cache: Dict[str, Any] = {}
-        self._timestamps: Dict[str, float] = {}
+    """
+    Cache LRU con scadenza TTL e capacità basata sul costo.
+
+    Tutte le operazioni sono O(1): l'ordine di utilizzo è mantenuto da un
+    OrderedDict e la scadenza viene verificata solo quando si legge una
+    voce. Il tempo corrente può essere fissato una volta per frame con
+    set_time(), così get() non legge l'orologio a ogni chiamata.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = 300,
+                 max_cost: Optional[float] = None,
+                 cost: Optional[Callable[[Any], float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        # Voci come chiave -> (valore, costo, scadenza)
+        self._cache: 'OrderedDict[Hashable, Tuple[Any, float, float]]' = OrderedDict()
         self._max_size = max_size
         self._ttl = ttl
-        
-    def get(self, key: str) -> Optional[Any]:
+        self._max_cost = max_cost
+        self._cost = cost
+        self._total_cost = 0.0
+        self._now: Optional[float] = None
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._cache
+
+    @property
+    def total_cost(self) -> float:
+        return self._total_cost
+
+    def set_time(self, now: Optional[float]):
+        """Fissa il tempo usato per la scadenza; None torna a leggere l'orologio"""
+        self._now = now
+
+    def _time(self) -> float:
+        return self._now if self._now is not None else self.clock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
         """Ottiene un elemento dalla cache"""
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if self._ttl is not None and entry[2] <= self._time():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, cost: Optional[float] = None):
+        """Imposta un elemento nella cache, con un costo opzionale (es. byte o nodi)"""
+        if cost is None:
+            cost = self._cost(value) if self._cost is not None else 1
         if key in self._cache:
-            if time.time() - self._timestamps[key] > self._ttl:
-                self._remove(key)
-                return None
-            return self._cache[key]
-        return None
-        
-    def set(self, key: str, value: Any):
-        """Imposta un elemento nella cache"""
-        if len(self._cache) >= self._max_size:
+            self._remove(key)
+        if self._max_cost is not None and cost > self._max_cost:
+            # Più grande dell'intera cache: non viene memorizzato
+            return
+
+        expires = self._time() + self._ttl if self._ttl is not None else float("inf")
+        self._cache[key] = (value, cost, expires)
+        self._total_cost += cost
+
+        while len(self._cache) > self._max_size or (
+                self._max_cost is not None and self._total_cost > self._max_cost):
             self._evict_oldest()
-            
-        self._cache[key] = value
-        self._timestamps[key] = time.time()
-        
-    def _remove(self, key: str):
+
+    def values(self) -> List[Any]:
+        """Valori in cache, comprese le voci scadute non ancora rimosse"""
+        return [entry[0] for entry in self._cache.values()]
+
+    def remove(self, key: Hashable):
+        if key in self._cache:
+            self._remove(key)
+
+    def clear(self):
+        self._cache.clear()
+        self._total_cost = 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Contatori di utilizzo della cache"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "cost": self._total_cost,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def _remove(self, key: Hashable):
         """Rimuove un elemento dalla cache"""
-        del self._cache[key]
-        del self._timestamps[key]
-        
+        _, cost, _ = self._cache.pop(key)
+        self._total_cost -= cost
+
     def _evict_oldest(self):
-        """Rimuove l'elemento più vecchio dalla cache"""
-        oldest_key = min(self._timestamps.items(), key=lambda x: x[1])[0]
-        self._remove(oldest_key) 
\ No newline at end of file
+        """Rimuove l'elemento usato meno di recente"""
+        key, (_, cost, _) = self._cache.popitem(last=False)
+        self._total_cost -= cost
+        self.evictions += 1
@@ -1,5 +1,6 @@
 from typing import Dict
 from .virtual_node import VirtualNode
+from .memo import shallow_equal
 
 class Component:
     def __init__(self):
@@ -10,4 +11,5 @@ class Component:
         raise NotImplementedError()
     
     def should_update(self, old_props: Dict, new_props: Dict) -> bool:
-        return True 
\ No newline at end of file
+        # Confronto per identità dei valori: le sottoclassi possono ridefinirlo
+        return not shallow_equal(old_props, new_props) 
\ No newline at end of file
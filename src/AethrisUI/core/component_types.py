@@ -19,6 +19,15 @@ def server_component(component_class: Type) -> Type:
     return component_class
 
 def static_component(component_class: Type) -> Type:
-    """Decorator per marcare un componente come statico"""
+    """
+    Decorator per marcare un componente come statico: il runtime dei hook lo
+    esegue una sola volta e il renderer riutilizza per riferimento albero,
+    layout e comandi di disegno nei frame successivi
+    """
     component_class._component_type = ComponentType(is_static=True)
-    return component_class 
\ No newline at end of file
+    return component_class
+
+def is_static(component: Any) -> bool:
+    """Indica se il componente è marcato con @static_component"""
+    component_type = getattr(component, "_component_type", None)
+    return component_type is not None and component_type.is_static 
\ No newline at end of file
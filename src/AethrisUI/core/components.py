@@ -5,10 +5,10 @@ def Container(props: Dict[str, Any] = None) -> VirtualNode:
     """
     Componente Container base che può contenere altri elementi
     """
+    # I figli vengono letti da props["children"] senza modificare le props
     return VirtualNode(
         component_type="container",
-        props=props or {},
-        children=props.get("children", []) if props else []
+        props=props
     )
 
 def Button(props: Dict[str, Any] = None) -> VirtualNode:
@@ -17,20 +17,17 @@ def Button(props: Dict[str, Any] = None) -> VirtualNode:
     """
     return VirtualNode(
         component_type="button",
-        props=props or {},
-        children=[]
+        props=props
     )
 
 def Text(text: str = "", props: Dict[str, Any] = None) -> VirtualNode:
     """
     Componente Text base
     """
-    if props is None:
-        props = {}
-    props["text"] = text
+    # Nuovo dizionario: le props del chiamante non vengono modificate
+    props = {**props, "text": text} if props else {"text": text}
     
     return VirtualNode(
         component_type="text",
-        props=props,
-        children=[]
+        props=props
     ) 
\ No newline at end of file
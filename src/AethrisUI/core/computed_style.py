@@ -0,0 +1,203 @@
+from typing import Dict, Any, Optional, Tuple
+import re
+from ..platform.color import Color
+
+# Transizione di una proprietà: (durata in secondi, ritardo in secondi, easing)
+TransitionSpec = Tuple[float, float, str]
+
+_TRANSITION_TOKEN = re.compile(r"[\w.-]+\([^)]*\)|[^\s]+")
+_TIME = re.compile(r"^(-?[\d.]+)(ms|s)$")
+# Nomi CSS delle proprietà che il renderer chiama diversamente
+_TRANSITION_ALIASES = {"background_color": "background"}
+_transition_cache: Dict[str, Dict[str, TransitionSpec]] = {}
+
+def parse_length(value: Any) -> Optional[int]:
+    """
+    Converte un valore di stile in un intero, None se va usato il default.
+    Per i dizionari (padding/margin per lato) prende il valore più grande.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        # Rimuovi 'px' se presente
+        try:
+            return int(float(value.replace('px', '').strip()))
+        except ValueError:
+            return None
+    if isinstance(value, dict):
+        return max(parse_length(value[k]) or 0 if k in value else 0
+                   for k in ('top', 'right', 'bottom', 'left'))
+    return None
+
+def parse_color(value: Any) -> Optional[int]:
+    """Converte un valore di colore in un intero 0xRRGGBBAA, None se assente o non valido"""
+    if isinstance(value, Color):
+        return value.to_packed()
+    if isinstance(value, dict):
+        value = value.get("color")
+    if not isinstance(value, str):
+        return None
+    try:
+        return Color(value).to_packed()
+    except ValueError:
+        # Valori che Color non interpreta (es. "transparent", "rgba(...)")
+        return None
+
+def _parse_time(value: Any) -> Optional[float]:
+    """Converte "200ms" / "0.3s" (o un numero di millisecondi) in secondi"""
+    if isinstance(value, (int, float)):
+        return value / 1000
+    match = _TIME.match(value.strip()) if isinstance(value, str) else None
+    if match is None:
+        return None
+    number = float(match.group(1))
+    return number / 1000 if match.group(2) == "ms" else number
+
+def _transition_property(name: str) -> str:
+    name = name.strip().replace("-", "_")
+    return _TRANSITION_ALIASES.get(name, name)
+
+def _split_transitions(value: str):
+    # Virgole di separazione, escluse quelle dentro cubic-bezier(...)
+    depth = 0
+    start = 0
+    for index, char in enumerate(value):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            yield value[start:index]
+            start = index + 1
+    yield value[start:]
+
+def parse_transition(value: Any) -> Optional[Dict[str, TransitionSpec]]:
+    """
+    Interpreta la chiave "transition" di uno stile, in forma CSS
+    ("background-color 200ms ease-out, color 0.1s") o come dizionario dei
+    token del tema ({"duration": "200ms", "timing": "..."}, proprietà "all"
+    se non indicata). Restituisce {proprietà: (durata, ritardo, easing)}
+    """
+    if isinstance(value, dict):
+        duration = _parse_time(value.get("duration", 0))
+        delay = _parse_time(value.get("delay", 0)) or 0.0
+        easing = value.get("timing", value.get("easing", "ease"))
+        if not duration:
+            return None
+        return {_transition_property(value.get("property", "all")): (duration, delay, easing)}
+    if not isinstance(value, str):
+        return None
+
+    cached = _transition_cache.get(value)
+    if cached is not None:
+        return cached or None
+    transitions = {}
+    for entry in _split_transitions(value):
+        tokens = _TRANSITION_TOKEN.findall(entry)
+        if not tokens:
+            continue
+        name = "all"
+        easing = "ease"
+        times = []
+        for token in tokens:
+            seconds = _parse_time(token)
+            if seconds is not None:
+                times.append(seconds)
+            elif token == tokens[0]:
+                name = token
+            else:
+                easing = token
+        # Come in CSS: il primo tempo è la durata, il secondo il ritardo
+        if times and times[0] > 0:
+            transitions[_transition_property(name)] = (times[0], times[1] if len(times) > 1 else 0.0, easing)
+    _transition_cache[value] = transitions
+    return transitions or None
+
+def _side(style: Dict[str, Any], key: str, shorthand: Optional[int]) -> int:
+    value = parse_length(style[key]) if key in style else None
+    if value is not None:
+        return value
+    return shorthand if shorthand is not None else 0
+
+class ComputedStyle:
+    """
+    Stile già interpretato: lunghezze come interi e colori compattati
+    in 0xRRGGBBAA. width/height e i colori sono None se non specificati,
+    così il renderer può applicare il default del tipo di componente.
+    """
+    __slots__ = (
+        "left", "top", "width", "height",
+        "padding_top", "padding_right", "padding_bottom", "padding_left",
+        "margin_top", "margin_right", "margin_bottom", "margin_left",
+        "flow_margin_top", "flow_margin_bottom",
+        "gap", "row_gap", "font_size",
+        "display", "flex_direction", "justify_content", "align_items",
+        "flex_wrap", "align_content", "flex_grow", "flex_shrink", "flex_basis", "align_self",
+        "has_background", "background", "gradient", "color",
+        "hover", "hover_background", "clip", "transitions",
+    )
+
+    def __init__(self, style: Dict[str, Any]):
+        get = style.get
+        self.left = _side(style, "left", 0)
+        self.top = _side(style, "top", 0)
+        self.width = parse_length(style["width"]) if "width" in style else None
+        self.height = parse_length(style["height"]) if "height" in style else None
+
+        padding = parse_length(style["padding"]) if "padding" in style else None
+        self.padding_top = _side(style, "padding_top", padding)
+        self.padding_right = _side(style, "padding_right", padding)
+        self.padding_bottom = _side(style, "padding_bottom", padding)
+        self.padding_left = _side(style, "padding_left", padding)
+
+        margin = parse_length(style["margin"]) if "margin" in style else None
+        self.margin_top = _side(style, "margin_top", margin)
+        self.margin_right = _side(style, "margin_right", margin)
+        self.margin_bottom = _side(style, "margin_bottom", margin)
+        self.margin_left = _side(style, "margin_left", margin)
+
+        # Margini espliciti usati dal layout a blocchi del genitore
+        self.flow_margin_top = _side(style, "margin_top", 0)
+        self.flow_margin_bottom = _side(style, "margin_bottom", 0)
+
+        self.gap = _side(style, "gap", 0)
+        self.row_gap = _side(style, "row_gap", self.gap)
+        self.font_size = _side(style, "font_size", 14)
+
+        self.display = get("display", "block")
+        self.flex_direction = get("flex_direction", "row")
+        self.justify_content = get("justify_content", "flex-start")
+        self.align_items = get("align_items", "flex-start")
+        self.flex_wrap = get("flex_wrap", "nowrap")
+        self.align_content = get("align_content", "flex-start")
+
+        # Proprietà dell'elemento all'interno di un contenitore flex
+        self.flex_grow = float(get("flex_grow", 0))
+        self.flex_shrink = float(get("flex_shrink", 1))
+        self.flex_basis = parse_length(style["flex_basis"]) if "flex_basis" in style else None
+        self.align_self = get("align_self", "auto")
+
+        self.background = parse_color(get("background"))
+        # Uno sfondo non interpretabile (es. "transparent") non viene disegnato
+        self.has_background = self.background is not None
+        self.color = parse_color(get("color"))
+
+        # Con un gradiente si usa il colore del primo stop
+        self.gradient = None
+        gradient = get("background_gradient")
+        if isinstance(gradient, dict) and gradient.get("stops"):
+            first_stop = gradient["stops"][0]
+            if isinstance(first_stop, dict):
+                self.gradient = parse_color(first_stop)
+
+        # overflow diverso da "visible": i figli sono ritagliati al box
+        self.clip = get("overflow", "visible") != "visible"
+
+        # Proprietà con transizione: {nome: (durata, ritardo, easing)} o None
+        self.transitions = parse_transition(get("transition")) if "transition" in style else None
+
+        hover = get("hover")
+        self.hover = "hover" in style
+        self.hover_background = parse_color(hover.get("background")) if isinstance(hover, dict) else None
@@ -0,0 +1,47 @@
+from typing import Any, Dict, List, Optional, Tuple
+from .virtual_node import VirtualNode
+from .computed_style import ComputedStyle
+from ..layout.flex import FlexLayout
+
+class LayoutBox:
+    """
+    Risultato del layout di un nodo, indipendente dalla sua posizione assoluta.
+
+    offset_x/offset_y spostano l'area disegnata rispetto alla posizione
+    assegnata dal genitore (left/top e margini); children contiene le
+    posizioni dei figli relative all'origine di questo box. Il box viene
+    riutilizzato finché nodo, props, stile, lista dei figli e vincoli sono
+    gli stessi oggetti del layout precedente. flex è il FlexLayout di un
+    contenitore flex, ripreso dal box che lo sostituisce.
+    """
+    __slots__ = ("node", "props", "style", "computed", "child_nodes", "constraint",
+                 "offset_x", "offset_y", "width", "height", "painted", "children",
+                 "flex")
+
+    def __init__(self, node: VirtualNode, style: Dict[str, Any], computed: ComputedStyle,
+                 constraint: Tuple[int, int]):
+        self.node = node
+        self.props = node.props
+        self.style = style
+        self.computed = computed
+        self.child_nodes = node.children
+        self.constraint = constraint
+        self.offset_x = 0
+        self.offset_y = 0
+        self.width = 0
+        self.height = 0
+        self.painted = False
+        self.children: List[Tuple[float, float, 'LayoutBox']] = []
+        self.flex: Optional[FlexLayout] = None
+
+    def matches(self, node: VirtualNode, style: Dict[str, Any], constraint: Tuple[int, int]) -> bool:
+        """Indica se il box è ancora valido per il nodo e i vincoli dati"""
+        return (self.node is node and
+                self.props is node.props and
+                self.style is style and
+                self.child_nodes is node.children and
+                self.constraint == constraint)
+
+    def previous_children(self) -> Dict[int, 'LayoutBox']:
+        """Box dei figli del layout precedente, indicizzati per nodo"""
+        return {id(box.node): box for _, _, box in self.children}
@@ -0,0 +1,50 @@
+from typing import Dict, Any, Callable, Optional
+from functools import update_wrapper
+from .virtual_node import VirtualNode
+
+def shallow_equal(old_props: Optional[Dict[str, Any]], new_props: Optional[Dict[str, Any]]) -> bool:
+    """
+    Confronta due dizionari di props chiave per chiave per identità, senza
+    scendere negli stili annidati né serializzare le callback
+    """
+    if old_props is new_props:
+        return True
+    if old_props is None or new_props is None or len(old_props) != len(new_props):
+        return False
+    for key, value in new_props.items():
+        if key not in old_props or old_props[key] is not value:
+            return False
+    return True
+
+class MemoComponent:
+    """
+    Componente funzione memoizzato. Nel runtime dei hook l'istanza viene
+    eseguita di nuovo solo se il comparatore considera le props cambiate
+    (o se il suo stato è cambiato); altrimenti l'albero precedente viene
+    riutilizzato per identità e layout e diff lo saltano.
+    """
+
+    def __init__(self, component: Callable[[Dict[str, Any]], VirtualNode],
+                 are_equal: Callable[[Dict[str, Any], Dict[str, Any]], bool] = None):
+        self.component = component
+        self.are_equal = are_equal or shallow_equal
+        update_wrapper(self, component)
+
+    def __call__(self, props: Dict[str, Any]) -> VirtualNode:
+        return self.component(props)
+
+def memo(component: Callable[[Dict[str, Any]], VirtualNode] = None,
+         are_equal: Callable[[Dict[str, Any], Dict[str, Any]], bool] = None):
+    """
+    Avvolge un componente funzione in un MemoComponent. Utilizzabile come
+    decoratore, anche con un comparatore personalizzato:
+
+        @memo
+        def Row(props): ...
+
+        @memo(are_equal=lambda old, new: old["id"] == new["id"])
+        def Cell(props): ...
+    """
+    if component is None:
+        return lambda component: MemoComponent(component, are_equal)
+    return MemoComponent(component, are_equal)
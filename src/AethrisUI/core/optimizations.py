@@ -1,38 +1,50 @@
-from typing import Dict, Any, Set
-import hashlib
+from typing import Dict, Any, Set, Tuple, Optional
+from collections import OrderedDict
+from .computed_style import ComputedStyle
+from .memo import shallow_equal
 
 class StyleCache:
-    _cache: Dict[str, Dict[str, Any]] = {}
+    """
+    Cache degli stili compilati, indicizzata per identità del dizionario di
+    stile. Oltre max_size esce la voce usata meno di recente.
+    """
+    _cache: 'OrderedDict[int, Tuple[Dict[str, Any], ComputedStyle]]' = OrderedDict()
+    max_size: int = 4096
     
     @classmethod
-    def get_computed_style(cls, style: Dict[str, Any]) -> Dict[str, Any]:
-        style_hash = cls._hash_style(style)
-        if style_hash in cls._cache:
-            return cls._cache[style_hash]
+    def get_computed_style(cls, style: Dict[str, Any]) -> ComputedStyle:
+        entry = cls._cache.get(id(style))
+        # Il riferimento allo stile impedisce il riuso dell'id finché la voce esiste
+        if entry is not None and entry[0] is style:
+            cls._cache.move_to_end(id(style))
+            return entry[1]
             
-        computed = cls._compute_style(style)
-        cls._cache[style_hash] = computed
+        computed = ComputedStyle(style)
+        if len(cls._cache) >= cls.max_size:
+            cls._cache.popitem(last=False)
+        cls._cache[id(style)] = (style, computed)
         return computed
     
-    @staticmethod
-    def _hash_style(style: Dict[str, Any]) -> str:
-        return hashlib.md5(str(sorted(style.items())).encode()).hexdigest()
+    @classmethod
+    def clear(cls):
+        cls._cache.clear()
 
 class RenderOptimizer:
     def __init__(self):
-        self._last_render: Dict[int, str] = {}
+        # Ultime props viste e versione del nodo per componente
+        self._last_render: Dict[int, Tuple[Dict[str, Any], Optional[int]]] = {}
         self._dirty_components: Set[int] = set()
     
-    def should_update(self, component_id: int, new_props: Dict[str, Any]) -> bool:
-        props_hash = self._hash_props(new_props)
-        should_update = props_hash != self._last_render.get(component_id)
+    def should_update(self, component_id: int, new_props: Dict[str, Any], version: Optional[int] = None) -> bool:
+        """
+        Indica se il componente va aggiornato: le props sono confrontate per
+        identità dei valori e, se indicata, la versione del nodo deve coincidere
+        """
+        last = self._last_render.get(component_id)
+        should_update = last is None or last[1] != version or not shallow_equal(last[0], new_props)
         
         if should_update:
-            self._last_render[component_id] = props_hash
+            self._last_render[component_id] = (new_props, version)
             self._dirty_components.add(component_id)
             
-        return should_update
-    
-    @staticmethod
-    def _hash_props(props: Dict[str, Any]) -> str:
-        return hashlib.md5(str(sorted(props.items())).encode()).hexdigest() 
\ No newline at end of file
+        return should_update
\ No newline at end of file
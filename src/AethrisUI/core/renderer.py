@@ -1,19 +1,78 @@
-from typing import Dict, Any, Optional, Tuple, List
-from .virtual_node import VirtualNode
-from ..platform.graphics import Canvas, Color
+from typing import Dict, Any, Optional, Tuple, List, Union, Callable
+from .virtual_node import VirtualNode, FrozenVirtualNode
+from .spatial_index import SpatialIndex, Rect
+from .layout_box import LayoutBox
+from .optimizations import StyleCache
+from .computed_style import ComputedStyle
+from .scheduler import FrameScheduler
+from .caching import RenderCache
+from .style_transitions import StyleTransitions
+from ..layout.flex import FlexLayout, FlexItem
+from ..platform.graphics import Canvas
+from ..platform.display_list import DisplayList, ResourceTable
 import logging
-import win32gui
 
 logger = logging.getLogger(__name__)
 
+# Stile condiviso per i nodi senza "style", così il box resta riutilizzabile
+_EMPTY_STYLE: Dict[str, Any] = {}
+
+class _SubtreePaint:
+    """Comandi e bounds registrati per un sottoalbero invariato"""
+    __slots__ = ("box", "x", "y", "clip", "commands", "hits", "node_ids", "hovered")
+
+# Colori di default compattati in 0xRRGGBBAA
+_BLACK = 0x000000FF
+_BUTTON_GRAY = 0xCCCCCCFF
+
+# Voci della tabella delle risorse oltre le quali si eliminano quelle non più usate
+_RESOURCE_LIMIT = 4096
+
 class Renderer:
-    def __init__(self, canvas: Canvas):
+    def __init__(self, canvas: Canvas, scheduler: Optional[FrameScheduler] = None,
+                 render_cache: Optional[RenderCache] = None, animation_ticker=None):
         self.canvas = canvas
+        # Le richieste di render e le aree sporche vengono eseguite al prossimo frame
+        self.scheduler = scheduler if scheduler is not None else FrameScheduler()
+        self._pending_root: Union[VirtualNode, Callable[[], VirtualNode], None] = None
         self._current_tree: Optional[VirtualNode] = None
-        self._node_positions = {}
+        self._root_box: Optional[LayoutBox] = None
         self._hovered_node = None
         self._active_node = None
         self._window = None
+        # Bounds dipinti di ogni nodo, con l'ordine di disegno come livello z:
+        # usati per hit testing e damage tracking
+        self._hit_index = SpatialIndex()
+        self._paint_order = 0
+        self._damage: List[Tuple[int, int, int, int]] = []
+        # Il paint registra comandi in una display list che il canvas riproduce;
+        # la tabella delle risorse è condivisa così i frame sono confrontabili
+        self._resources = ResourceTable()
+        self._resource_limit = _RESOURCE_LIMIT
+        self._recording = DisplayList(self._resources)
+        self.display_list: Optional[DisplayList] = None
+        self._recorded_hover = None
+        # Cache dei sottoalberi già disegnati (immutabili o con layout invariato
+        # dal frame precedente): i comandi vengono copiati nel frame senza
+        # percorrerli. Il costo di una voce è il numero di comandi registrati
+        self.render_cache = render_cache if render_cache is not None else RenderCache(
+            max_size=1024, ttl=300, max_cost=200_000)
+        self._reused_boxes: set = set()
+        self._paint_log: Optional[List[Tuple[LayoutBox, Rect, Optional[Rect]]]] = None
+        # Ritaglio attivo durante il paint (overflow: hidden) e ritaglio con
+        # cui è stato disegnato ogni nodo, per hit testing e repaint
+        self._clip: Optional[Rect] = None
+        self._node_clips: Dict[int, Rect] = {}
+        # Transizioni degli stili ("transition"), avanzate dal ticker delle
+        # animazioni sui frame dello scheduler; ogni loro frame rende la
+        # display list registrata non più aggiornata
+        if animation_ticker is None:
+            from ..animation.ticker import AnimationTicker
+            animation_ticker = AnimationTicker(self.scheduler)
+        self.animation_ticker = animation_ticker
+        self.transitions = StyleTransitions(animation_ticker, self._on_transition_frame)
+        self._transition_frame = 0
+        self._recorded_transition_frame = 0
         logger.debug("Renderer initialized")
     
     def set_window(self, window):
@@ -22,283 +81,690 @@ class Renderer:
     def handle_mouse_move(self, x: int, y: int):
         """Gestisce il movimento del mouse"""
         old_hovered = self._hovered_node
-        self._hovered_node = None
         
-        # Trova il nodo sotto il cursore
-        for node_id, (node, pos_x, pos_y, width, height) in self._node_positions.items():
-            if (pos_x <= x <= pos_x + width and 
-                pos_y <= y <= pos_y + height):
-                self._hovered_node = node
-                break
+        # Trova il nodo interattivo più in alto sotto il cursore
+        box = self._hit_index.hit_test(
+            x, y, lambda b: self._is_interactive(b) and self._is_visible_at(b, x, y))
+        self._hovered_node = box.node if box is not None else None
         
-        # Se il nodo hovered è cambiato, aggiorna la visualizzazione
-        if old_hovered != self._hovered_node and self._current_tree:
-            self.render(self._current_tree)
+        # Se il nodo hovered è cambiato, ridisegna solo i due nodi coinvolti
+        if old_hovered is not self._hovered_node and self._current_tree:
+            self._transition_hover(old_hovered, False)
+            self._transition_hover(self._hovered_node, True)
+            self.invalidate_node(old_hovered)
+            self.invalidate_node(self._hovered_node)
+            self._flush_damage()
+    
+    def set_active_node(self, node: Optional[VirtualNode]):
+        """Imposta il nodo premuto e ridisegna solo le aree coinvolte"""
+        if node is self._active_node:
+            return
+        self.invalidate_node(self._active_node)
+        self.invalidate_node(node)
+        self._active_node = node
+        self._flush_damage()
     
     def handle_click(self, x: int, y: int) -> bool:
         """Gestisce il click del mouse"""
-        for node_id, (node, pos_x, pos_y, width, height) in self._node_positions.items():
-            if (pos_x <= x <= pos_x + width and 
-                pos_y <= y <= pos_y + height):
-                if "onClick" in node.props:
-                    node.props["onClick"]()
-                    return True
+        box = self._hit_index.hit_test(
+            x, y, lambda b: "onClick" in b.node.props and self._is_visible_at(b, x, y))
+        if box is not None:
+            box.node.props["onClick"]()
+            return True
         return False
     
+    def hit_test(self, x: int, y: int) -> Optional[VirtualNode]:
+        """Restituisce il nodo disegnato più in alto nel punto indicato"""
+        box = self._hit_index.hit_test(x, y, lambda b: self._is_visible_at(b, x, y))
+        return box.node if box is not None else None
+    
+    def _is_visible_at(self, box: LayoutBox, x: int, y: int) -> bool:
+        """Il punto non è ritagliato via da un antenato con overflow: hidden"""
+        clip = self._node_clips.get(id(box.node))
+        return clip is None or (clip[0] <= x < clip[0] + clip[2] and clip[1] <= y < clip[1] + clip[3])
+    
+    @staticmethod
+    def _is_interactive(box: LayoutBox) -> bool:
+        return "onClick" in box.node.props or box.computed.hover
+    
+    def mount(self, component: Callable[[Dict[str, Any]], VirtualNode],
+              props: Dict[str, Any] = None):
+        """
+        Monta un componente funzione con hook persistenti e lo renderizza.
+        Gli aggiornamenti di stato rieseguono solo le istanze coinvolte e
+        vengono renderizzati al frame successivo dello scheduler.
+        """
+        from ..hooks.runtime import FiberRoot
+        root = FiberRoot(component, props, on_commit=self.render, scheduler=self.scheduler)
+        self.render(root.render())
+        return root
+    
+    def request_render(self, root: Union[VirtualNode, Callable[[], VirtualNode]]):
+        """
+        Richiede il render dell'albero al prossimo frame. root può essere una
+        funzione che costruisce l'albero: viene chiamata una sola volta per frame
+        """
+        self._pending_root = root
+        self.scheduler.schedule(self._commit_render)
+    
+    def _commit_render(self):
+        root, self._pending_root = self._pending_root, None
+        if callable(root):
+            root = root()
+        if root is not None:
+            self.render(root)
+    
     def render(self, node: VirtualNode):
+        """Esegue layout e paint completi dell'albero"""
         try:
             logger.debug(f"Rendering node of type: {node.component_type}")
             self._current_tree = node
-            self._node_positions.clear()
-            self.canvas.clear()
-            self._render_node(node)
-            self.canvas.update()
+            self.render_cache.set_time(self.render_cache.clock())
+            # Layout: invariato per i sottoalberi già calcolati
+            self._reused_boxes.clear()
+            previous_box = self._root_box
+            self._root_box = self._layout_node(node, previous_box)
+            
+            # Albero invariato (es. componenti memoizzati): la display list e
+            # l'indice del frame precedente sono ancora validi
+            if (self._root_box is previous_box and self.display_list is not None and
+                    self._recorded_hover is self._hovered_node and
+                    self._recorded_transition_frame == self._transition_frame):
+                if not self.canvas.retains_contents:
+                    self._damage.clear()
+                    self.canvas.replay(self.display_list)
+                    self.canvas.update()
+                return
+            
+            # Paint: percorre solo i box già calcolati registrando i comandi
+            self._hit_index.clear()
+            self._node_clips.clear()
+            self._clip = None
+            self._paint_order = 0
+            self._damage.clear()
+            frame = DisplayList(self._resources)
+            frame.clear_rect(0, 0, self.canvas.width, self.canvas.height)
+            self._recording = frame
+            self._recorded_hover = self._hovered_node
+            self._recorded_transition_frame = self._transition_frame
+            self._paint_box(self._root_box, 0, 0)
+            
+            # Se il canvas conserva il frame precedente ed è identico, non serve ridisegnare
+            unchanged = self.canvas.retains_contents and frame == self.display_list
+            self.display_list = frame
+            if not unchanged:
+                self.canvas.replay(frame)
+                self.canvas.update()
+            self._compact_resources()
         except Exception as e:
             logger.error(f"Error in render: {str(e)}", exc_info=True)
             raise
     
-    def _get_color_from_style(self, style: Dict[str, Any], key: str, default: str = "#000000") -> Color:
-        """Converte un valore di colore dallo stile in un oggetto Color"""
-        color_value = style.get(key)
+    def invalidate(self, rect: Tuple[int, int, int, int]):
+        """Segna un rettangolo (x, y, width, height) come da ridisegnare"""
+        if rect[2] <= 0 or rect[3] <= 0:
+            return
         
-        if color_value is None:
-            return Color(default)
-            
-        if isinstance(color_value, Color):
-            return color_value
-            
-        if isinstance(color_value, str):
-            return Color(color_value)
-            
-        if isinstance(color_value, dict) and "color" in color_value:
-            return Color(color_value["color"])
-            
-        return Color(default)
+        # Unisci il rettangolo alle aree sporche che interseca
+        merged = rect
+        remaining = []
+        for other in self._damage:
+            if self._rects_intersect(merged, other):
+                merged = self._union_rect(merged, other)
+            else:
+                remaining.append(other)
+        remaining.append(merged)
+        self._damage = remaining
+    
+    def invalidate_node(self, node: Optional[VirtualNode]):
+        """Segna come da ridisegnare l'area dipinta da un nodo"""
+        if node is None:
+            return
+        bounds = self._hit_index.bounds(id(node))
+        if bounds:
+            clip = self._node_clips.get(id(node))
+            self.invalidate(self._intersect_rect(bounds, clip) if clip is not None else bounds)
     
-    def _render_node(self, node: VirtualNode, parent_pos: Tuple[int, int] = (0, 0)):
+    def has_damage(self) -> bool:
+        return bool(self._damage)
+    
+    def repaint(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Ridisegna solo i nodi che intersecano le aree sporche, nell'ordine
+        di disegno originale e limitando il disegno a ciascuna area
+        """
+        damage = self._damage
+        self._damage = []
+        if not damage or self._current_tree is None:
+            return []
+        
+        try:
+            patch = DisplayList(self._resources)
+            self._recording = patch
+            for rect in damage:
+                patch.set_clip(*rect)
+                patch.clear_rect(*rect)
+                for bounds, box in self._hit_index.query_rect(rect):
+                    clip = self._node_clips.get(id(box.node))
+                    if clip is None:
+                        self._paint_node(box, bounds)
+                        continue
+                    # Nodo dentro un contenitore con overflow: hidden
+                    area = self._intersect_rect(rect, clip)
+                    if area[2] > 0 and area[3] > 0:
+                        patch.set_clip(*area)
+                        self._paint_node(box, bounds)
+                        patch.set_clip(*rect)
+            patch.reset_clip()
+            self.canvas.replay(patch)
+            self.canvas.update()
+            self._compact_resources()
+        except Exception as e:
+            logger.error(f"Error in repaint: {str(e)}", exc_info=True)
+            raise
+        return damage
+    
+    def _compact_resources(self):
+        """
+        Riduce la tabella delle risorse ai testi e colori usati dal frame
+        corrente e dai sottoalberi in cache (es. righe non più visibili di
+        una lista virtualizzata, colori intermedi delle transizioni)
+        """
+        if len(self._resources) <= self._resource_limit:
+            return
+        self._resources.compact(
+            [self.display_list] + [entry.commands for entry in self.render_cache.values()])
+        # Soglia proporzionale alle risorse ancora usate: la compattazione resta rara
+        self._resource_limit = max(_RESOURCE_LIMIT, 2 * len(self._resources))
+    
+    def _flush_damage(self):
+        """Programma la gestione delle aree sporche per il prossimo frame"""
+        if self._damage:
+            self.scheduler.schedule(self._present_damage)
+    
+    def _present_damage(self):
+        """Delega le aree sporche alla finestra o le ridisegna subito"""
+        if not self._damage:
+            return
+        if self._window is not None:
+            # La finestra richiamerà repaint() al prossimo WM_PAINT
+            for rect in self._damage:
+                self._window.invalidate_rect(rect)
+        else:
+            self.repaint()
+    
+    @staticmethod
+    def _rects_intersect(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+        return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and
+                a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+    
+    @staticmethod
+    def _intersect_rect(a: Rect, b: Rect) -> Rect:
+        x = max(a[0], b[0])
+        y = max(a[1], b[1])
+        right = min(a[0] + a[2], b[0] + b[2])
+        bottom = min(a[1] + a[3], b[1] + b[3])
+        return (x, y, max(right - x, 0), max(bottom - y, 0))
+    
+    @staticmethod
+    def _union_rect(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        x = min(a[0], b[0])
+        y = min(a[1], b[1])
+        right = max(a[0] + a[2], b[0] + b[2])
+        bottom = max(a[1] + a[3], b[1] + b[3])
+        return (x, y, right - x, bottom - y)
+    
+    def _record_paint(self, box: LayoutBox, bounds: Tuple[int, int, int, int]):
+        """Registra il disegno di un box e ne indicizza i bounds in ordine di disegno"""
+        self._hit_index.insert(id(box.node), bounds, self._paint_order, box)
+        self._paint_order += 1
+        if self._clip is not None:
+            self._node_clips[id(box.node)] = self._clip
+        if self._paint_log is not None:
+            self._paint_log.append((box, bounds, self._clip))
+        self._paint_node(box, bounds)
+    
+    def _paint_cached(self, box: LayoutBox, x: float, y: float):
+        """
+        Disegna un sottoalbero riutilizzando i comandi registrati in
+        precedenza, se box, posizione, ritaglio e stato hover non sono cambiati
+        """
+        cached = self.render_cache.get(id(box))
+        hovered = self._hovered_node
+        if hovered is not None and (cached is None or id(hovered) not in cached.node_ids):
+            hovered = None
+        
+        if (cached is not None and cached.box is box and cached.x == x and cached.y == y and
+                cached.clip == self._clip and cached.hovered is hovered and
+                not self.transitions.touches(cached.node_ids)):
+            self._recording.extend(cached.commands)
+            for child_box, bounds, clip in cached.hits:
+                self._hit_index.insert(id(child_box.node), bounds, self._paint_order, child_box)
+                self._paint_order += 1
+                if clip is not None:
+                    self._node_clips[id(child_box.node)] = clip
+            return
+        
+        # Registra il sottoalbero annotando comandi e bounds prodotti
+        start = len(self._recording)
+        outer_log = self._paint_log
+        self._paint_log = []
         try:
-            style = node.props.get("style", {})
-            x = parent_pos[0] + self._get_style_value(style, "left", 0)
-            y = parent_pos[1] + self._get_style_value(style, "top", 0)
+            self._paint_box(box, x, y, static=True)
+            hits = self._paint_log
+        finally:
+            self._paint_log = outer_log
+        if outer_log is not None:
+            outer_log.extend(hits)
+        
+        entry = _SubtreePaint()
+        entry.box = box
+        entry.x = x
+        entry.y = y
+        entry.clip = self._clip
+        entry.commands = self._recording.slice(start)
+        entry.hits = hits
+        entry.node_ids = {id(child_box.node) for child_box, _, _ in hits}
+        current = self._hovered_node
+        entry.hovered = current if current is not None and id(current) in entry.node_ids else None
+        # I comandi con valori intermedi di una transizione non vanno riutilizzati
+        if not self.transitions.touches(entry.node_ids):
+            self.render_cache.set(id(box), entry, len(entry.commands))
+    
+    def _paint_node(self, box: LayoutBox, bounds: Tuple[int, int, int, int]):
+        """Registra solo l'aspetto del nodo, senza i figli"""
+        component_type = box.node.component_type
+        if component_type == "text":
+            self._paint_text(box, bounds)
+        elif component_type == "button":
+            self._paint_button(box, bounds)
+        elif component_type == "container":
+            self._paint_container(box, bounds)
+    
+    def _layout_node(self, node: VirtualNode, previous: Optional[LayoutBox] = None,
+                     forced: Optional[Tuple[Optional[float], Optional[float]]] = None,
+                     computed: Optional[ComputedStyle] = None) -> LayoutBox:
+        """
+        Calcola il box di un nodo, riutilizzando quello del layout precedente
+        se nodo, stile, figli e vincoli non sono cambiati. forced è la
+        dimensione (larghezza, altezza) imposta dal contenitore flex (grow,
+        shrink o stretch); None sugli assi lasciati al nodo. computed è lo
+        stile già compilato dal chiamante, se c'è.
+        """
+        try:
+            style = node.props.get("style", _EMPTY_STYLE)
+            constraint = (self.canvas.width, self.canvas.height, forced)
+            if previous is not None and previous.matches(node, style, constraint):
+                self._reused_boxes.add(id(previous))
+                return previous
+            
+            # Stesso dizionario di stile: lo stile compilato del box precedente è valido
+            if previous is not None and previous.style is style:
+                computed = previous.computed
+            elif computed is None:
+                computed = StyleCache.get_computed_style(style)
+            box = LayoutBox(node, style, computed, constraint)
+            box.offset_x = computed.left
+            box.offset_y = computed.top
+            if previous is not None:
+                self._replace_box(previous, box)
             
             if node.component_type == "text":
-                self._render_text(node, (x, y))
+                self._layout_text(box, computed)
             elif node.component_type == "button":
-                self._render_button(node, (x, y))
+                self._layout_button(box, computed)
             elif node.component_type == "container":
-                self._render_container(node, (x, y))
+                self._layout_container(box, computed, previous, forced)
+            
+            if forced is not None:
+                if forced[0] is not None:
+                    box.width = forced[0]
+                if forced[1] is not None:
+                    box.height = forced[1]
+            return box
                 
         except Exception as e:
-            logger.error(f"Error rendering node {node.component_type}: {str(e)}", exc_info=True)
+            logger.error(f"Error laying out node {node.component_type}: {str(e)}", exc_info=True)
             raise
     
-    def _render_button(self, node: VirtualNode, pos: Tuple[int, int]):
-        style = node.props.get("style", {})
-        text = str(node.props.get("text", ""))
-        
-        # Assicurati che width e height siano interi
-        width = self._get_style_value(style, "width", 60)
-        height = self._get_style_value(style, "height", 30)
-        
-        # Ottieni i colori dallo stile
-        background_color = self._get_color_from_style(style, "background", "#CCCCCC")
-        text_color = self._get_color_from_style(style, "color", "#000000")
+    @staticmethod
+    def _intrinsic_size(node: VirtualNode, computed: ComputedStyle) -> Tuple[Optional[float], Optional[float]]:
+        """Dimensione di default dei nodi foglia (None se decide il contenitore)"""
+        if node.component_type == "button":
+            return (computed.width if computed.width is not None else 60,
+                    computed.height if computed.height is not None else 30)
+        if node.component_type == "text":
+            text = str(node.props.get("text", ""))
+            return len(text) * computed.font_size, computed.font_size * 2
+        return computed.width, computed.height
+    
+    def _layout_button(self, box: LayoutBox, computed: ComputedStyle):
+        box.width, box.height = self._intrinsic_size(box.node, computed)
+        box.painted = True
+    
+    def _paint_button(self, box: LayoutBox, bounds: Tuple[int, int, int, int]):
+        computed = box.computed
+        text = str(box.node.props.get("text", ""))
+        x, y, width, height = bounds
         
-        # Se il bottone è hovered, applica gli stili hover
-        if node == self._hovered_node and "hover" in style:
-            hover_style = style["hover"]
-            if "background" in hover_style:
-                background_color = self._get_color_from_style(hover_style, "background", background_color.to_hex())
+        background = self.transitions.value(box, "background", self._background(box, box.node is self._hovered_node))
+        text_color = self.transitions.value(box, "color", self._text_color(box))
         
         # Se c'è un gradiente, usa il primo colore come background
-        if "background_gradient" in style:
-            gradient = style["background_gradient"]
-            if isinstance(gradient, dict) and "stops" in gradient and len(gradient["stops"]) > 0:
-                first_stop = gradient["stops"][0]
-                if isinstance(first_stop, dict) and "color" in first_stop:
-                    background_color = Color(first_stop["color"])
+        if computed.gradient is not None:
+            background = computed.gradient
         
         # Disegna il rettangolo del pulsante
-        self.canvas.draw_rectangle(
-            pos[0], pos[1], width, height,
-            background_color
-        )
+        self._recording.rectangle(x, y, width, height, background)
         
         # Disegna il testo centrato
-        text_x = pos[0] + (width - len(text) * 8) // 2
-        text_y = pos[1] + (height - 16) // 2
-        self.canvas.draw_text(text, text_x, text_y, text_color)
-        
-        # Memorizza la posizione per gli eventi
-        if "onClick" in node.props:
-            self._node_positions[id(node)] = (node, pos[0], pos[1], width, height)
-    
-    def _render_text(self, node: VirtualNode, pos: Tuple[int, int]):
-        style = node.props.get("style", {})
-        text = str(node.props.get("text", ""))
-        color = self._get_color_from_style(style, "color", "#000000")
-        font_size = self._get_style_value(style, "font_size", 14)
-        self.canvas.draw_text(text, pos[0], pos[1], color, font_size)
-    
-    def _render_container(self, node: VirtualNode, pos: Tuple[int, int]):
-        style = node.props.get("style", {})
+        text_x = x + (width - len(text) * 8) // 2
+        text_y = y + (height - 16) // 2
+        self._recording.text(text, text_x, text_y, text_color)
+    
+    def _layout_text(self, box: LayoutBox, computed: ComputedStyle):
+        # Stima larga dell'area occupata dal testo, usata solo per il damage tracking
+        box.width, box.height = self._intrinsic_size(box.node, computed)
+        box.painted = True
+    
+    def _paint_text(self, box: LayoutBox, bounds: Tuple[int, int, int, int]):
+        computed = box.computed
+        text = str(box.node.props.get("text", ""))
+        color = self.transitions.value(box, "color", self._text_color(box))
+        self._recording.text(text, bounds[0], bounds[1], color, computed.font_size)
+    
+    def _layout_container(self, box: LayoutBox, computed: ComputedStyle, previous: Optional[LayoutBox],
+                          forced: Optional[Tuple[Optional[float], Optional[float]]] = None):
+        node = box.node
         
         # Ottieni le dimensioni
-        width = self._get_style_value(style, "width", self.canvas.width)
-        height = self._get_style_value(style, "height", self.canvas.height)
+        width = computed.width if computed.width is not None else self.canvas.width
+        height = computed.height if computed.height is not None else self.canvas.height
+        if forced is not None:
+            width = forced[0] if forced[0] is not None else width
+            height = forced[1] if forced[1] is not None else height
         
-        # Ottieni padding e margini
-        padding_top = self._get_style_value(style, "padding_top", self._get_style_value(style, "padding", 0))
-        padding_right = self._get_style_value(style, "padding_right", self._get_style_value(style, "padding", 0))
-        padding_bottom = self._get_style_value(style, "padding_bottom", self._get_style_value(style, "padding", 0))
-        padding_left = self._get_style_value(style, "padding_left", self._get_style_value(style, "padding", 0))
+        # Sposta l'area disegnata considerando il margine
+        box.offset_x += computed.margin_left
+        box.offset_y += computed.margin_top
+        box.width = width
+        box.height = height
+        box.painted = True
         
-        margin_top = self._get_style_value(style, "margin_top", self._get_style_value(style, "margin", 0))
-        margin_right = self._get_style_value(style, "margin_right", self._get_style_value(style, "margin", 0))
-        margin_bottom = self._get_style_value(style, "margin_bottom", self._get_style_value(style, "margin", 0))
-        margin_left = self._get_style_value(style, "margin_left", self._get_style_value(style, "margin", 0))
+        # Calcola l'area di contenuto, relativa all'origine del box
+        content_x = computed.padding_left
+        content_y = computed.padding_top
+        content_width = width - (computed.padding_left + computed.padding_right)
+        content_height = height - (computed.padding_top + computed.padding_bottom)
         
-        # Calcola la posizione effettiva considerando il margine
-        actual_x = pos[0] + margin_left
-        actual_y = pos[1] + margin_top
+        if not node.children:
+            return
         
-        # Calcola l'area di contenuto
-        content_x = actual_x + padding_left
-        content_y = actual_y + padding_top
-        content_width = width - (padding_left + padding_right)
-        content_height = height - (padding_top + padding_bottom)
+        # I box dei figli invariati vengono riutilizzati: solo gli antenati
+        # di un nodo modificato vengono ricalcolati
+        previous_children = previous.previous_children() if previous is not None else {}
+        previous_boxes = previous.children if previous is not None else []
         
-        # Disegna lo sfondo se presente
-        if "background" in style:
-            background_color = self._get_color_from_style(style, "background")
-            self.canvas.draw_rectangle(
-                actual_x, actual_y, width, height,
-                background_color
-            )
+        if computed.display == "flex":
+            self._layout_flex(box, computed, previous, previous_children, previous_boxes,
+                              content_x, content_y, content_width, content_height)
         
-        # Se c'è un gradiente, usa quello invece del colore solido
-        if "background_gradient" in style:
-            gradient = style["background_gradient"]
-            if isinstance(gradient, dict) and "stops" in gradient and len(gradient["stops"]) > 0:
-                first_stop = gradient["stops"][0]
-                if isinstance(first_stop, dict) and "color" in first_stop:
-                    background_color = Color(first_stop["color"])
-                    self.canvas.draw_rectangle(
-                        actual_x, actual_y, width, height,
-                        background_color
-                    )
+        else:
+            # Layout block standard
+            current_y = content_y
+            for index, child in enumerate(node.children):
+                child_box = self._layout_node(child, self._previous_child(child, index, previous_children, previous_boxes))
+                current_y += child_box.computed.flow_margin_top
+                box.children.append((content_x, current_y, child_box))
+                current_y += (child_box.computed.height or 0) + child_box.computed.flow_margin_bottom
+    
+    @staticmethod
+    def _previous_child(child: VirtualNode, index: int, previous_children: Dict[int, LayoutBox],
+                        previous_boxes: List[Tuple[float, float, LayoutBox]]) -> Optional[LayoutBox]:
+        """
+        Box precedente di un figlio: quello dello stesso nodo oppure, per un
+        nodo ricostruito (es. un antenato di un componente aggiornato), quello
+        nella stessa posizione e dello stesso tipo, da cui riutilizzare i nipoti
+        """
+        previous = previous_children.get(id(child))
+        if previous is None and index < len(previous_boxes):
+            candidate = previous_boxes[index][2]
+            if candidate.node.component_type == child.component_type:
+                previous = candidate
+        return previous
+    
+    def _layout_flex(self, box: LayoutBox, computed: ComputedStyle, previous: Optional[LayoutBox],
+                     previous_children: Dict[int, LayoutBox], previous_boxes: List[Tuple[float, float, LayoutBox]],
+                     content_x: float, content_y: float, content_width: float, content_height: float):
+        """
+        Posiziona i figli con il motore flexbox di layout.flex. Il FlexLayout
+        passa dal box precedente a quello nuovo: vengono aggiornati solo gli
+        elementi dei figli cambiati e, se il risultato del motore resta
+        valido, solo quei figli vengono ricalcolati
+        """
+        row = computed.flex_direction in ("row", "row-reverse")
+        params = {
+            "direction": computed.flex_direction,
+            "wrap": computed.flex_wrap,
+            "justify_content": computed.justify_content,
+            "align_items": computed.align_items,
+            "gap": computed.gap,
+            "row_gap": computed.row_gap,
+            "align_content": computed.align_content,
+        }
+        layout = previous.flex if previous is not None else None
+        if layout is not None:
+            # Il layout appartiene a un solo box: un altro box che riprende lo
+            # stesso precedente ne crea uno nuovo
+            previous.flex = None
+        if layout is None or any(getattr(layout, name) != value for name, value in params.items()):
+            layout = FlexLayout(**params)
+        box.flex = layout
         
-        # Gestisci il layout dei figli
-        if node.children:
-            display = style.get("display", "block")
-            flex_direction = style.get("flex_direction", "row")
-            justify_content = style.get("justify_content", "flex-start")
-            align_items = style.get("align_items", "flex-start")
-            gap = self._get_style_value(style, "gap", 0)
-            
-            if display == "flex":
-                # Layout flex
-                children = node.children
-                total_children = len(children)
-                
-                # Calcola le dimensioni totali dei figli
-                total_flex_size = 0
-                child_sizes = []
-                
-                for child in children:
-                    child_style = child.props.get("style", {})
-                    if flex_direction == "row":
-                        size = self._get_style_value(child_style, "width", 0)
-                    else:
-                        size = self._get_style_value(child_style, "height", 0)
-                    child_sizes.append(size)
-                    total_flex_size += size
-                
-                # Calcola lo spazio disponibile
-                available_space = content_width if flex_direction == "row" else content_height
-                remaining_space = available_space - total_flex_size - (gap * (total_children - 1))
-                
-                # Distribuisci lo spazio in base a justify_content
-                if justify_content == "space-between" and total_children > 1:
-                    gap = remaining_space / (total_children - 1)
-                elif justify_content == "space-around" and total_children > 0:
-                    gap = remaining_space / total_children
-                elif justify_content == "space-evenly" and total_children > 0:
-                    gap = remaining_space / (total_children + 1)
-                
-                # Posiziona i figli
-                current_pos = content_x if flex_direction == "row" else content_y
-                
-                for i, child in enumerate(children):
-                    child_style = child.props.get("style", {})
-                    child_width = self._get_style_value(child_style, "width", 0)
-                    child_height = self._get_style_value(child_style, "height", 0)
-                    
-                    if flex_direction == "row":
-                        child_x = current_pos
-                        child_y = content_y
-                        if align_items == "center":
-                            child_y += (content_height - child_height) // 2
-                        elif align_items == "flex-end":
-                            child_y += content_height - child_height
-                        
-                        self._render_node(child, (child_x, child_y))
-                        current_pos += child_width + gap
-                    else:
-                        child_x = content_x
-                        child_y = current_pos
-                        if align_items == "center":
-                            child_x += (content_width - child_width) // 2
-                        elif align_items == "flex-end":
-                            child_x += content_width - child_width
-                        
-                        self._render_node(child, (child_x, child_y))
-                        current_pos += child_height + gap
+        # Gli elementi flex dipendono solo dallo stile dei figli: quelli dei
+        # figli con box precedente ancora valido restano invariati
+        children = box.node.children
+        canvas_size = (self.canvas.width, self.canvas.height)
+        valid = [False] * len(children)
+        child_styles: Dict[int, ComputedStyle] = {}
+        for index, child in enumerate(children):
+            style = child.props.get("style", _EMPTY_STYLE)
+            child_box = previous_boxes[index][2] if index < len(previous_boxes) else None
+            if (child_box is not None and index < len(layout.items) and layout.items[index].node is child and
+                    child_box.constraint[:2] == canvas_size and child_box.matches(child, style, child_box.constraint)):
+                valid[index] = True
+                continue
             
+            if child_box is not None and child_box.style is style:
+                child_style = child_box.computed
             else:
-                # Layout block standard
-                current_y = content_y
-                for child in node.children:
-                    child_style = child.props.get("style", {})
-                    child_margin_top = self._get_style_value(child_style, "margin_top", 0)
-                    child_margin_bottom = self._get_style_value(child_style, "margin_bottom", 0)
-                    
-                    current_y += child_margin_top
-                    self._render_node(child, (content_x, current_y))
-                    
-                    child_height = self._get_style_value(child_style, "height", 0)
-                    current_y += child_height + child_margin_bottom
-    
-    def _get_style_value(self, style: Dict[str, Any], key: str, default: Any = 0) -> int:
-        """Converte un valore di stile in un intero"""
-        if key not in style:
-            return default if isinstance(default, int) else 0
-            
-        value = style[key]
+                child_style = StyleCache.get_computed_style(style)
+            child_styles[index] = child_style
+            fields = self._flex_item_fields(child, child_style, computed, row)
+            if index >= len(layout.items):
+                layout.add_item(FlexItem(node=child, **fields))
+                continue
+            item = layout.items[index]
+            if any(getattr(item, name) != value for name, value in fields.items()):
+                layout.update_item(item, node=child, **fields)
+            else:
+                # Stessi parametri flex: il risultato del motore non cambia
+                item.node = child
+        for item in layout.items[len(children):]:
+            layout.remove_item(item)
         
-        # Se è già un intero, ritornalo
-        if isinstance(value, int):
-            return value
-            
-        # Se è un float, convertilo a int
-        if isinstance(value, float):
-            return int(value)
-            
-        # Se è una stringa, prova a convertirla
-        if isinstance(value, str):
-            # Rimuovi 'px' se presente
-            value = value.replace('px', '').strip()
-            try:
-                return int(float(value))
-            except ValueError:
-                return default if isinstance(default, int) else 0
-                
-        # Se è un dizionario (per padding/margin), prendi il valore più grande
-        if isinstance(value, dict):
-            try:
-                return max(self._get_style_value(value, k, 0) for k in ['top', 'right', 'bottom', 'left'])
-            except:
-                return default if isinstance(default, int) else 0
-                
-        # Per qualsiasi altro tipo, usa il default
-        return default if isinstance(default, int) else 0
\ No newline at end of file
+        compute_count = layout.compute_count
+        positions = layout.compute((content_width, content_height))
+        if (layout.compute_count == compute_count and len(previous_boxes) == len(children) and
+                (content_x, content_y) == (previous.computed.padding_left, previous.computed.padding_top)):
+            # Posizioni invariate: si riprendono i box dei figli validi
+            box.children = list(previous_boxes)
+            for index, child_valid in enumerate(valid):
+                if child_valid:
+                    self._reused_boxes.add(id(previous_boxes[index][2]))
+                else:
+                    box.children[index] = self._layout_flex_child(
+                        box, index, positions[index], row, previous_children, previous_boxes,
+                        content_x, content_y, child_styles.get(index))
+            return
+        
+        for index in range(len(children)):
+            box.children.append(self._layout_flex_child(
+                box, index, positions[index], row, previous_children, previous_boxes, content_x, content_y,
+                child_styles.get(index)))
+    
+    def _flex_item_fields(self, child: VirtualNode, child_style: ComputedStyle, computed: ComputedStyle,
+                          row: bool) -> Dict[str, Any]:
+        """Parametri del FlexItem di un figlio secondo il suo stile"""
+        main = child_style.width if row else child_style.height
+        cross = child_style.height if row else child_style.width
+        basis = child_style.flex_basis if child_style.flex_basis is not None else main
+        align = child_style.align_self if child_style.align_self != "auto" else computed.align_items
+        if cross is None and align.replace("_", "-") != "stretch":
+            # Senza stretch l'elemento mantiene la propria dimensione trasversale
+            intrinsic = self._intrinsic_size(child, child_style)
+            cross = intrinsic[1] if row else intrinsic[0]
+        return {
+            "grow": child_style.flex_grow,
+            "shrink": child_style.flex_shrink,
+            "basis": basis or 0,
+            "align_self": child_style.align_self,
+            "cross_size": cross,
+        }
+    
+    def _layout_flex_child(self, box: LayoutBox, index: int, position: Tuple[float, float, float, float], row: bool,
+                           previous_children: Dict[int, LayoutBox], previous_boxes: List[Tuple[float, float, LayoutBox]],
+                           content_x: float, content_y: float,
+                           computed: Optional[ComputedStyle] = None) -> Tuple[float, float, LayoutBox]:
+        """Box di un figlio flex nella posizione calcolata dal motore"""
+        child = box.node.children[index]
+        item = box.flex.items[index]
+        x, y, width, height = position
+        # Dimensione imposta solo sugli assi che il motore ha cambiato rispetto allo stile
+        main_size, cross_size = (width, height) if row else (height, width)
+        align = item.align_self if item.align_self != "auto" else box.flex.align_items
+        stretched = item.cross_size is None and align.replace("_", "-") == "stretch"
+        forced_main = main_size if main_size != item.basis else None
+        forced_cross = cross_size if stretched or (
+            item.cross_size is not None and cross_size != item.cross_size) else None
+        forced = None
+        if forced_main is not None or forced_cross is not None:
+            forced = (forced_main, forced_cross) if row else (forced_cross, forced_main)
+        child_box = self._layout_node(child, self._previous_child(child, index, previous_children, previous_boxes),
+                                      forced, computed)
+        return (content_x + x, content_y + y, child_box)
+    
+    def _paint_box(self, box: LayoutBox, x: float, y: float, static: bool = False):
+        """Disegna un box già calcolato e i suoi figli a partire da (x, y)"""
+        # Sottoalberi immutabili o con layout riutilizzato: passano dalla cache
+        if not static and box.children and (
+                id(box) in self._reused_boxes or isinstance(box.node, FrozenVirtualNode)):
+            self._paint_cached(box, x, y)
+            return
+        origin_x = x + box.offset_x
+        origin_y = y + box.offset_y
+        if box.painted:
+            self._record_paint(box, (origin_x, origin_y, box.width, box.height))
+        if not box.children:
+            return
+        
+        # overflow: hidden ritaglia i figli al box (e al ritaglio degli antenati)
+        outer_clip = self._clip
+        if box.computed.clip:
+            clip = (origin_x, origin_y, box.width, box.height)
+            if outer_clip is not None:
+                clip = self._intersect_rect(clip, outer_clip)
+            if clip[2] <= 0 or clip[3] <= 0:
+                return
+            self._clip = clip
+            self._recording.set_clip(*clip)
+        try:
+            for child_x, child_y, child in box.children:
+                self._paint_box(child, origin_x + child_x, origin_y + child_y, static)
+        finally:
+            if self._clip is not outer_clip:
+                self._clip = outer_clip
+                if outer_clip is not None:
+                    self._recording.set_clip(*outer_clip)
+                else:
+                    self._recording.reset_clip()
+    
+    def _paint_container(self, box: LayoutBox, bounds: Tuple[int, int, int, int]):
+        computed = box.computed
+        x, y, width, height = bounds
+        
+        # Disegna lo sfondo se presente
+        if computed.has_background:
+            background = self.transitions.value(box, "background", self._background(box, False))
+            self._recording.rectangle(x, y, width, height, background)
+        
+        # Se c'è un gradiente, usa quello invece del colore solido
+        if computed.gradient is not None:
+            self._recording.rectangle(x, y, width, height, computed.gradient)
+    
+    # Transizioni degli stili
+    
+    @staticmethod
+    def _background(box: LayoutBox, hovered: bool) -> Optional[int]:
+        """Colore di sfondo disegnato per il box, senza transizioni"""
+        computed = box.computed
+        component_type = box.node.component_type
+        if component_type == "button":
+            # Se il bottone è hovered, applica gli stili hover
+            if hovered and computed.hover_background is not None:
+                return computed.hover_background
+            return computed.background if computed.background is not None else _BUTTON_GRAY
+        if component_type == "container" and computed.has_background:
+            return computed.background if computed.background is not None else _BLACK
+        return None
+    
+    @staticmethod
+    def _text_color(box: LayoutBox) -> Optional[int]:
+        if box.node.component_type in ("button", "text"):
+            return box.computed.color if box.computed.color is not None else _BLACK
+        return None
+    
+    def _update_transitions(self, box: LayoutBox, backgrounds: Tuple[Optional[int], Optional[int]],
+                            colors: Tuple[Optional[int], Optional[int]]):
+        """Avvia, reindirizza o interrompe le transizioni dei colori del box"""
+        specs = box.computed.transitions
+        transitions = self.transitions
+        for property, (old, new) in (("background", backgrounds), ("color", colors)):
+            spec = specs.get(property, specs.get("all")) if specs is not None else None
+            transitions.update(box, property, transitions.value(box, property, old), new, spec)
+    
+    def _replace_box(self, previous: LayoutBox, box: LayoutBox):
+        """
+        Il box sostituisce quello dello stesso elemento nel layout precedente:
+        i colori cambiati con una transizione vengono interpolati
+        """
+        hovered = previous.node is self._hovered_node
+        if hovered and box.node is not previous.node:
+            # Il nodo ricostruito resta lo stesso elemento sotto il cursore
+            self._hovered_node = box.node
+        if box.computed.transitions is None and id(box.node) not in self.transitions.node_ids \
+                and id(previous.node) not in self.transitions.node_ids:
+            return
+        self.transitions.transfer(previous, box)
+        self._update_transitions(
+            box,
+            (self._background(previous, hovered), self._background(box, hovered)),
+            (self._text_color(previous), self._text_color(box)))
+    
+    def _transition_hover(self, node: Optional[VirtualNode], hovered: bool):
+        """Interpola lo sfondo di un nodo che entra o esce dallo stato hover"""
+        if node is None:
+            return
+        box = self._hit_index.value(id(node))
+        if box is None or (box.computed.transitions is None and id(node) not in self.transitions.node_ids):
+            return
+        color = self._text_color(box)
+        self._update_transitions(
+            box, (self._background(box, not hovered), self._background(box, hovered)), (color, color))
+    
+    def _on_transition_frame(self, boxes: List[LayoutBox]):
+        """Ridisegna solo i nodi i cui colori sono cambiati in questo frame"""
+        self._transition_frame += 1
+        for box in boxes:
+            self.invalidate_node(box.node)
+        self._flush_damage()
@@ -0,0 +1,128 @@
+from typing import Dict, Any, Callable, Hashable, Optional
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class FrameScheduler:
+    """
+    Scheduler dei frame in stile requestAnimationFrame.
+
+    Le richieste arrivate tra un frame e l'altro vengono accumulate ed
+    eseguite insieme al tick successivo: le callback di animazione ricevono
+    il timestamp del frame, i task registrati con la stessa chiave vengono
+    uniti in un'unica esecuzione. I task richiesti dalle callback di
+    animazione (es. i setter di stato chiamati da un'animazione) vengono
+    eseguiti nello stesso frame, dopo tutte le callback. Un tick esegue al più un frame per
+    intervallo (1 / target_fps).
+    """
+
+    def __init__(self, target_fps: float = 60.0, frame_budget: Optional[float] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.target_fps = target_fps
+        # Tempo massimo (in secondi) che un frame dovrebbe impiegare
+        self.frame_budget = frame_budget
+        self.frame_count = 0
+        self.over_budget_frames = 0
+        self.last_frame_time: Optional[float] = None
+        self.last_frame_duration = 0.0
+        self._next_handle = 0
+        self._frame_callbacks: Dict[int, Callable[[float], Any]] = {}
+        self._tasks: Dict[Hashable, Callable[[], Any]] = {}
+        self._wake: Optional[Callable[[float], None]] = None
+
+    @property
+    def target_fps(self) -> float:
+        return self._target_fps
+
+    @target_fps.setter
+    def target_fps(self, fps: float):
+        if fps <= 0:
+            raise ValueError("target_fps deve essere positivo")
+        self._target_fps = fps
+        self.frame_interval = 1.0 / fps
+
+    @property
+    def budget(self) -> float:
+        return self.frame_budget if self.frame_budget is not None else self.frame_interval
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._frame_callbacks or self._tasks)
+
+    def set_wake_handler(self, wake: Optional[Callable[[float], None]]):
+        """
+        Registra la funzione chiamata quando serve un nuovo frame e non ce
+        n'erano in attesa; riceve il ritardo in secondi prima del prossimo tick
+        """
+        self._wake = wake
+
+    def request_animation_frame(self, callback: Callable[[float], Any]) -> int:
+        """Esegue callback(timestamp) una sola volta al prossimo frame"""
+        was_idle = not self.has_pending
+        self._next_handle += 1
+        self._frame_callbacks[self._next_handle] = callback
+        if was_idle:
+            self._request_wake()
+        return self._next_handle
+
+    def cancel_animation_frame(self, handle: int):
+        self._frame_callbacks.pop(handle, None)
+
+    def schedule(self, callback: Callable[[], Any], key: Optional[Hashable] = None):
+        """
+        Esegue callback al prossimo frame; richieste con la stessa chiave
+        (di default la callback stessa) prima del frame vengono unite e
+        resta valida l'ultima callback
+        """
+        was_idle = not self.has_pending
+        self._tasks[callback if key is None else key] = callback
+        if was_idle:
+            self._request_wake()
+
+    def cancel(self, key: Hashable):
+        self._tasks.pop(key, None)
+
+    def time_until_next_frame(self, now: Optional[float] = None) -> float:
+        if self.last_frame_time is None:
+            return 0.0
+        now = self.clock() if now is None else now
+        return max(0.0, self.last_frame_time + self.frame_interval - now)
+
+    def tick(self, now: Optional[float] = None) -> bool:
+        """Esegue il frame se c'è lavoro in attesa ed è trascorso l'intervallo"""
+        now = self.clock() if now is None else now
+        if not self.has_pending or self.time_until_next_frame(now) > 0:
+            return False
+        self.run_frame(now)
+        return True
+
+    def run_frame(self, now: Optional[float] = None):
+        """Esegue subito il frame, indipendentemente dall'intervallo"""
+        now = self.clock() if now is None else now
+        # Le callback richieste durante il frame vanno al frame successivo
+        callbacks, self._frame_callbacks = self._frame_callbacks, {}
+
+        self.last_frame_time = now
+        self.frame_count += 1
+        try:
+            for callback in callbacks.values():
+                callback(now)
+            # I task includono quelli richiesti dalle callback appena eseguite;
+            # quelli richiesti dai task vanno al frame successivo
+            tasks, self._tasks = self._tasks, {}
+            for callback in tasks.values():
+                callback()
+        finally:
+            self.last_frame_duration = self.clock() - now
+            if self.last_frame_duration > self.budget:
+                self.over_budget_frames += 1
+                logger.debug(f"Frame {self.frame_count} over budget: "
+                             f"{self.last_frame_duration * 1000:.1f}ms")
+            if self.has_pending:
+                self._request_wake()
+
+    def _request_wake(self):
+        if self._wake is not None:
+            self._wake(self.time_until_next_frame())
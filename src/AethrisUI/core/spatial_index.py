@@ -0,0 +1,111 @@
+from typing import Dict, Any, List, Tuple, Optional, Callable, Hashable
+
+Rect = Tuple[int, int, int, int]  # x, y, width, height
+
+class SpatialIndex:
+    """
+    Indice spaziale a griglia uniforme per rettangoli con ordine di disegno.
+
+    Ogni elemento viene registrato in tutte le celle che il suo rettangolo
+    copre; le query per punto guardano una sola cella e restituiscono gli
+    elementi in ordine di z decrescente (il più in alto per primo).
+    """
+
+    def __init__(self, cell_size: int = 64):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Hashable]] = {}
+        self._entries: Dict[Hashable, Tuple[Rect, int, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def clear(self):
+        self._cells.clear()
+        self._entries.clear()
+
+    def _cell_range(self, rect: Rect) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        x, y, width, height = rect
+        return (int(x // size), int(y // size),
+                int((x + max(width, 1) - 1) // size), int((y + max(height, 1) - 1) // size))
+
+    def insert(self, key: Hashable, rect: Rect, z: int, value: Any = None):
+        """Registra (o aggiorna) un elemento con il suo rettangolo e livello z"""
+        if key in self._entries:
+            self.remove(key)
+        if rect[2] <= 0 or rect[3] <= 0:
+            return
+
+        self._entries[key] = (rect, z, value)
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                self._cells.setdefault((cx, cy), []).append(key)
+
+    def remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        cx0, cy0, cx1, cy1 = self._cell_range(entry[0])
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket:
+                    bucket.remove(key)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def bounds(self, key: Hashable) -> Optional[Rect]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def value(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        return entry[2] if entry else None
+
+    def query_point(self, x: int, y: int) -> List[Any]:
+        """Restituisce i valori che contengono il punto, dal più alto al più basso"""
+        size = self.cell_size
+        bucket = self._cells.get((int(x // size), int(y // size)))
+        if not bucket:
+            return []
+
+        hits = []
+        for key in bucket:
+            rect, z, value = self._entries[key]
+            if rect[0] <= x < rect[0] + rect[2] and rect[1] <= y < rect[1] + rect[3]:
+                hits.append((z, value))
+        hits.sort(key=lambda hit: hit[0], reverse=True)
+        return [value for _, value in hits]
+
+    def hit_test(self, x: int, y: int, predicate: Callable[[Any], bool] = None) -> Optional[Any]:
+        """Restituisce l'elemento più in alto nel punto che soddisfa il predicato"""
+        for value in self.query_point(x, y):
+            if predicate is None or predicate(value):
+                return value
+        return None
+
+    def query_rect(self, rect: Rect) -> List[Tuple[Rect, Any]]:
+        """Restituisce (rect, valore) degli elementi che intersecano rect, in ordine di z"""
+        x, y, width, height = rect
+        if width <= 0 or height <= 0:
+            return []
+
+        seen = set()
+        hits = []
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                for key in self._cells.get((cx, cy), ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    other, z, value = self._entries[key]
+                    if (other[0] < x + width and x < other[0] + other[2] and
+                            other[1] < y + height and y < other[1] + other[3]):
+                        hits.append((z, other, value))
+        hits.sort(key=lambda hit: hit[0])
+        return [(other, value) for _, other, value in hits]
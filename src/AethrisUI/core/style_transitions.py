@@ -0,0 +1,151 @@
+from typing import Any, Callable, Dict, List, Optional, Set
+import logging
+from .computed_style import TransitionSpec
+from .layout_box import LayoutBox
+from ..animation.easing import Easing
+
+logger = logging.getLogger(__name__)
+
+def interpolate_color(start: int, end: int, progress: float) -> int:
+    """Interpola canale per canale due colori 0xRRGGBBAA, limitando ogni canale a 0-255"""
+    result = 0
+    for shift in (24, 16, 8, 0):
+        a = (start >> shift) & 0xFF
+        b = (end >> shift) & 0xFF
+        # Gli easing che oltrepassano 0-1 non devono far ripartire il canale
+        result |= min(255, max(0, int(round(a + (b - a) * progress)))) << shift
+    return result
+
+class _Track:
+    """Transizione in corso di una proprietà"""
+    __slots__ = ("start", "end", "value", "start_time", "duration", "delay", "easing")
+
+class StyleTransitions:
+    """
+    Transizioni dichiarate con la chiave "transition" degli stili.
+
+    Il renderer confronta i valori dipinti di un box con quelli del box che
+    lo sostituisce (o del cambio di hover) e, per le proprietà con
+    transizione, avvia qui l'interpolazione dal valore mostrato in quel
+    momento al nuovo. A ogni frame dell'AnimationTicker i valori vengono
+    aggiornati e on_frame riceve i box cambiati, così il renderer ridisegna
+    solo quelli senza rieseguire componenti né layout.
+
+    Sono animabili le proprietà di solo disegno: "background" e "color"
+    (colori 0xRRGGBBAA).
+    """
+
+    def __init__(self, ticker: Any, on_frame: Callable[[List[LayoutBox]], Any]):
+        self.ticker = ticker
+        self.on_frame = on_frame
+        # Box e tracce delle proprietà in transizione, per id(box)
+        self._boxes: Dict[int, LayoutBox] = {}
+        self._tracks: Dict[int, Dict[str, _Track]] = {}
+        # Nodi con una transizione in corso, per la cache dei sottoalberi
+        self.node_ids: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._tracks)
+
+    def touches(self, node_ids: Set[int]) -> bool:
+        """Indica se qualcuno dei nodi ha una transizione in corso"""
+        return bool(self.node_ids) and not self.node_ids.isdisjoint(node_ids)
+
+    def value(self, box: LayoutBox, property: str, default: Any) -> Any:
+        """Valore mostrato ora per la proprietà del box"""
+        tracks = self._tracks.get(id(box))
+        if tracks is None:
+            return default
+        track = tracks.get(property)
+        return track.value if track is not None else default
+
+    def transfer(self, previous: LayoutBox, box: LayoutBox):
+        """Il box sostituisce previous (nuovo layout): le transizioni proseguono"""
+        tracks = self._tracks.pop(id(previous), None)
+        if tracks is None:
+            return
+        del self._boxes[id(previous)]
+        self.node_ids.discard(id(previous.node))
+        self._boxes[id(box)] = box
+        self._tracks[id(box)] = tracks
+        self.node_ids.add(id(box.node))
+
+    def update(self, box: LayoutBox, property: str, current: Optional[int], target: Optional[int],
+               spec: Optional[TransitionSpec]):
+        """
+        Porta la proprietà a target: con una transizione parte da current,
+        il valore mostrato ora; senza, il cambio è immediato
+        """
+        tracks = self._tracks.get(id(box))
+        track = tracks.get(property) if tracks is not None else None
+        if track is not None and track.end == target and spec is not None:
+            return
+        if spec is None or current is None or target is None or current == target:
+            if track is not None:
+                self._remove(box, property)
+            return
+
+        duration, delay, easing = spec
+        try:
+            easing_function = Easing.get_easing_function(easing)
+        except ValueError:
+            logger.debug(f"Easing non valido nella transizione: {easing}")
+            easing_function = Easing.linear
+
+        track = _Track()
+        track.start = current
+        track.end = target
+        track.value = current
+        track.start_time = self.ticker.time()
+        track.duration = duration
+        track.delay = delay
+        track.easing = easing_function
+        if tracks is None:
+            tracks = self._tracks[id(box)] = {}
+            self._boxes[id(box)] = box
+            self.node_ids.add(id(box.node))
+        tracks[property] = track
+        self.ticker.add(self)
+
+    def cancel(self, box: LayoutBox):
+        """Interrompe le transizioni del box, che mostra subito i valori finali"""
+        if self._tracks.pop(id(box), None) is not None:
+            del self._boxes[id(box)]
+            self.node_ids.discard(id(box.node))
+
+    def _remove(self, box: LayoutBox, property: str):
+        tracks = self._tracks[id(box)]
+        del tracks[property]
+        if not tracks:
+            self.cancel(box)
+
+    def advance(self, now: float) -> Optional[List[LayoutBox]]:
+        changed = []
+        finished = []
+        for key, tracks in self._tracks.items():
+            box = self._boxes[key]
+            for property, track in tracks.items():
+                elapsed = now - track.start_time - track.delay
+                if elapsed <= 0:
+                    continue
+                progress = elapsed / track.duration
+                if progress >= 1:
+                    value = track.end
+                    finished.append((box, property))
+                else:
+                    value = interpolate_color(track.start, track.end, track.easing(progress))
+                if value != track.value:
+                    track.value = value
+                    if not changed or changed[-1] is not box:
+                        changed.append(box)
+        # Le tracce concluse escono: il disegno usa di nuovo il valore dello stile
+        for box, property in finished:
+            self._remove(box, property)
+        return changed or None
+
+    def dispatch(self, boxes: List[LayoutBox]):
+        self.on_frame(boxes)
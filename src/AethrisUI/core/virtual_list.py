@@ -0,0 +1,245 @@
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+from array import array
+from bisect import bisect_right
+from .component import Component
+from .virtual_node import VirtualNode
+
+class VirtualList(Component):
+    """
+    Lista virtualizzata per un numero molto grande di righe.
+
+    Vengono costruiti i VirtualNode delle sole righe nel viewport più
+    overscan righe sopra e sotto; le righe che restano visibili durante lo
+    scroll vengono riutilizzate per identità, così il renderer ne riusa
+    layout e disegno, mentre quelle uscite dalla finestra vengono scartate.
+    Il viewport usa overflow: hidden e le righe sono spostate in blocco
+    dallo scroll.
+
+    row_height può essere un numero o una funzione dell'indice; con una
+    funzione le altezze vengono misurate solo fino alla riga richiesta e
+    sommate in una tabella di offset cercata con bisect. Anche lo scroll
+    misura solo fino alla fine del viewport richiesto: l'altezza totale
+    serve solo quando l'offset raggiunge la coda della lista.
+    """
+
+    def __init__(self, item_count: int, row_height: Union[float, Callable[[int], float]],
+                 render_item: Callable[[int], VirtualNode], height: int,
+                 width: Optional[int] = None, overscan: int = 3,
+                 style: Optional[Dict[str, Any]] = None,
+                 on_scroll: Optional[Callable[[int], Any]] = None):
+        super().__init__()
+        self.item_count = item_count
+        self.row_height = row_height
+        self.render_item = render_item
+        self.height = height
+        self.width = width
+        self.overscan = overscan
+        # Chiamata dopo ogni cambio di scroll, es. per richiedere un render
+        self.on_scroll = on_scroll
+        self.scroll_offset = 0
+        self._viewport_style = {**(style or {}), "height": height, "overflow": "hidden"}
+        if width is not None:
+            self._viewport_style["width"] = width
+        # Offset cumulativi delle righe misurate (solo con altezze variabili)
+        self._offsets = array('q', [0])
+        self._rows: Dict[int, VirtualNode] = {}
+        self._row_styles: Dict[int, Dict[str, Any]] = {}
+        self._range: Tuple[int, int] = (0, 0)
+        self._children: List[VirtualNode] = []
+        self._content: Optional[VirtualNode] = None
+        self.virtual_dom: Optional[VirtualNode] = None
+
+    # Geometria delle righe
+
+    def _fixed_height(self) -> Optional[float]:
+        return self.row_height if not callable(self.row_height) else None
+
+    def _measure_to(self, index: int):
+        """Misura le altezze fino alla riga index (esclusa)"""
+        offsets = self._offsets
+        row_height = self.row_height
+        for row in range(len(offsets) - 1, min(index, self.item_count)):
+            offsets.append(offsets[-1] + row_height(row))
+
+    def row_top(self, index: int) -> int:
+        """Offset verticale della riga index dall'inizio della lista"""
+        fixed = self._fixed_height()
+        if fixed is not None:
+            return index * fixed
+        self._measure_to(index)
+        return self._offsets[min(index, len(self._offsets) - 1)]
+
+    def index_at(self, offset: int) -> int:
+        """Indice della riga che contiene l'offset verticale"""
+        if self.item_count <= 0:
+            return 0
+        fixed = self._fixed_height()
+        if fixed is not None:
+            index = int(offset // fixed) if fixed > 0 else 0
+        else:
+            offsets = self._offsets
+            # Misura solo finché l'offset non è coperto
+            while offsets[-1] <= offset and len(offsets) <= self.item_count:
+                self._measure_to(min(len(offsets) - 1 + 256, self.item_count))
+            index = bisect_right(offsets, offset) - 1
+        return max(0, min(index, self.item_count - 1))
+
+    @property
+    def total_height(self) -> int:
+        return self.row_top(self.item_count)
+
+    @property
+    def max_scroll(self) -> int:
+        return max(0, self.total_height - self.height)
+
+    def visible_range(self) -> Tuple[int, int]:
+        """Righe [inizio, fine) da costruire: viewport più overscan"""
+        if self.item_count <= 0:
+            return (0, 0)
+        first = self.index_at(self.scroll_offset)
+        last = self.index_at(self.scroll_offset + max(self.height - 1, 0))
+        return (max(0, first - self.overscan), min(self.item_count, last + 1 + self.overscan))
+
+    # Scroll e aggiornamenti
+
+    def _clamp_scroll(self, offset: float) -> float:
+        """Limita l'offset allo scroll possibile misurando il minimo necessario"""
+        offset = max(0, offset)
+        if self._fixed_height() is None:
+            # Se le righe misurate coprono il viewport l'offset è valido
+            self.index_at(offset + self.height)
+            if self._offsets[-1] > offset + self.height:
+                return offset
+        return min(offset, self.max_scroll)
+
+    def scroll_to(self, offset: int):
+        offset = int(self._clamp_scroll(offset))
+        if offset != self.scroll_offset:
+            self.scroll_offset = offset
+            if self.on_scroll is not None:
+                self.on_scroll(offset)
+
+    def scroll_by(self, delta: int):
+        self.scroll_to(self.scroll_offset + delta)
+
+    def scroll_to_index(self, index: int, align: str = "start"):
+        """Porta la riga index all'inizio ("start"), al centro o alla fine del viewport"""
+        index = max(0, min(index, self.item_count - 1))
+        top = self.row_top(index)
+        if align == "center":
+            top -= (self.height - (self.row_top(index + 1) - top)) // 2
+        elif align == "end":
+            top = self.row_top(index + 1) - self.height
+        self.scroll_to(top)
+
+    def set_item_count(self, item_count: int):
+        """Cambia il numero di righe (es. nuove righe di log in coda)"""
+        self.item_count = item_count
+        if len(self._offsets) > item_count + 1:
+            del self._offsets[item_count + 1:]
+        for index in [index for index in self._rows if index >= item_count]:
+            del self._rows[index]
+        self._content = None
+        self.scroll_to(self.scroll_offset)
+
+    def refresh(self, start: int = 0, end: Optional[int] = None, heights_changed: bool = False):
+        """
+        Ricostruisce le righe [start, end) al prossimo render; con
+        heights_changed le loro altezze vengono misurate di nuovo
+        """
+        end = self.item_count if end is None else end
+        for index in [index for index in self._rows if start <= index < end]:
+            del self._rows[index]
+        if heights_changed and len(self._offsets) > start + 1:
+            del self._offsets[start + 1:]
+        self._content = None
+
+    # Render
+
+    def _row_style(self, height: int) -> Dict[str, Any]:
+        # Stili condivisi per altezza: le righe uguali riusano lo stesso dizionario
+        style = self._row_styles.get(height)
+        if style is None:
+            style = {"height": height}
+            if self.width is not None:
+                style["width"] = self.width
+            self._row_styles[height] = style
+        return style
+
+    def _render_row(self, index: int) -> VirtualNode:
+        height = self.row_top(index + 1) - self.row_top(index)
+        return VirtualNode("container", {"style": self._row_style(height)}, [self.render_item(index)])
+
+    def render(self) -> VirtualNode:
+        start, end = self.visible_range()
+        top = self.row_top(start)
+
+        if (start, end) != self._range or self._content is None:
+            # Le righe ancora nella finestra vengono riutilizzate, le altre scartate
+            previous = self._rows
+            rows = {}
+            children = []
+            for index in range(start, end):
+                row = previous.get(index)
+                if row is None:
+                    row = self._render_row(index)
+                rows[index] = row
+                children.append(row)
+            if children != self._children:
+                self._children = children
+            self._rows = rows
+            self._range = (start, end)
+            self._content = None
+
+        # Lo scroll sposta il contenuto; le righe restano gli stessi oggetti
+        content_top = top - self.scroll_offset
+        content = self._content
+        if content is None or content.props["style"]["top"] != content_top:
+            style = {"top": content_top, "height": self.row_top(end) - top}
+            if self.width is not None:
+                style["width"] = self.width
+            content = self._content = VirtualNode("container", {"style": style}, self._children)
+            self.virtual_dom = VirtualNode("container", {"style": self._viewport_style}, [content])
+        return self.virtual_dom
+
+class VirtualGrid(VirtualList):
+    """
+    Griglia virtualizzata: gli elementi sono disposti in righe di columns
+    celle di dimensione fissa e vengono costruite solo le righe visibili.
+    """
+
+    def __init__(self, item_count: int, columns: int, cell_size: Tuple[int, int],
+                 render_item: Callable[[int], VirtualNode], height: int,
+                 width: Optional[int] = None, gap: int = 0, overscan: int = 2,
+                 style: Optional[Dict[str, Any]] = None,
+                 on_scroll: Optional[Callable[[int], Any]] = None):
+        if columns <= 0:
+            raise ValueError("columns deve essere positivo")
+        self.columns = columns
+        self.cell_size = cell_size
+        self.gap = gap
+        self.item_total = item_count
+        self._cell_style = {"width": cell_size[0], "height": cell_size[1]}
+        super().__init__((item_count + columns - 1) // columns, cell_size[1] + gap,
+                         render_item, height, width, overscan, style, on_scroll)
+        self._grid_row_style = {**self._row_style(self.row_height), "display": "flex",
+                                "flex_direction": "row", "gap": gap}
+
+    def set_item_count(self, item_count: int):
+        self.item_total = item_count
+        super().set_item_count((item_count + self.columns - 1) // self.columns)
+
+    def index_position(self, index: int) -> Tuple[int, int]:
+        """(riga, colonna) dell'elemento index"""
+        return divmod(index, self.columns)
+
+    def scroll_to_item(self, index: int, align: str = "start"):
+        self.scroll_to_index(index // self.columns, align)
+
+    def _render_row(self, index: int) -> VirtualNode:
+        first = index * self.columns
+        cells = [
+            VirtualNode("container", {"style": self._cell_style}, [self.render_item(item)])
+            for item in range(first, min(first + self.columns, self.item_total))
+        ]
+        return VirtualNode("container", {"style": self._grid_row_style}, cells)
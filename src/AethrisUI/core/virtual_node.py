@@ -1,28 +1,75 @@
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+from types import MappingProxyType
+import sys
 from .state import State
 
-@dataclass
+# Figli condivisi dai nodi senza figli: una tupla vuota, quindi immutabile
+EMPTY_CHILDREN: Sequence['VirtualNode'] = ()
+
+# Props condivise dai nodi senza props, in sola lettura
+EMPTY_PROPS: Dict[str, Any] = MappingProxyType({})
+
 class VirtualNode:
     """
-    Rappresenta un nodo virtuale nell'albero dei componenti
+    Rappresenta un nodo virtuale nell'albero dei componenti.
+
+    Usa __slots__ per ridurre memoria e allocazioni sugli alberi molto
+    grandi. component_type viene internato, i nodi senza figli condividono
+    EMPTY_CHILDREN e le props non vengono mai modificate: se contengono
+    "children" e non sono passati figli espliciti, vengono lette da lì.
+    Il confronto tra nodi è per identità.
     """
-    component_type: str
-    props: Dict[str, Any]
-    children: Optional[List['VirtualNode']] = None
-    
-    def __post_init__(self):
-        """
-        Inizializza i valori di default dopo la creazione dell'istanza
-        """
-        if self.children is None:
-            self.children = []
-            
-        # Se ci sono children nei props, spostali nella lista children
-        if "children" in self.props:
-            if isinstance(self.props["children"], list):
-                self.children.extend(self.props["children"])
-            else:
-                self.children.append(self.props["children"])
-            del self.props["children"]
-    state: Optional[State] = None 
\ No newline at end of file
+    __slots__ = ("component_type", "props", "children", "state")
+
+    def __init__(self, component_type: str, props: Dict[str, Any] = None,
+                 children: Optional[Sequence['VirtualNode']] = None, state: Optional[State] = None):
+        if props is None:
+            props = EMPTY_PROPS
+        if "children" in props:
+            extra = props["children"]
+            if not isinstance(extra, (list, tuple)):
+                extra = [extra]
+            children = list(children) + list(extra) if children and children is not extra else extra
+        self.component_type = sys.intern(component_type)
+        self.props = props
+        self.children = children if children else EMPTY_CHILDREN
+        self.state = state
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(component_type={self.component_type!r}, "
+                f"props={self.props!r}, children={self.children!r})")
+
+    def freeze(self) -> 'FrozenVirtualNode':
+        """Restituisce una copia immutabile dell'intero sottoalbero"""
+        return FrozenVirtualNode(
+            self.component_type, self.props,
+            tuple(child.freeze() for child in self.children), self.state
+        )
+
+class FrozenVirtualNode(VirtualNode):
+    """VirtualNode i cui attributi non possono essere riassegnati dopo la creazione"""
+    __slots__ = ()
+
+    def __init__(self, component_type: str, props: Dict[str, Any] = None,
+                 children: Optional[Sequence['VirtualNode']] = None, state: Optional[State] = None):
+        setattr_ = object.__setattr__
+        if props is None:
+            props = EMPTY_PROPS
+        if "children" in props:
+            extra = props["children"]
+            if not isinstance(extra, (list, tuple)):
+                extra = (extra,)
+            children = tuple(children) + tuple(extra) if children and children is not extra else extra
+        setattr_(self, "component_type", sys.intern(component_type))
+        setattr_(self, "props", props)
+        setattr_(self, "children", tuple(children) if children else EMPTY_CHILDREN)
+        setattr_(self, "state", state)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"FrozenVirtualNode è immutabile: impossibile assegnare '{name}'")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"FrozenVirtualNode è immutabile: impossibile eliminare '{name}'")
+
+    def freeze(self) -> 'FrozenVirtualNode':
+        return self
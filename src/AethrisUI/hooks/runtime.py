@@ -0,0 +1,345 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Hashable
+from ..core.virtual_node import VirtualNode
+from ..core.scheduler import FrameScheduler
+from ..core.state import State
+from ..core.memo import MemoComponent
+from ..core.component_types import is_static
+
+# component_type dei nodi segnaposto che rappresentano un componente funzione
+COMPONENT = "component"
+
+# Fiber in fase di render: i hook chiamati ora leggono i suoi slot
+_current: Optional['Fiber'] = None
+
+def create_element(component: Callable[[Dict[str, Any]], Optional[VirtualNode]],
+                   props: Dict[str, Any] = None, key: Hashable = None) -> VirtualNode:
+    """
+    Crea il nodo segnaposto di un componente funzione. Il runtime lo
+    sostituisce con l'albero renderizzato da un'istanza persistente del
+    componente, che conserva i propri hook tra un render e l'altro.
+    """
+    return VirtualNode(COMPONENT, {"component": component, "props": props or {}, "key": key})
+
+def current_fiber() -> Optional['Fiber']:
+    return _current
+
+class Fiber:
+    """
+    Istanza di un componente funzione nell'albero.
+
+    Conserva gli slot dei hook nell'ordine di chiamata, l'ultimo elemento
+    restituito dal componente (con i segnaposto dei figli) e l'albero
+    espanso che ne risulta. Le istanze figlie sono identificate dalla prop
+    key o dalla posizione, insieme al componente.
+    """
+
+    def __init__(self, component: Callable, props: Dict[str, Any],
+                 parent: Optional['Fiber'], root: 'FiberRoot'):
+        self.component = component
+        self.props = props
+        self.parent = parent
+        self.root = root
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.static = is_static(component)
+        self.hooks: List[Any] = []
+        self.element: Optional[VirtualNode] = None
+        self.node: Optional[VirtualNode] = None
+        self.children: Dict[Tuple[Hashable, Callable], 'Fiber'] = {}
+        self.dirty = False
+        self.mounted = True
+        # Incrementato a ogni esecuzione del componente
+        self.version = 0
+        self._hook_index = 0
+        self._expanded: Dict[int, Tuple[VirtualNode, VirtualNode]] = {}
+
+    def schedule_update(self):
+        """Segna l'istanza da renderizzare di nuovo al prossimo frame"""
+        # I componenti statici non vengono mai eseguiti di nuovo
+        if self.mounted and not self.dirty and not self.static:
+            self.dirty = True
+            self.root._schedule(self)
+
+    def render(self):
+        """Esegue il componente e ne espande l'output"""
+        global _current
+        previous = _current
+        _current = self
+        self._hook_index = 0
+        try:
+            element = self.component(self.props)
+            # Componenti a classe (es. @static_component su una classe con render())
+            if element is not None and not isinstance(element, VirtualNode) and hasattr(element, "render"):
+                element = element.render()
+            self.element = element
+        finally:
+            _current = previous
+        self.dirty = False
+        self.version += 1
+        self.root._rendered.append(self)
+        self.expand()
+
+    def expand(self):
+        """Ricostruisce l'albero espanso senza eseguire di nuovo il componente"""
+        available = self.children
+        self.children = {}
+        expanded: Dict[int, Tuple[VirtualNode, VirtualNode]] = {}
+        if self.element is None:
+            self.node = None
+        else:
+            self.node = self._expand(self.element, available, [0], expanded)
+            if self.static:
+                # Sottoalbero immutabile: il renderer ne riusa layout e disegno
+                self.node = self.node.freeze()
+        self._expanded = expanded
+
+        # Le istanze non più presenti nell'output vengono smontate
+        for fiber in available.values():
+            fiber.unmount()
+
+    def _expand(self, element: VirtualNode, available: Dict, counter: List[int],
+                expanded: Dict[int, Tuple[VirtualNode, VirtualNode]]) -> Optional[VirtualNode]:
+        if element.component_type == COMPONENT:
+            return self._expand_component(element, available, counter)
+
+        if not element.children:
+            return element
+
+        children = []
+        for child in element.children:
+            node = self._expand(child, available, counter, expanded)
+            if node is not None:
+                children.append(node)
+
+        # Nessun segnaposto cambiato nel sottoalbero: l'elemento resta lo stesso
+        if len(children) == len(element.children) and all(
+                a is b for a, b in zip(children, element.children)):
+            return element
+
+        previous = self._expanded.get(id(element))
+        if (previous is not None and previous[0] is element and
+                len(previous[1].children) == len(children) and
+                all(a is b for a, b in zip(previous[1].children, children))):
+            node = previous[1]
+        else:
+            node = VirtualNode(element.component_type, element.props, children)
+        expanded[id(element)] = (element, node)
+        return node
+
+    def _expand_component(self, element: VirtualNode, available: Dict,
+                          counter: List[int]) -> Optional[VirtualNode]:
+        component = element.props["component"]
+        props = element.props["props"]
+        key = element.props.get("key")
+        if key is None:
+            key = ("#", counter[0])
+        counter[0] += 1
+
+        identity = (key, component)
+        fiber = available.pop(identity, None)
+        if fiber is None:
+            fiber = Fiber(component, props, self, self.root)
+            fiber.render()
+        elif fiber.static:
+            # I componenti statici vengono eseguiti una sola volta
+            pass
+        elif fiber.dirty or self._props_changed(component, fiber.props, props):
+            fiber.props = props
+            fiber.render()
+        else:
+            # Props equivalenti: si riusa l'albero precedente
+            fiber.props = props
+        self.children[identity] = fiber
+        return fiber.node
+
+    @staticmethod
+    def _props_changed(component: Callable, old_props: Dict[str, Any], new_props: Dict[str, Any]) -> bool:
+        if old_props is new_props:
+            return False
+        if isinstance(component, MemoComponent):
+            return not component.are_equal(old_props, new_props)
+        return True
+
+    def unmount(self):
+        """Smonta l'istanza e i figli eseguendo le funzioni di cleanup degli effetti"""
+        self.mounted = False
+        for fiber in self.children.values():
+            fiber.unmount()
+        for slot in self.hooks:
+            if isinstance(slot, _EffectSlot) and callable(slot.cleanup):
+                slot.cleanup()
+                slot.cleanup = None
+
+    def _next_slot(self, factory: Callable[[], Any]) -> Any:
+        index = self._hook_index
+        self._hook_index += 1
+        if index == len(self.hooks):
+            self.hooks.append(factory())
+        return self.hooks[index]
+
+class _StateSlot:
+    __slots__ = ("value", "setter")
+
+class _EffectSlot:
+    __slots__ = ("dependencies", "cleanup", "effect")
+
+class _MemoSlot:
+    __slots__ = ("dependencies", "value")
+
+class FiberRoot:
+    """
+    Radice di un albero di componenti funzione.
+
+    Gli aggiornamenti di stato vengono raccolti fino al frame successivo
+    dello scheduler: solo le istanze modificate vengono eseguite di nuovo,
+    mentre per gli antenati si ricostruiscono soltanto i nodi lungo il
+    percorso, lasciando invariati (per identità) i sottoalberi fratelli.
+    on_commit riceve il nuovo albero espanso.
+    """
+
+    def __init__(self, component: Callable[[Dict[str, Any]], Optional[VirtualNode]],
+                 props: Dict[str, Any] = None,
+                 on_commit: Callable[[VirtualNode], Any] = None,
+                 scheduler: FrameScheduler = None):
+        self.scheduler = scheduler if scheduler is not None else FrameScheduler()
+        self.on_commit = on_commit
+        self.fiber = Fiber(component, props or {}, None, self)
+        self.node: Optional[VirtualNode] = None
+        self._dirty: List[Fiber] = []
+        self._rendered: List[Fiber] = []
+
+    def render(self) -> Optional[VirtualNode]:
+        """Render completo iniziale; restituisce l'albero espanso"""
+        self._rendered = []
+        self.fiber.render()
+        self.node = self.fiber.node
+        self._run_effects()
+        return self.node
+
+    def unmount(self):
+        self.fiber.unmount()
+        self.scheduler.cancel(self._flush)
+
+    def _schedule(self, fiber: Fiber):
+        self._dirty.append(fiber)
+        self.scheduler.schedule(self._flush)
+
+    def _flush(self):
+        dirty, self._dirty = self._dirty, []
+        self._rendered = []
+
+        # Dall'alto verso il basso: un antenato già eseguito rende i discendenti puliti
+        dirty.sort(key=lambda fiber: fiber.depth)
+        for fiber in dirty:
+            if fiber.dirty and fiber.mounted:
+                fiber.render()
+
+        # Ricostruisce gli antenati dal basso verso l'alto senza eseguirli
+        ancestors: Dict[int, Fiber] = {}
+        for fiber in dirty:
+            parent = fiber.parent
+            while parent is not None and id(parent) not in ancestors:
+                ancestors[id(parent)] = parent
+                parent = parent.parent
+        for fiber in sorted(ancestors.values(), key=lambda fiber: fiber.depth, reverse=True):
+            if fiber.mounted:
+                fiber.expand()
+
+        if self.fiber.node is not self.node:
+            self.node = self.fiber.node
+            if self.on_commit is not None:
+                self.on_commit(self.node)
+        self._run_effects()
+
+    def _run_effects(self):
+        rendered, self._rendered = self._rendered, []
+        for fiber in rendered:
+            if not fiber.mounted:
+                continue
+            for slot in fiber.hooks:
+                if isinstance(slot, _EffectSlot) and slot.effect is not None:
+                    effect, slot.effect = slot.effect, None
+                    if callable(slot.cleanup):
+                        slot.cleanup()
+                    slot.cleanup = effect()
+
+def _dependencies_changed(previous: Optional[List[Any]], dependencies: Optional[List[Any]]) -> bool:
+    return (
+        dependencies is None or
+        previous is None or
+        len(dependencies) != len(previous) or
+        any(a is not b and a != b for a, b in zip(dependencies, previous))
+    )
+
+def use_state(initial_value: Any) -> Tuple[Any, Callable[[Any], None]]:
+    """
+    Restituisce (valore, setter). Il valore persiste tra i render
+    dell'istanza; il setter accetta anche una funzione del valore precedente
+    e non fa nulla se il nuovo valore è lo stesso oggetto del precedente.
+    """
+    fiber = _current
+    if fiber is None:
+        # Fuori da un FiberRoot lo stato non persiste tra le chiamate
+        state = State(initial_value)
+        return state.get(), state.set
+
+    def create():
+        slot = _StateSlot()
+        slot.value = initial_value
+
+        def set_state(value: Any):
+            if callable(value):
+                value = value(slot.value)
+            if value is slot.value:
+                return
+            slot.value = value
+            fiber.schedule_update()
+
+        slot.setter = set_state
+        return slot
+
+    slot = fiber._next_slot(create)
+    return slot.value, slot.setter
+
+def use_effect(effect: Callable, dependencies: List[Any] = None):
+    """
+    Esegue effect dopo il commit del render se le dipendenze sono cambiate.
+    Se effect restituisce una funzione, viene chiamata prima dell'esecuzione
+    successiva e allo smontaggio dell'istanza.
+    """
+    fiber = _current
+    if fiber is None:
+        return effect()
+
+    def create():
+        slot = _EffectSlot()
+        slot.dependencies = None
+        slot.cleanup = None
+        slot.effect = None
+        return slot
+
+    slot = fiber._next_slot(create)
+    if _dependencies_changed(slot.dependencies, dependencies):
+        slot.dependencies = dependencies
+        slot.effect = effect
+
+def use_memo(compute: Callable, dependencies: List[Any] = None):
+    """Restituisce il valore calcolato, ricalcolato solo se le dipendenze cambiano"""
+    fiber = _current
+    if fiber is None:
+        return compute()
+
+    def create():
+        slot = _MemoSlot()
+        slot.dependencies = None
+        slot.value = None
+        return slot
+
+    slot = fiber._next_slot(create)
+    if _dependencies_changed(slot.dependencies, dependencies):
+        slot.value = compute()
+        slot.dependencies = dependencies
+    return slot.value
+
+def use_callback(callback: Callable, dependencies: List[Any] = None):
+    """Restituisce la stessa callback finché le dipendenze non cambiano"""
+    return use_memo(lambda: callback, dependencies)
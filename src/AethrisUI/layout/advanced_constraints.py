@@ -1,11 +1,11 @@
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass
-import math
+from .cassowary import Constraint, Expression, SimplexSolver, Strength, Variable
 
 @dataclass
 class Anchor:
     target_id: str
-    edge: str  # "left", "right", "top", "bottom", "center"
+    edge: str  # "left", "right", "top", "bottom", "center", "center_x", "center_y"
     offset: int = 0
 
 @dataclass
@@ -18,47 +18,146 @@ class AdvancedConstraints:
     flex: float = 1.0
     aspect_ratio: Optional[float] = None
 
+_HORIZONTAL_EDGES = ("left", "right", "center_x")
+_VERTICAL_EDGES = ("top", "bottom", "center_y")
+
 class ConstraintSolver:
+    """
+    Risolve ancoraggi e proporzioni dei widget con il solver incrementale
+    di layout.cassowary.
+
+    Ogni widget ha quattro variabili (x, y, larghezza, altezza). La posizione
+    richiesta è un vincolo WEAK e la dimensione un vincolo MEDIUM, mentre
+    ancoraggi e aspect ratio sono obbligatori: le catene di ancoraggi si
+    risolvono indipendentemente dall'ordine di inserimento. Sugli assi
+    ancorati la posizione richiesta viene ignorata. Durante un
+    trascinamento (begin_drag/drag_to/end_drag) la posizione del widget è
+    una variabile di edit e ogni spostamento riottimizza solo i vincoli
+    che la coinvolgono.
+    """
+
     def __init__(self):
         self.widgets: Dict[str, Dict[str, Any]] = {}
         self.constraints: Dict[str, AdvancedConstraints] = {}
+        self._solver = SimplexSolver()
+        self._variables: Dict[str, Tuple[Variable, Variable, Variable, Variable]] = {}
+        # widget_id -> nome della variabile -> (valore richiesto, vincolo)
+        self._stays: Dict[str, Dict[str, Tuple[float, Constraint]]] = {}
+        self._applied: Dict[str, List[Constraint]] = {}
+        # widget_id -> (asse x ancorato, asse y ancorato)
+        self._anchored: Dict[str, Tuple[bool, bool]] = {}
+        # target_id -> widget ancorati a quel target
+        self._dependents: Dict[str, Set[str]] = {}
+        self._dragging: Set[str] = set()
+        self._resolved: Optional[Dict[str, Dict[str, Any]]] = None
     
     def add_widget(self, widget_id: str, position: Tuple[int, int], size: Tuple[int, int]):
+        """Aggiunge il widget o ne aggiorna posizione e dimensione richieste"""
         self.widgets[widget_id] = {
             "position": position,
             "size": size
         }
+        
+        if widget_id in self._variables:
+            self._set_stays(widget_id)
+            return
+        
+        self._variables[widget_id] = tuple(
+            Variable(f"{widget_id}.{name}") for name in ("x", "y", "width", "height"))
+        self._set_stays(widget_id)
+        
+        # Vincoli impostati prima del widget e ancoraggi che lo attendevano
+        if widget_id in self.constraints:
+            self._apply_constraints(widget_id)
+        for dependent in tuple(self._dependents.get(widget_id, ())):
+            if dependent in self._variables:
+                self._apply_constraints(dependent)
+    
+    def move_widget(self, widget_id: str, position: Tuple[int, int]):
+        self.add_widget(widget_id, position, self.widgets[widget_id]["size"])
+    
+    def remove_widget(self, widget_id: str):
+        if widget_id not in self._variables:
+            return
+        if widget_id in self._dragging:
+            self.end_drag(widget_id)
+        for _, constraint in self._stays.pop(widget_id).values():
+            self._solver.remove_constraint(constraint)
+        for constraint in self._applied.pop(widget_id, ()):
+            self._solver.remove_constraint(constraint)
+        del self._variables[widget_id]
+        del self.widgets[widget_id]
+        self._anchored.pop(widget_id, None)
+        self.constraints.pop(widget_id, None)
+        self._resolved = None
+        
+        # Gli ancoraggi verso il widget rimosso vengono ignorati
+        for dependent in tuple(self._dependents.get(widget_id, ())):
+            if dependent in self._variables:
+                self._apply_constraints(dependent)
     
     def set_constraints(self, widget_id: str, constraints: AdvancedConstraints):
+        """
+        Imposta i vincoli del widget; solleva UnsatisfiableConstraint (lasciando
+        attivi i vincoli precedenti) se sono in conflitto con quelli esistenti
+        """
+        previous = self.constraints.get(widget_id)
         self.constraints[widget_id] = constraints
+        if widget_id in self._variables:
+            try:
+                self._apply_constraints(widget_id)
+            except ValueError:
+                if previous is None:
+                    del self.constraints[widget_id]
+                else:
+                    self.constraints[widget_id] = previous
+                self._apply_constraints(widget_id)
+                raise
+    
+    def begin_drag(self, widget_id: str):
+        """Rende la posizione del widget una variabile di edit"""
+        if widget_id in self._dragging:
+            return
+        x, y, _, _ = self._variables[widget_id]
+        position = self.widgets[widget_id]["position"]
+        for variable, value in ((x, position[0]), (y, position[1])):
+            self._solver.add_edit_variable(variable, Strength.STRONG)
+            self._solver.suggest_value(variable, value)
+        self._dragging.add(widget_id)
+        self._resolved = None
+    
+    def drag_to(self, widget_id: str, position: Tuple[int, int]):
+        """Sposta il widget trascinato riottimizzando solo i vincoli coinvolti"""
+        if widget_id not in self._dragging:
+            self.begin_drag(widget_id)
+        x, y, _, _ = self._variables[widget_id]
+        self._solver.suggest_value(x, position[0])
+        self._solver.suggest_value(y, position[1])
+        self._resolved = None
+    
+    def end_drag(self, widget_id: str):
+        """Termina il trascinamento lasciando il widget dove è stato rilasciato"""
+        if widget_id not in self._dragging:
+            return
+        self._dragging.discard(widget_id)
+        x, y, _, _ = self._variables[widget_id]
+        self._solver.update_variables()
+        self.widgets[widget_id]["position"] = (x.value, y.value)
+        self._solver.remove_edit_variable(x)
+        self._solver.remove_edit_variable(y)
+        self._set_stays(widget_id)
     
     def solve(self) -> Dict[str, Dict[str, Any]]:
-        # Prima risolvi le dipendenze dirette (ancoraggi)
+        if self._resolved is not None:
+            return self._resolved
+        
+        self._solver.update_variables()
         resolved = {}
-        for widget_id, widget in self.widgets.items():
-            if widget_id not in self.constraints:
-                resolved[widget_id] = widget
-                continue
-            
-            constraints = self.constraints[widget_id]
-            new_pos = list(widget["position"])
-            
-            if constraints.anchors:
-                for edge, anchor in constraints.anchors.items():
-                    target = self.widgets.get(anchor.target_id)
-                    if not target:
-                        continue
-                    
-                    if edge == "left":
-                        if anchor.edge == "right":
-                            new_pos[0] = target["position"][0] + target["size"][0] + anchor.offset
-                        elif anchor.edge == "left":
-                            new_pos[0] = target["position"][0] + anchor.offset
-                    # Implementa altri casi di ancoraggio
-            
+        for widget_id, (x, y, width, height) in self._variables.items():
+            # + 0.0 normalizza gli zeri negativi prodotti dal tableau
             resolved[widget_id] = {
-                "position": tuple(new_pos),
-                "size": widget["size"]
+                "position": (x.value + 0.0, y.value + 0.0),
+                "size": (width.value + 0.0, height.value + 0.0)
             }
         
         # Poi applica constraints di distribuzione
@@ -66,9 +165,120 @@ class ConstraintSolver:
             if constraints.distribution:
                 self._apply_distribution(resolved, widget_id, constraints)
         
+        self._resolved = resolved
         return resolved
     
     def _apply_distribution(self, resolved: Dict[str, Dict[str, Any]], 
                           widget_id: str, constraints: AdvancedConstraints):
         # Implementa la logica di distribuzione
-        pass 
\ No newline at end of file
+        pass
+    
+    def _set_stays(self, widget_id: str):
+        """
+        Aggiorna i vincoli su posizione e dimensione richieste; vengono
+        sostituiti solo quelli il cui valore è cambiato
+        """
+        x, y, width, height = self._variables[widget_id]
+        widget = self.widgets[widget_id]
+        anchored_x, anchored_y = self._anchored.get(widget_id, (False, False))
+        requested = {
+            "width": (width, widget["size"][0], Strength.MEDIUM),
+            "height": (height, widget["size"][1], Strength.MEDIUM),
+            "x": (x, None if anchored_x else widget["position"][0], Strength.WEAK),
+            "y": (y, None if anchored_y else widget["position"][1], Strength.WEAK),
+        }
+        
+        stays = self._stays.get(widget_id)
+        if stays is None:
+            stays = self._stays[widget_id] = {}
+            for name, variable in (("min_width", width), ("min_height", height)):
+                constraint = Constraint(variable, ">=")
+                self._solver.add_constraint(constraint)
+                stays[name] = (0, constraint)
+        
+        for name, (variable, value, strength) in requested.items():
+            current = stays.get(name)
+            if current is not None:
+                if current[0] == value:
+                    continue
+                self._solver.remove_constraint(current[1])
+                del stays[name]
+            if value is not None:
+                constraint = Constraint(variable - value, "==", strength)
+                self._solver.add_constraint(constraint)
+                stays[name] = (value, constraint)
+        self._resolved = None
+    
+    def _apply_constraints(self, widget_id: str):
+        for constraint in self._applied.pop(widget_id, ()):
+            self._solver.remove_constraint(constraint)
+        self._resolved = None
+        
+        constraints = self.constraints.get(widget_id)
+        if constraints is None:
+            self._set_anchored(widget_id, (False, False))
+            return
+        
+        pending = []
+        anchored_x = anchored_y = False
+        if constraints.anchors:
+            for edge, anchor in constraints.anchors.items():
+                self._dependents.setdefault(anchor.target_id, set()).add(widget_id)
+                if anchor.target_id not in self._variables:
+                    continue
+                edge, target_edge = self._resolve_edges(edge, anchor.edge)
+                if edge in _HORIZONTAL_EDGES:
+                    anchored_x = True
+                else:
+                    anchored_y = True
+                expression = (self._edge(widget_id, edge) -
+                              self._edge(anchor.target_id, target_edge) - anchor.offset)
+                pending.append(Constraint(expression, "=="))
+        
+        if constraints.aspect_ratio:
+            _, _, width, height = self._variables[widget_id]
+            pending.append(Constraint(width - height * constraints.aspect_ratio, "=="))
+        
+        applied = []
+        try:
+            for constraint in pending:
+                self._solver.add_constraint(constraint)
+                applied.append(constraint)
+        except ValueError:
+            for constraint in applied:
+                self._solver.remove_constraint(constraint)
+            raise
+        self._applied[widget_id] = applied
+        self._set_anchored(widget_id, (anchored_x, anchored_y))
+    
+    def _set_anchored(self, widget_id: str, anchored: Tuple[bool, bool]):
+        if self._anchored.get(widget_id, (False, False)) != anchored:
+            self._anchored[widget_id] = anchored
+            self._set_stays(widget_id)
+    
+    @staticmethod
+    def _resolve_edges(edge: str, target_edge: str) -> Tuple[str, str]:
+        # "center" assume l'asse dell'altro bordo (orizzontale se entrambi center)
+        if edge == "center":
+            edge = "center_y" if target_edge in _VERTICAL_EDGES else "center_x"
+        if target_edge == "center":
+            target_edge = "center_y" if edge in _VERTICAL_EDGES else "center_x"
+        if (edge in _HORIZONTAL_EDGES) != (target_edge in _HORIZONTAL_EDGES):
+            raise ValueError(f"Ancoraggio tra assi diversi: {edge} -> {target_edge}")
+        return edge, target_edge
+    
+    def _edge(self, widget_id: str, edge: str) -> Expression:
+        x, y, width, height = self._variables[widget_id]
+        if edge == "left":
+            return Expression.of(x)
+        if edge == "right":
+            return x + width
+        if edge == "center_x":
+            return x + width * 0.5
+        if edge == "top":
+            return Expression.of(y)
+        if edge == "bottom":
+            return y + height
+        if edge == "center_y":
+            return y + height * 0.5
+        raise ValueError(f"Bordo di ancoraggio non valido: {edge}")
\ No newline at end of file
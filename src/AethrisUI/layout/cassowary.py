@@ -0,0 +1,507 @@
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+# Risolutore incrementale di vincoli lineari (algoritmo Cassowary).
+# Il tableau del simplesso resta in memoria tra una risoluzione e l'altra:
+# aggiungere o rimuovere un vincolo fa pivot solo sulle righe coinvolte e
+# suggest_value() sposta una variabile di edit con il simplesso duale,
+# toccando soltanto le righe che contengono le sue variabili d'errore.
+
+_EPSILON = 1.0e-8
+
+def _near_zero(value: float) -> bool:
+    return -_EPSILON < value < _EPSILON
+
+class Strength:
+    """Priorità dei vincoli: i vincoli non obbligatori possono essere violati"""
+    REQUIRED = 1001001000.0
+    STRONG = 1000000.0
+    MEDIUM = 1000.0
+    WEAK = 1.0
+
+    @staticmethod
+    def clip(strength: float) -> float:
+        return max(0.0, min(Strength.REQUIRED, strength))
+
+class UnsatisfiableConstraint(ValueError):
+    """Il vincolo obbligatorio è in conflitto con quelli già presenti"""
+
+class Variable:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str = "", value: float = 0.0):
+        self.name = name
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Variable({self.name!r}, {self.value})"
+
+    def __add__(self, other) -> 'Expression':
+        return Expression.of(self) + other
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> 'Expression':
+        return Expression.of(self) - other
+
+    def __rsub__(self, other) -> 'Expression':
+        return Expression.of(other) - self
+
+    def __mul__(self, coefficient: float) -> 'Expression':
+        return Expression.of(self) * coefficient
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Expression':
+        return Expression.of(self) * -1
+
+class Expression:
+    """Combinazione lineare di variabili più una costante"""
+    __slots__ = ("terms", "constant")
+
+    def __init__(self, terms: Dict[Variable, float] = None, constant: float = 0.0):
+        self.terms = terms if terms is not None else {}
+        self.constant = constant
+
+    @staticmethod
+    def of(value: Union['Expression', Variable, float]) -> 'Expression':
+        if isinstance(value, Expression):
+            return value
+        if isinstance(value, Variable):
+            return Expression({value: 1.0})
+        return Expression(constant=float(value))
+
+    def __add__(self, other) -> 'Expression':
+        other = Expression.of(other)
+        terms = dict(self.terms)
+        for variable, coefficient in other.terms.items():
+            terms[variable] = terms.get(variable, 0.0) + coefficient
+        return Expression(terms, self.constant + other.constant)
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> 'Expression':
+        return self + Expression.of(other) * -1
+
+    def __rsub__(self, other) -> 'Expression':
+        return Expression.of(other) - self
+
+    def __mul__(self, coefficient: float) -> 'Expression':
+        return Expression({variable: value * coefficient for variable, value in self.terms.items()},
+                          self.constant * coefficient)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Expression':
+        return self * -1
+
+class Constraint:
+    """
+    Vincolo "expression op 0" con op tra "==", "<=" e ">=". I vincoli sono
+    confrontati per identità: lo stesso oggetto va passato a remove_constraint.
+    """
+    __slots__ = ("expression", "op", "strength")
+
+    def __init__(self, expression: Union[Expression, Variable], op: str = "==",
+                 strength: float = Strength.REQUIRED):
+        if op not in ("==", "<=", ">="):
+            raise ValueError(f"Operatore non valido: {op}")
+        self.expression = Expression.of(expression)
+        self.op = op
+        self.strength = Strength.clip(strength)
+
+    @property
+    def required(self) -> bool:
+        return self.strength >= Strength.REQUIRED
+
+# Tipi dei simboli del tableau
+_EXTERNAL = 0
+_SLACK = 1
+_ERROR = 2
+_DUMMY = 3
+
+class _Symbol:
+    __slots__ = ("kind",)
+
+    def __init__(self, kind: int):
+        self.kind = kind
+
+class _Row:
+    """Riga del tableau: costante + somma dei coefficienti per i simboli"""
+    __slots__ = ("constant", "cells")
+
+    def __init__(self, constant: float = 0.0, cells: Dict[_Symbol, float] = None):
+        self.constant = constant
+        self.cells = cells if cells is not None else {}
+
+    def copy(self) -> '_Row':
+        return _Row(self.constant, dict(self.cells))
+
+    def add(self, value: float) -> float:
+        self.constant += value
+        return self.constant
+
+    def insert_symbol(self, symbol: _Symbol, coefficient: float = 1.0):
+        value = self.cells.get(symbol, 0.0) + coefficient
+        if _near_zero(value):
+            self.cells.pop(symbol, None)
+        else:
+            self.cells[symbol] = value
+
+    def insert_row(self, other: '_Row', coefficient: float = 1.0):
+        self.constant += other.constant * coefficient
+        for symbol, value in other.cells.items():
+            self.insert_symbol(symbol, value * coefficient)
+
+    def reverse_sign(self):
+        self.constant = -self.constant
+        self.cells = {symbol: -value for symbol, value in self.cells.items()}
+
+    def solve_for(self, symbol: _Symbol):
+        """Riscrive la riga come symbol = ..."""
+        coefficient = -1.0 / self.cells.pop(symbol)
+        self.constant *= coefficient
+        self.cells = {other: value * coefficient for other, value in self.cells.items()}
+
+    def solve_for_pair(self, lhs: _Symbol, rhs: _Symbol):
+        """Riga che risolveva lhs riscritta per risolvere rhs"""
+        self.insert_symbol(lhs, -1.0)
+        self.solve_for(rhs)
+
+    def substitute(self, symbol: _Symbol, row: '_Row'):
+        coefficient = self.cells.pop(symbol, None)
+        if coefficient is not None:
+            self.insert_row(row, coefficient)
+
+class _Tag:
+    __slots__ = ("marker", "other")
+
+    def __init__(self, marker: _Symbol, other: Optional[_Symbol] = None):
+        self.marker = marker
+        self.other = other
+
+class _EditInfo:
+    __slots__ = ("constraint", "tag", "constant")
+
+    def __init__(self, constraint: Constraint, tag: _Tag):
+        self.constraint = constraint
+        self.tag = tag
+        self.constant = 0.0
+
+class SimplexSolver:
+    """
+    Risolutore Cassowary: vincoli obbligatori e preferenze pesate
+    (STRONG, MEDIUM, WEAK) risolti in modo incrementale.
+
+    Per le interazioni continue (es. trascinamento) si registra una
+    variabile di edit con add_edit_variable() e si chiama suggest_value()
+    a ogni frame, poi update_variables() per leggere i nuovi valori.
+    """
+
+    def __init__(self):
+        self._constraints: Dict[Constraint, _Tag] = {}
+        self._rows: Dict[_Symbol, _Row] = {}
+        # Simbolo -> simboli in base le cui righe possono contenerlo; è un
+        # sovrainsieme (le voci obsolete vengono scartate alla lettura) che
+        # evita di scorrere tutto il tableau a ogni pivot
+        self._columns: Dict[_Symbol, Set[_Symbol]] = {}
+        self._variables: Dict[Variable, _Symbol] = {}
+        self._edits: Dict[Variable, _EditInfo] = {}
+        self._infeasible: List[_Symbol] = []
+        self._objective = _Row()
+        self._artificial: Optional[_Row] = None
+
+    def has_constraint(self, constraint: Constraint) -> bool:
+        return constraint in self._constraints
+
+    def add_constraint(self, constraint: Constraint):
+        if constraint in self._constraints:
+            raise ValueError("Vincolo già presente nel solver")
+
+        tag, row = self._create_row(constraint)
+        subject = self._choose_subject(row, tag)
+
+        if subject is None and all(symbol.kind == _DUMMY for symbol in row.cells):
+            if not _near_zero(row.constant):
+                raise UnsatisfiableConstraint("Vincolo obbligatorio non soddisfacibile")
+            subject = tag.marker
+
+        if subject is None:
+            if not self._add_with_artificial_variable(row):
+                # Il vincolo viene scartato lasciando valido il tableau
+                marker = tag.marker
+                if marker in self._rows or any(marker in basic.cells for basic in self._rows.values()):
+                    self._remove_tag(tag)
+                self._optimize(self._objective)
+                raise UnsatisfiableConstraint("Vincolo obbligatorio non soddisfacibile")
+        else:
+            row.solve_for(subject)
+            self._substitute(subject, row)
+            self._set_row(subject, row)
+
+        self._constraints[constraint] = tag
+        self._optimize(self._objective)
+
+    def remove_constraint(self, constraint: Constraint):
+        tag = self._constraints.pop(constraint, None)
+        if tag is None:
+            raise KeyError("Vincolo non presente nel solver")
+        self._remove_tag(tag, constraint.strength)
+        self._optimize(self._objective)
+
+    def add_edit_variable(self, variable: Variable, strength: float = Strength.STRONG):
+        if variable in self._edits:
+            raise ValueError(f"{variable.name} è già una variabile di edit")
+        if Strength.clip(strength) >= Strength.REQUIRED:
+            raise ValueError("Una variabile di edit non può essere obbligatoria")
+        constraint = Constraint(Expression.of(variable), "==", strength)
+        self.add_constraint(constraint)
+        self._edits[variable] = _EditInfo(constraint, self._constraints[constraint])
+
+    def remove_edit_variable(self, variable: Variable):
+        info = self._edits.pop(variable, None)
+        if info is None:
+            raise KeyError(f"{variable.name} non è una variabile di edit")
+        self.remove_constraint(info.constraint)
+
+    def has_edit_variable(self, variable: Variable) -> bool:
+        return variable in self._edits
+
+    def suggest_value(self, variable: Variable, value: float):
+        """Sposta una variabile di edit ripristinando l'ottimo con il simplesso duale"""
+        info = self._edits.get(variable)
+        if info is None:
+            raise KeyError(f"{variable.name} non è una variabile di edit")
+
+        delta = value - info.constant
+        info.constant = value
+        marker, other = info.tag.marker, info.tag.other
+
+        row = self._rows.get(marker)
+        if row is not None:
+            if row.add(-delta) < 0.0:
+                self._infeasible.append(marker)
+        else:
+            row = self._rows.get(other)
+            if row is not None:
+                if row.add(delta) < 0.0:
+                    self._infeasible.append(other)
+            else:
+                for symbol, row in self._rows_with(marker):
+                    if row.add(delta * row.cells[marker]) < 0.0 and symbol.kind != _EXTERNAL:
+                        self._infeasible.append(symbol)
+        self._dual_optimize()
+
+    def update_variables(self):
+        """Copia nei Variable.value i valori della soluzione corrente"""
+        rows = self._rows
+        for variable, symbol in self._variables.items():
+            row = rows.get(symbol)
+            variable.value = row.constant if row is not None else 0.0
+
+    def _remove_tag(self, tag: _Tag, strength: float = Strength.REQUIRED):
+        # Toglie dall'obiettivo il contributo delle variabili d'errore
+        for symbol in (tag.marker, tag.other):
+            if symbol is not None and symbol.kind == _ERROR:
+                row = self._rows.get(symbol)
+                if row is not None:
+                    self._objective.insert_row(row, -strength)
+                else:
+                    self._objective.insert_symbol(symbol, -strength)
+
+        marker = tag.marker
+        if self._rows.pop(marker, None) is None:
+            leaving = self._marker_leaving_symbol(marker)
+            if leaving is None:
+                raise RuntimeError("Tableau del solver non valido")
+            row = self._rows.pop(leaving)
+            row.solve_for_pair(leaving, marker)
+            self._substitute(marker, row)
+
+    def _create_row(self, constraint: Constraint) -> Tuple[_Tag, _Row]:
+        expression = constraint.expression
+        row = _Row(expression.constant)
+
+        # Le variabili già in base vengono sostituite con la loro riga
+        for variable, coefficient in expression.terms.items():
+            if _near_zero(coefficient):
+                continue
+            symbol = self._variables.get(variable)
+            if symbol is None:
+                symbol = self._variables[variable] = _Symbol(_EXTERNAL)
+            basic = self._rows.get(symbol)
+            if basic is not None:
+                row.insert_row(basic, coefficient)
+            else:
+                row.insert_symbol(symbol, coefficient)
+
+        strength = constraint.strength
+        if constraint.op != "==":
+            coefficient = 1.0 if constraint.op == "<=" else -1.0
+            slack = _Symbol(_SLACK)
+            tag = _Tag(slack)
+            row.insert_symbol(slack, coefficient)
+            if strength < Strength.REQUIRED:
+                error = _Symbol(_ERROR)
+                tag.other = error
+                row.insert_symbol(error, -coefficient)
+                self._objective.insert_symbol(error, strength)
+        elif strength < Strength.REQUIRED:
+            error_plus = _Symbol(_ERROR)
+            error_minus = _Symbol(_ERROR)
+            tag = _Tag(error_plus, error_minus)
+            row.insert_symbol(error_plus, -1.0)
+            row.insert_symbol(error_minus, 1.0)
+            self._objective.insert_symbol(error_plus, strength)
+            self._objective.insert_symbol(error_minus, strength)
+        else:
+            tag = _Tag(_Symbol(_DUMMY))
+            row.insert_symbol(tag.marker)
+
+        if row.constant < 0.0:
+            row.reverse_sign()
+        return tag, row
+
+    @staticmethod
+    def _choose_subject(row: _Row, tag: _Tag) -> Optional[_Symbol]:
+        for symbol in row.cells:
+            if symbol.kind == _EXTERNAL:
+                return symbol
+        for symbol in (tag.marker, tag.other):
+            if (symbol is not None and symbol.kind in (_SLACK, _ERROR) and
+                    row.cells.get(symbol, 0.0) < 0.0):
+                return symbol
+        return None
+
+    def _add_with_artificial_variable(self, row: _Row) -> bool:
+        artificial = _Symbol(_SLACK)
+        self._set_row(artificial, row.copy())
+        self._artificial = row.copy()
+        self._optimize(self._artificial)
+        success = _near_zero(self._artificial.constant)
+        self._artificial = None
+
+        basic = self._rows.pop(artificial, None)
+        if basic is not None:
+            if not basic.cells:
+                return success
+            entering = next((symbol for symbol in basic.cells
+                             if symbol.kind in (_SLACK, _ERROR)), None)
+            if entering is None:
+                return False
+            basic.solve_for_pair(artificial, entering)
+            self._substitute(entering, basic)
+            self._set_row(entering, basic)
+
+        for _, basic in self._rows_with(artificial):
+            basic.cells.pop(artificial, None)
+        self._columns.pop(artificial, None)
+        self._objective.cells.pop(artificial, None)
+        return success
+
+    def _set_row(self, symbol: _Symbol, row: _Row):
+        self._rows[symbol] = row
+        columns = self._columns
+        for cell in row.cells:
+            basics = columns.get(cell)
+            if basics is None:
+                columns[cell] = {symbol}
+            else:
+                basics.add(symbol)
+
+    def _rows_with(self, symbol: _Symbol) -> Iterator[Tuple[_Symbol, _Row]]:
+        """Righe del tableau che contengono symbol"""
+        rows = self._rows
+        for basic_symbol in tuple(self._columns.get(symbol, ())):
+            row = rows.get(basic_symbol)
+            if row is not None and symbol in row.cells:
+                yield basic_symbol, row
+
+    def _substitute(self, symbol: _Symbol, row: _Row):
+        # Solo le righe che contengono symbol cambiano
+        columns = self._columns
+        for basic_symbol, basic in list(self._rows_with(symbol)):
+            basic.substitute(symbol, row)
+            for cell in row.cells:
+                basics = columns.get(cell)
+                if basics is None:
+                    columns[cell] = {basic_symbol}
+                else:
+                    basics.add(basic_symbol)
+            if basic_symbol.kind != _EXTERNAL and basic.constant < 0.0:
+                self._infeasible.append(basic_symbol)
+        columns.pop(symbol, None)
+        self._objective.substitute(symbol, row)
+        if self._artificial is not None:
+            self._artificial.substitute(symbol, row)
+
+    def _optimize(self, objective: _Row):
+        while True:
+            entering = next((symbol for symbol, coefficient in objective.cells.items()
+                             if symbol.kind != _DUMMY and coefficient < 0.0), None)
+            if entering is None:
+                return
+
+            leaving = None
+            ratio = float("inf")
+            for symbol, row in self._rows_with(entering):
+                if symbol.kind == _EXTERNAL:
+                    continue
+                coefficient = row.cells[entering]
+                if coefficient < 0.0:
+                    candidate = -row.constant / coefficient
+                    if candidate < ratio:
+                        ratio = candidate
+                        leaving = symbol
+            if leaving is None:
+                raise RuntimeError("Obiettivo del solver illimitato")
+
+            row = self._rows.pop(leaving)
+            row.solve_for_pair(leaving, entering)
+            self._substitute(entering, row)
+            self._set_row(entering, row)
+
+    def _dual_optimize(self):
+        rows = self._rows
+        while self._infeasible:
+            leaving = self._infeasible.pop()
+            row = rows.get(leaving)
+            if row is None or _near_zero(row.constant) or row.constant >= 0.0:
+                continue
+
+            entering = None
+            ratio = float("inf")
+            for symbol, coefficient in row.cells.items():
+                if coefficient > 0.0 and symbol.kind != _DUMMY:
+                    candidate = self._objective.cells.get(symbol, 0.0) / coefficient
+                    if candidate < ratio:
+                        ratio = candidate
+                        entering = symbol
+            if entering is None:
+                raise RuntimeError("Ottimizzazione duale del solver fallita")
+
+            del rows[leaving]
+            row.solve_for_pair(leaving, entering)
+            self._substitute(entering, row)
+            self._set_row(entering, row)
+
+    def _marker_leaving_symbol(self, marker: _Symbol) -> Optional[_Symbol]:
+        first = second = third = None
+        first_ratio = second_ratio = float("inf")
+        for symbol, row in self._rows_with(marker):
+            coefficient = row.cells[marker]
+            if symbol.kind == _EXTERNAL:
+                third = symbol
+            elif coefficient < 0.0:
+                ratio = -row.constant / coefficient
+                if ratio < first_ratio:
+                    first_ratio = ratio
+                    first = symbol
+            else:
+                ratio = row.constant / coefficient
+                if ratio < second_ratio:
+                    second_ratio = ratio
+                    second = symbol
+        return first or second or third
+
+__all__ = ['Strength', 'UnsatisfiableConstraint', 'Variable', 'Expression',
+           'Constraint', 'SimplexSolver']
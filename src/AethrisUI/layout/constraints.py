@@ -1,5 +1,6 @@
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from dataclasses import dataclass, field
+from ..core.spatial_index import SpatialIndex
 
 @dataclass
 class Anchor:
@@ -30,22 +31,46 @@ class AdvancedConstraints:
     max_size: Optional[Tuple[int, int]] = None
 
 class ConstraintManager:
-    def __init__(self):
+    """
+    Vincoli e bounds dei widget. Le collisioni passano da un indice spaziale
+    a griglia (core.spatial_index) aggiornato in update_bounds: una query
+    esamina solo i widget nelle celle coperte dal rettangolo, non tutti.
+    """
+    def __init__(self, cell_size: int = 128):
         self.widget_constraints: Dict[str, AdvancedConstraints] = {}
         self.widget_bounds: Dict[str, Tuple[int, int, int, int]] = {}  # x, y, width, height
+        self._index = SpatialIndex(cell_size)
     
     def add_widget(self, widget_id: str, constraints: AdvancedConstraints):
         self.widget_constraints[widget_id] = constraints
     
+    def remove_widget(self, widget_id: str):
+        self.widget_constraints.pop(widget_id, None)
+        self.widget_bounds.pop(widget_id, None)
+        self._index.remove(widget_id)
+    
     def update_bounds(self, widget_id: str, bounds: Tuple[int, int, int, int]):
         self.widget_bounds[widget_id] = bounds
+        # I bordi a contatto contano come collisione: anche i widget di
+        # dimensione nulla occupano almeno un'unità nell'indice
+        x, y, width, height = bounds
+        self._index.insert(widget_id, (x, y, max(width, 1), max(height, 1)), 0, widget_id)
+    
+    def find_collisions(self, widget_id: str, new_bounds: Tuple[int, int, int, int]) -> List[str]:
+        """Widget (diversi da widget_id) che collidono con new_bounds"""
+        x, y, width, height = new_bounds
+        # Fase larga sull'indice con un margine di un'unità, poi test esatto
+        candidates = self._index.query_rect((x - 1, y - 1, max(width, 0) + 2, max(height, 0) + 2))
+        return [other_id for _, other_id in candidates
+                if other_id != widget_id and
+                self._bounds_intersect(new_bounds, self.widget_bounds[other_id])]
     
     def check_collision(self, widget_id: str, new_bounds: Tuple[int, int, int, int]) -> bool:
-        for other_id, other_bounds in self.widget_bounds.items():
-            if other_id != widget_id:
-                if self._bounds_intersect(new_bounds, other_bounds):
-                    return True
-        return False
+        return bool(self.find_collisions(widget_id, new_bounds))
+    
+    def check_collisions(self, queries: Iterable[Tuple[str, Tuple[int, int, int, int]]]) -> Dict[str, List[str]]:
+        """Versione a lotti di find_collisions: widget_id -> widget in collisione"""
+        return {widget_id: self.find_collisions(widget_id, bounds) for widget_id, bounds in queries}
     
     def _bounds_intersect(self, a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
         return not (a[0] + a[2] < b[0] or
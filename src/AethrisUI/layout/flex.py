@@ -1,49 +1,294 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Optional, Union
 from dataclasses import dataclass
-from ..core import VirtualNode
+from ..core.virtual_node import VirtualNode
 
-@dataclass
+Box = Tuple[float, float, float, float]  # x, y, width, height
+
+@dataclass(eq=False)
 class FlexItem:
+    """
+    Elemento di un FlexLayout. basis è la dimensione di partenza sull'asse
+    principale, cross_size quella sull'asse trasversale (None = automatica:
+    con align stretch occupa la riga, altrimenti 0). layout è l'eventuale
+    FlexLayout annidato, calcolato con la dimensione risolta dell'elemento.
+    """
     node: VirtualNode
     grow: float = 0
     shrink: float = 1
     basis: float = 0
     align_self: str = "auto"
+    cross_size: Optional[float] = None
+    min_main: float = 0
+    max_main: Optional[float] = None
+    layout: Optional['FlexLayout'] = None
+
+def _normalize(value: str) -> str:
+    # Accetta sia "flex-start" sia "flex_start"
+    return value.replace("_", "-") if isinstance(value, str) else value
 
 class FlexLayout:
-    def __init__(self, direction: str = "row", wrap: bool = False,
-                 justify_content: str = "flex-start", align_items: str = "stretch"):
+    """
+    Motore flexbox: crescita/riduzione con base, min e max, righe multiple
+    (wrap), justify_content, align_items/align_self, align_content e gap.
+
+    Il risultato viene conservato finché il layout non viene segnato come
+    modificato; mark_dirty() invalida anche i layout antenati, mentre i
+    layout annidati non modificati riutilizzano il proprio risultato.
+    """
+
+    def __init__(self, direction: str = "row", wrap: Union[bool, str] = False,
+                 justify_content: str = "flex-start", align_items: str = "stretch",
+                 gap: float = 0, row_gap: Optional[float] = None,
+                 align_content: str = "flex-start"):
         self.direction = direction
         self.wrap = wrap
         self.justify_content = justify_content
         self.align_items = align_items
+        self.align_content = align_content
+        # gap separa gli elementi sull'asse principale, row_gap le righe
+        self.gap = gap
+        self.row_gap = row_gap
         self.items: List[FlexItem] = []
-    
+        self.parent: Optional['FlexLayout'] = None
+        self.compute_count = 0
+        self._cache: Optional[Tuple[Tuple[float, float], List[Box]]] = None
+
     def add_item(self, item: FlexItem):
         self.items.append(item)
-    
+        if item.layout is not None:
+            item.layout.parent = self
+        self.mark_dirty()
+
+    def remove_item(self, item: FlexItem):
+        self.items.remove(item)
+        if item.layout is not None:
+            item.layout.parent = None
+        self.mark_dirty()
+
+    def update_item(self, item: FlexItem, **changes: Any):
+        """Modifica gli attributi di un elemento e invalida i layout coinvolti"""
+        for name, value in changes.items():
+            setattr(item, name, value)
+        if item.layout is not None:
+            item.layout.parent = self
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        """Invalida il risultato di questo layout e dei suoi antenati"""
+        layout = self
+        while layout is not None and layout._cache is not None:
+            layout._cache = None
+            layout = layout.parent
+
+    @property
+    def is_dirty(self) -> bool:
+        return self._cache is None
+
     def compute_layout(self, container_size: Tuple[int, int]) -> Dict[VirtualNode, Tuple[int, int]]:
-        positions = {}
-        available_space = container_size[0] if self.direction == "row" else container_size[1]
-        
-        # Calcola lo spazio totale richiesto e il totale dei fattori di crescita
-        total_basis = sum(item.basis for item in self.items)
-        total_grow = sum(item.grow for item in self.items)
-        
-        # Distribuisci lo spazio extra in base ai fattori di crescita
-        extra_space = max(0, available_space - total_basis)
-        current_position = 0
-        
-        for item in self.items:
-            size = item.basis
-            if total_grow > 0 and item.grow > 0:
-                size += (extra_space * item.grow) / total_grow
-            
-            if self.direction == "row":
-                positions[item.node] = (current_position, 0)
+        """Posizioni (x, y) degli elementi relative al contenitore"""
+        return {item.node: (box[0], box[1]) for item, box in zip(self.items, self.compute(container_size))}
+
+    def compute_boxes(self, container_size: Tuple[int, int]) -> Dict[VirtualNode, Box]:
+        """Rettangoli (x, y, width, height) degli elementi relativi al contenitore"""
+        return dict(zip((item.node for item in self.items), self.compute(container_size)))
+
+    def compute(self, container_size: Tuple[float, float]) -> List[Box]:
+        """
+        Calcola i rettangoli degli elementi, nello stesso ordine di items,
+        e i layout annidati con la dimensione risolta di ciascun elemento
+        """
+        container_size = (container_size[0], container_size[1])
+        if self._cache is not None and self._cache[0] == container_size:
+            return self._cache[1]
+
+        self.compute_count += 1
+        boxes = self._compute(container_size)
+        for item, box in zip(self.items, boxes):
+            if item.layout is not None:
+                item.layout.parent = self
+                item.layout.compute((box[2], box[3]))
+        self._cache = (container_size, boxes)
+        return boxes
+
+    def _compute(self, container_size: Tuple[float, float]) -> List[Box]:
+        items = self.items
+        if not items:
+            return []
+
+        row = self.direction in ("row", "row-reverse")
+        main_size, cross_size = container_size if row else (container_size[1], container_size[0])
+        gap = self.gap
+        row_gap = self.row_gap if self.row_gap is not None else self.gap
+        wrap = _normalize(self.wrap) if isinstance(self.wrap, str) else ("wrap" if self.wrap else "nowrap")
+        align_items = _normalize(self.align_items)
+
+        # Dimensione ipotetica: base limitata da min e max
+        hypothetical = [self._clamp(item, item.basis) for item in items]
+
+        # Suddivisione in righe
+        lines: List[List[int]] = []
+        if wrap == "nowrap":
+            lines.append(list(range(len(items))))
+        else:
+            line: List[int] = []
+            used = 0.0
+            for index, size in enumerate(hypothetical):
+                needed = size if not line else used + gap + size
+                if line and needed > main_size:
+                    lines.append(line)
+                    line, used = [index], size
+                else:
+                    line.append(index)
+                    used = needed
+            lines.append(line)
+
+        main_sizes = [0.0] * len(items)
+        for line in lines:
+            self._resolve_flexible_lengths(line, hypothetical, main_size - gap * (len(line) - 1), main_sizes)
+
+        # Dimensioni trasversali delle righe
+        line_cross: List[float] = []
+        for line in lines:
+            line_cross.append(max((items[i].cross_size or 0) for i in line))
+        if wrap == "nowrap":
+            line_cross[0] = cross_size
+        else:
+            self._align_content_stretch(line_cross, cross_size - row_gap * (len(lines) - 1))
+
+        # Posizione delle righe sull'asse trasversale
+        line_offsets = self._distribute(
+            _normalize(self.align_content), cross_size - sum(line_cross) - row_gap * (len(lines) - 1),
+            line_cross, row_gap)
+        if wrap == "wrap-reverse":
+            line_offsets = [cross_size - offset - size for offset, size in zip(line_offsets, line_cross)]
+
+        boxes: List[Box] = [(0, 0, 0, 0)] * len(items)
+        reverse = self.direction in ("row-reverse", "column-reverse")
+        for line, line_offset, line_size in zip(lines, line_offsets, line_cross):
+            sizes = [main_sizes[i] for i in line]
+            offsets = self._distribute(
+                _normalize(self.justify_content),
+                main_size - sum(sizes) - gap * (len(line) - 1), sizes, gap)
+
+            for index, main_offset, size in zip(line, offsets, sizes):
+                item = items[index]
+                align = _normalize(item.align_self)
+                if align == "auto":
+                    align = align_items
+
+                if item.cross_size is None and align == "stretch":
+                    item_cross = line_size
+                else:
+                    item_cross = item.cross_size or 0
+
+                if align == "flex-end":
+                    cross_offset = line_offset + line_size - item_cross
+                elif align == "center":
+                    cross_offset = line_offset + (line_size - item_cross) / 2
+                else:
+                    cross_offset = line_offset
+
+                if reverse:
+                    main_offset = main_size - main_offset - size
+
+                if row:
+                    boxes[index] = (main_offset, cross_offset, size, item_cross)
+                else:
+                    boxes[index] = (cross_offset, main_offset, item_cross, size)
+        return boxes
+
+    @staticmethod
+    def _clamp(item: FlexItem, size: float) -> float:
+        if item.max_main is not None:
+            size = min(size, item.max_main)
+        return max(size, item.min_main)
+
+    def _resolve_flexible_lengths(self, line: List[int], hypothetical: List[float],
+                                  available: float, result: List[float]):
+        """Distribuisce lo spazio libero di una riga secondo grow o shrink"""
+        items = self.items
+        growing = available - sum(hypothetical[i] for i in line) > 0
+
+        target = {i: hypothetical[i] for i in line}
+        frozen = set()
+        for i in line:
+            item = items[i]
+            factor = item.grow if growing else item.shrink
+            # Elementi non flessibili o già oltre il limite nella direzione del flex
+            if (factor == 0 or
+                    growing and items[i].basis > hypothetical[i] or
+                    not growing and items[i].basis < hypothetical[i]):
+                frozen.add(i)
+
+        while len(frozen) < len(line):
+            unfrozen = [i for i in line if i not in frozen]
+            free = available - sum(target[i] for i in frozen) - sum(items[i].basis for i in unfrozen)
+
+            if growing:
+                total = sum(items[i].grow for i in unfrozen)
+                # Con fattori totali minori di 1 si distribuisce solo una parte dello spazio
+                if total < 1:
+                    free *= total
+                for i in unfrozen:
+                    target[i] = items[i].basis + free * items[i].grow / total
             else:
-                positions[item.node] = (0, current_position)
-            
-            current_position += size
-        
-        return positions 
\ No newline at end of file
+                scaled = {i: items[i].shrink * items[i].basis for i in unfrozen}
+                total = sum(scaled.values())
+                total_factor = sum(items[i].shrink for i in unfrozen)
+                if total_factor < 1:
+                    free *= total_factor
+                for i in unfrozen:
+                    target[i] = items[i].basis + (free * scaled[i] / total if total else 0)
+
+            violation = 0.0
+            clamped = {}
+            for i in unfrozen:
+                value = self._clamp(items[i], target[i])
+                clamped[i] = value
+                violation += value - target[i]
+
+            if violation == 0:
+                frozen.update(unfrozen)
+            for i in unfrozen:
+                difference = clamped[i] - target[i]
+                if violation == 0 or violation > 0 and difference > 0 or violation < 0 and difference < 0:
+                    target[i] = clamped[i]
+                    frozen.add(i)
+
+        for i in line:
+            result[i] = target[i]
+
+    def _align_content_stretch(self, line_cross: List[float], available: float):
+        if _normalize(self.align_content) != "stretch":
+            return
+        free = available - sum(line_cross)
+        if free > 0:
+            extra = free / len(line_cross)
+            for index in range(len(line_cross)):
+                line_cross[index] += extra
+
+    @staticmethod
+    def _distribute(mode: str, free: float, sizes: List[float], gap: float) -> List[float]:
+        """Offset di una sequenza di dimensioni secondo justify/align content"""
+        count = len(sizes)
+        start = 0.0
+        spacing = gap
+        if mode == "flex-end" or mode == "end":
+            start = free
+        elif mode == "center":
+            start = free / 2
+        elif free > 0 and mode == "space-between" and count > 1:
+            spacing = gap + free / (count - 1)
+        elif free > 0 and mode == "space-around":
+            spacing = gap + free / count
+            start = free / count / 2
+        elif free > 0 and mode == "space-evenly":
+            spacing = gap + free / (count + 1)
+            start = free / (count + 1)
+
+        offsets = []
+        position = start
+        for size in sizes:
+            offsets.append(position)
+            position += size + spacing
+        return offsets
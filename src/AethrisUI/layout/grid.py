@@ -1,5 +1,6 @@
-from typing import Tuple, List, Optional
+from typing import Dict, Tuple, List, Optional
 from dataclasses import dataclass
+import numpy as np
 
 @dataclass
 class GridCell:
@@ -9,13 +10,35 @@ class GridCell:
     widget_id: Optional[str] = None
 
 class Grid:
-    def __init__(self, cell_size: int = 20):
+    """
+    Griglia di occupazione per il posizionamento dei widget.
+
+    L'occupazione è un array NumPy di booleani (righe x colonne) e il
+    proprietario di ogni cella un array di indici nei widget registrati:
+    occupare o liberare un rettangolo è un'assegnazione su una slice.
+    find_free_region usa una tabella delle somme (summed-area table),
+    ricalcolata solo dopo una modifica, per testare in un'unica operazione
+    vettoriale tutte le posizioni possibili.
+    """
+    
+    # Righe di posizioni esaminate per blocco da find_free_region
+    SEARCH_BLOCK = 64
+
+    def __init__(self, cell_size: int = 20, width: int = 40, height: int = 30):
         self.cell_size = cell_size
-        self.cells: List[List[GridCell]] = []
-        self._init_grid(40, 30)  # Default 800x600 grid
+        self._init_grid(width, height)  # Default 800x600 grid
     
     def _init_grid(self, width: int, height: int):
-        self.cells = [[GridCell(x, y) for x in range(width)] for y in range(height)]
+        self.width = width
+        self.height = height
+        self.occupied = np.zeros((height, width), dtype=bool)
+        # 0 = nessun widget, altrimenti indice in _widget_ids
+        self.owners = np.zeros((height, width), dtype=np.int32)
+        self._widget_ids: List[Optional[str]] = [None]
+        self._widget_index: Dict[str, int] = {}
+        self._summed_area = np.zeros((height + 1, width + 1), dtype=np.int32)
+        # Prima riga modificata dopo l'ultimo aggiornamento della tabella
+        self._dirty_row: Optional[int] = None
     
     def snap_to_grid(self, position: Tuple[int, int]) -> Tuple[int, int]:
         x, y = position
@@ -23,14 +46,117 @@ class Grid:
         grid_y = round(y / self.cell_size) * self.cell_size
         return (grid_x, grid_y)
     
+    def get_cell(self, x: int, y: int) -> Optional[GridCell]:
+        """Stato di una cella come GridCell, None fuori dalla griglia"""
+        if 0 <= y < self.height and 0 <= x < self.width:
+            return GridCell(x, y, bool(self.occupied[y, x]), self._widget_ids[self.owners[y, x]])
+        return None
+    
     def is_cell_occupied(self, x: int, y: int) -> bool:
-        if 0 <= y < len(self.cells) and 0 <= x < len(self.cells[0]):
-            return self.cells[y][x].occupied
+        if 0 <= y < self.height and 0 <= x < self.width:
+            return bool(self.occupied[y, x])
         return True  # Fuori dalla griglia è considerato occupato
     
+    def _clip(self, x: int, y: int, width: int, height: int) -> Tuple[slice, slice]:
+        # Inizio e fine limitati alla griglia, con la fine mai prima dell'inizio
+        top = min(max(y, 0), self.height)
+        left = min(max(x, 0), self.width)
+        return (slice(top, max(min(y + height, self.height), top)),
+                slice(left, max(min(x + width, self.width), left)))
+    
     def occupy_cells(self, x: int, y: int, width: int, height: int, widget_id: str):
-        for dy in range(height):
-            for dx in range(width):
-                if 0 <= y+dy < len(self.cells) and 0 <= x+dx < len(self.cells[0]):
-                    self.cells[y+dy][x+dx].occupied = True
-                    self.cells[y+dy][x+dx].widget_id = widget_id 
\ No newline at end of file
+        index = self._widget_index.get(widget_id)
+        if index is None:
+            index = self._widget_index[widget_id] = len(self._widget_ids)
+            self._widget_ids.append(widget_id)
+        rows, columns = self._clip(x, y, width, height)
+        self._set_region(rows, columns, True)
+        self.owners[rows, columns] = index
+    
+    def release_cells(self, x: int, y: int, width: int, height: int):
+        rows, columns = self._clip(x, y, width, height)
+        self._set_region(rows, columns, False)
+        self.owners[rows, columns] = 0
+    
+    def _set_region(self, rows: slice, columns: slice, occupied: bool):
+        region = self.occupied[rows, columns]
+        if region.size == 0:
+            return
+        # Celle che cambiano stato (+1 occupate, -1 liberate) e loro somme
+        changed = (region != occupied).astype(np.int32)
+        if not occupied:
+            changed = -changed
+        region[...] = occupied
+        delta = np.cumsum(np.cumsum(changed, axis=0), axis=1)
+        
+        # La tabella cambia solo sotto e a destra del rettangolo
+        summed = self._summed_area
+        top, bottom = rows.start + 1, rows.stop + 1
+        left, right = columns.start + 1, columns.stop + 1
+        summed[top:bottom, left:right] += delta
+        summed[bottom:, left:right] += delta[-1]
+        summed[top:bottom, right:] += delta[:, -1:]
+        summed[bottom:, right:] += delta[-1, -1]
+    
+    def release_widget(self, widget_id: str):
+        """Libera tutte le celle occupate dal widget"""
+        index = self._widget_index.get(widget_id)
+        if index is None:
+            return
+        cells = self.owners == index
+        rows = np.flatnonzero(cells.any(axis=1))
+        if rows.size:
+            self.occupied[cells] = False
+            self.owners[cells] = 0
+            self._invalidate(int(rows[0]))
+    
+    def _invalidate(self, row: int):
+        if self._dirty_row is None or row < self._dirty_row:
+            self._dirty_row = row
+    
+    def _get_summed_area(self) -> np.ndarray:
+        # summed[y, x] = celle occupate nel rettangolo [0, y) x [0, x).
+        # occupy/release_cells la aggiornano subito; dopo release_widget si
+        # ricalcolano solo le righe dalla prima modificata in giù
+        row = self._dirty_row
+        if row is not None:
+            summed = self._summed_area
+            np.cumsum(np.cumsum(self.occupied[row:], axis=1, dtype=np.int32), axis=0,
+                      out=summed[row + 1:, 1:])
+            summed[row + 1:, 1:] += summed[row, 1:]
+            self._dirty_row = None
+        return self._summed_area
+    
+    def count_occupied(self, x: int, y: int, width: int, height: int) -> int:
+        """Celle occupate nel rettangolo (limitato alla griglia) in tempo costante"""
+        rows, columns = self._clip(x, y, width, height)
+        summed = self._get_summed_area()
+        return int(summed[rows.stop, columns.stop] - summed[rows.start, columns.stop] -
+                   summed[rows.stop, columns.start] + summed[rows.start, columns.start])
+    
+    def is_region_free(self, x: int, y: int, width: int, height: int) -> bool:
+        if x < 0 or y < 0 or x + width > self.width or y + height > self.height:
+            return False  # Fuori dalla griglia è considerato occupato
+        return self.count_occupied(x, y, width, height) == 0
+    
+    def find_free_region(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """
+        Prima posizione (x, y) in celle, per righe dall'alto, in cui un
+        rettangolo width x height è interamente libero; None se non c'è spazio
+        """
+        if width <= 0 or height <= 0 or width > self.width or height > self.height:
+            return None
+        summed = self._get_summed_area()
+        positions = self.height - height + 1
+        # Somma di ogni finestra width x height, per blocchi di righe così da
+        # fermarsi al primo blocco che contiene una posizione libera
+        for start in range(0, positions, self.SEARCH_BLOCK):
+            end = min(start + self.SEARCH_BLOCK, positions)
+            top = summed[start:end]
+            bottom = summed[start + height:end + height]
+            counts = (bottom[:, width:] - top[:, width:] - bottom[:, :-width] + top[:, :-width])
+            free = np.flatnonzero(counts == 0)
+            if free.size:
+                y, x = divmod(int(free[0]), counts.shape[1])
+                return (x, start + y)
+        return None
\ No newline at end of file
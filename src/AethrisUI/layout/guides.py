@@ -1,42 +1,99 @@
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, replace
+from bisect import bisect_left, insort
 
-@dataclass
+@dataclass(frozen=True)
 class Guide:
     position: int
     orientation: str  # "horizontal" o "vertical"
     strength: float = 1.0  # Forza di attrazione (0-1)
 
 class GuideSystem:
+    """
+    Guide di allineamento con snap al più vicino tra bordo iniziale, centro
+    e bordo finale del widget. Le posizioni delle guide verticali e
+    orizzontali sono tenute in liste ordinate e cercate con bisect, così
+    ogni snap costa O(log n) anche con migliaia di guide.
+
+    Le guide sono immutabili: per spostarne una si usa move_guide, che
+    aggiorna anche le liste ordinate.
+    """
+
     def __init__(self, snap_threshold: int = 10):
         self.guides: List[Guide] = []
         self.snap_threshold = snap_threshold
+        self._vertical: List[float] = []
+        self._horizontal: List[float] = []
     
     def add_guide(self, guide: Guide):
+        self._sync()
         self.guides.append(guide)
+        insort(self._positions(guide.orientation), guide.position)
+    
+    def add_guides(self, guides: Iterable[Guide]):
+        """Aggiunge molte guide insieme (es. da tutti i bordi dei widget)"""
+        self.guides.extend(guides)
+        self._rebuild()
+    
+    def remove_guide(self, guide: Guide):
+        self._sync()
+        self.guides.remove(guide)
+        positions = self._positions(guide.orientation)
+        del positions[bisect_left(positions, guide.position)]
+    
+    def move_guide(self, guide: Guide, position: int) -> Guide:
+        """Sposta una guida; restituisce la guida che la sostituisce"""
+        self._sync()
+        moved = replace(guide, position=position)
+        self.guides[self.guides.index(guide)] = moved
+        positions = self._positions(guide.orientation)
+        del positions[bisect_left(positions, guide.position)]
+        insort(positions, position)
+        return moved
+    
+    def clear(self):
+        self.guides.clear()
+        self._rebuild()
+    
+    def _positions(self, orientation: str) -> List[float]:
+        return self._vertical if orientation == "vertical" else self._horizontal
+    
+    def _rebuild(self):
+        self._vertical = sorted(guide.position for guide in self.guides if guide.orientation == "vertical")
+        self._horizontal = sorted(guide.position for guide in self.guides if guide.orientation != "vertical")
+    
+    def _sync(self):
+        # Ricostruisce gli indici se la lista delle guide è stata modificata direttamente
+        if len(self._vertical) + len(self._horizontal) != len(self.guides):
+            self._rebuild()
+    
+    @staticmethod
+    def _nearest(positions: List[float], value: float) -> Optional[float]:
+        index = bisect_left(positions, value)
+        best = None
+        if index < len(positions):
+            best = positions[index]
+        if index > 0 and (best is None or value - positions[index - 1] <= best - value):
+            best = positions[index - 1]
+        return best
+    
+    def _snap_axis(self, positions: List[float], start: float, size: float) -> float:
+        # Bordo iniziale, centro e bordo finale: vince la guida più vicina,
+        # a parità di distanza nell'ordine in cui sono elencati
+        best_distance = self.snap_threshold
+        snapped = start
+        for offset in (0, size / 2, size):
+            guide = self._nearest(positions, start + offset)
+            if guide is not None:
+                distance = abs(start + offset - guide)
+                if distance < best_distance:
+                    best_distance = distance
+                    snapped = guide - offset
+        return snapped
     
     def find_snap_position(self, pos: Tuple[int, int], size: Tuple[int, int]) -> Tuple[int, int]:
+        self._sync()
         x, y = pos
         width, height = size
-        
-        for guide in self.guides:
-            if guide.orientation == "vertical":
-                # Snap al bordo sinistro
-                if abs(x - guide.position) < self.snap_threshold:
-                    x = guide.position
-                # Snap al centro
-                elif abs((x + width/2) - guide.position) < self.snap_threshold:
-                    x = guide.position - width/2
-                # Snap al bordo destro
-                elif abs((x + width) - guide.position) < self.snap_threshold:
-                    x = guide.position - width
-            else:
-                # Logica simile per guide orizzontali
-                if abs(y - guide.position) < self.snap_threshold:
-                    y = guide.position
-                elif abs((y + height/2) - guide.position) < self.snap_threshold:
-                    y = guide.position - height/2
-                elif abs((y + height) - guide.position) < self.snap_threshold:
-                    y = guide.position - height
-        
-        return (x, y) 
\ No newline at end of file
+        return (self._snap_axis(self._vertical, x, width),
+                self._snap_axis(self._horizontal, y, height))
\ No newline at end of file
@@ -1,5 +1,6 @@
-from typing import List, Tuple, Dict
+from typing import List, Sequence, Tuple, Dict
 from dataclasses import dataclass
+import numpy as np
 
 @dataclass
 class MagneticZone:
@@ -10,7 +11,21 @@ class MagneticZone:
     strength: float = 1.0
     type: str = "snap"  # "snap", "attract", "repel"
 
+# Zone in forma vettoriale: centro e forza con segno (negativa per "repel")
+_ZONE_DTYPE = np.dtype([("center_x", np.float64), ("center_y", np.float64), ("strength", np.float64)])
+
 class MagneticLayout:
+    """
+    Forze magnetiche tra widget e zone. A ogni calcolo le zone vengono
+    lette in un array strutturato, così anche le zone modificate sul posto
+    sono aggiornate, e calculate_forces calcola le forze di N widget contro
+    M zone con un solo broadcast NumPy, scartando prima le zone oltre
+    attraction_radius da tutti i widget.
+    """
+
+    # Limite di coppie widget x zona elaborate per blocco (memoria temporanea)
+    MAX_PAIRS = 1 << 20
+
     def __init__(self, attraction_radius: int = 50):
         self.zones: List[MagneticZone] = []
         self.attraction_radius = attraction_radius
@@ -18,31 +33,59 @@ class MagneticLayout:
     def add_zone(self, zone: MagneticZone):
         self.zones.append(zone)
     
+    def remove_zone(self, zone: MagneticZone):
+        self.zones.remove(zone)
+    
+    def clear_zones(self):
+        self.zones.clear()
+    
+    def _get_zone_array(self) -> np.ndarray:
+        # Costo lineare nelle zone, trascurabile rispetto al broadcast N x M
+        return np.array([(zone.x + zone.width / 2, zone.y + zone.height / 2,
+                          -zone.strength if zone.type == "repel" else zone.strength)
+                         for zone in self.zones], dtype=_ZONE_DTYPE)
+    
     def calculate_force(self, widget_pos: Tuple[int, int], widget_size: Tuple[int, int]) -> Tuple[float, float]:
-        total_force_x = 0.0
-        total_force_y = 0.0
-        
-        widget_center = (
-            widget_pos[0] + widget_size[0]/2,
-            widget_pos[1] + widget_size[1]/2
-        )
+        force_x, force_y = self.calculate_forces([widget_pos], [widget_size])[0]
+        return (float(force_x), float(force_y))
+    
+    def calculate_forces(self, positions: Sequence[Tuple[float, float]],
+                         sizes: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """
+        Forze (fx, fy) per ogni widget, come array N x 2. Ogni zona entro
+        attraction_radius dal centro del widget lo attira (o respinge) con
+        intensità (1 - distanza / raggio) * strength.
+        """
+        centers = np.asarray(positions, dtype=np.float64).reshape(-1, 2) + \
+            np.asarray(sizes, dtype=np.float64).reshape(-1, 2) / 2
+        forces = np.zeros_like(centers)
+        zones = self._get_zone_array()
+        radius = float(self.attraction_radius)
+        if len(centers) == 0 or len(zones) == 0 or radius <= 0:
+            return forces
         
-        for zone in self.zones:
-            zone_center = (
-                zone.x + zone.width/2,
-                zone.y + zone.height/2
-            )
-            
-            dx = zone_center[0] - widget_center[0]
-            dy = zone_center[1] - widget_center[1]
-            distance = (dx**2 + dy**2)**0.5
-            
-            if distance < self.attraction_radius:
-                force = (1 - distance/self.attraction_radius) * zone.strength
-                if zone.type == "repel":
-                    force = -force
-                
-                total_force_x += dx * force / distance if distance > 0 else 0
-                total_force_y += dy * force / distance if distance > 0 else 0
+        # Taglio spaziale: zone fuori dal riquadro dei widget allargato del raggio
+        low = centers.min(axis=0) - radius
+        high = centers.max(axis=0) + radius
+        zone_x, zone_y = zones["center_x"], zones["center_y"]
+        near = (zone_x > low[0]) & (zone_x < high[0]) & (zone_y > low[1]) & (zone_y < high[1])
+        if not near.all():
+            zones = zones[near]
+            if len(zones) == 0:
+                return forces
+            zone_x, zone_y = zones["center_x"], zones["center_y"]
+        strength = zones["strength"]
         
-        return (total_force_x, total_force_y) 
\ No newline at end of file
+        step = max(1, self.MAX_PAIRS // len(zones))
+        for start in range(0, len(centers), step):
+            block = centers[start:start + step]
+            dx = zone_x[None, :] - block[:, 0:1]
+            dy = zone_y[None, :] - block[:, 1:2]
+            distance = np.hypot(dx, dy)
+            # Forza divisa per la distanza, così dx e dy diventano la direzione
+            active = (distance < radius) & (distance > 0)
+            scale = np.zeros_like(distance)
+            np.divide((1 - distance / radius) * strength, distance, out=scale, where=active)
+            forces[start:start + step, 0] = (dx * scale).sum(axis=1)
+            forces[start:start + step, 1] = (dy * scale).sum(axis=1)
+        return forces
\ No newline at end of file
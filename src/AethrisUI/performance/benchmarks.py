@@ -0,0 +1,74 @@
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass
+import gc
+import time
+import tracemalloc
+from ..core.virtual_node import VirtualNode
+
+@dataclass
+class _DataclassNode:
+    """Rappresentazione precedente di VirtualNode, usata come riferimento"""
+    component_type: str
+    props: Dict[str, Any]
+    children: Optional[List['_DataclassNode']] = None
+
+    def __post_init__(self):
+        if self.children is None:
+            self.children = []
+        if "children" in self.props:
+            if isinstance(self.props["children"], list):
+                self.children.extend(self.props["children"])
+            else:
+                self.children.append(self.props["children"])
+            del self.props["children"]
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    nodes: int
+    seconds: float
+    peak_bytes: int
+
+    @property
+    def bytes_per_node(self) -> float:
+        return self.peak_bytes / self.nodes
+
+    def __str__(self) -> str:
+        return (f"{self.name:<12} {self.nodes} nodi  {self.seconds * 1000:8.1f} ms  "
+                f"{self.peak_bytes / 1024 / 1024:7.2f} MiB  {self.bytes_per_node:6.1f} B/nodo")
+
+def _build_tree(node_type: Callable, count: int, fanout: int) -> Any:
+    # Foglie di testo raggruppate in container, come una lista molto lunga
+    style = {"font_size": 14}
+    groups = []
+    for start in range(0, count, fanout):
+        leaves = [node_type("text", {"text": "item", "style": style})
+                  for _ in range(min(fanout, count - start))]
+        groups.append(node_type("container", {"style": style}, leaves))
+    return node_type("container", {}, groups)
+
+def _measure(name: str, node_type: Callable, count: int, fanout: int) -> BenchmarkResult:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = _build_tree(node_type, count, fanout)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodes = 1 + len(tree.children) + count
+    del tree
+    return BenchmarkResult(name, nodes, seconds, peak)
+
+def benchmark_virtual_nodes(count: int = 100_000, fanout: int = 100) -> List[BenchmarkResult]:
+    """
+    Costruisce un albero di count foglie con la rappresentazione precedente
+    (dataclass) e con VirtualNode, misurando tempo e picco di memoria
+    """
+    return [
+        _measure("dataclass", _DataclassNode, count, fanout),
+        _measure("VirtualNode", VirtualNode, count, fanout),
+    ]
+
+if __name__ == "__main__":
+    for result in benchmark_virtual_nodes():
+        print(result)
@@ -1,6 +1,15 @@
-from .native_window import NativeWindow
-from .window import Window
 from .events import Event, MouseEvent, KeyEvent
 from .graphics import Canvas, Color
+from .framebuffer import FramebufferCanvas
+from .display_list import DisplayList, ResourceTable
 
-__all__ = ['Window', 'Event', 'MouseEvent', 'KeyEvent', 'Canvas', 'Color', 'NativeWindow'] 
\ No newline at end of file
+try:
+    from .native_window import NativeWindow
+    from .window import Window
+except ImportError:
+    # Backend Win32 non disponibile: restano utilizzabili i canvas headless
+    NativeWindow = None
+    Window = None
+
+__all__ = ['Window', 'Event', 'MouseEvent', 'KeyEvent', 'Canvas', 'Color', 'FramebufferCanvas', 'DisplayList',
+           'ResourceTable', 'NativeWindow'] 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Union, Dict
 
 class Color:
     # Dizionario dei colori predefiniti
@@ -75,6 +75,22 @@ class Color:
     def from_rgb(r: int, g: int, b: int, a: int = 255) -> 'Color':
         return Color((r, g, b, a))
     
+    def to_packed(self) -> int:
+        """Restituisce il colore come intero 0xRRGGBBAA"""
+        return (self.r << 24) | (self.g << 16) | (self.b << 8) | self.a
+    
+    @staticmethod
+    def from_packed(packed: int) -> 'Color':
+        """Restituisce un Color condiviso per un intero 0xRRGGBBAA"""
+        color = _packed_colors.get(packed)
+        if color is None:
+            if len(_packed_colors) >= _MAX_PACKED_COLORS:
+                # Es. i colori intermedi delle transizioni: si ricomincia da capo
+                _packed_colors.clear()
+            color = Color(((packed >> 24) & 0xFF, (packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF))
+            _packed_colors[packed] = color
+        return color
+    
     def to_windows_color(self) -> int:
         # Formato Windows: 0x00BBGGRR
         return self.r | (self.g << 8) | (self.b << 16)
@@ -85,4 +101,8 @@ class Color:
     def __str__(self) -> str:
         if self.a == 255:
             return f"#{self.r:02x}{self.g:02x}{self.b:02x}"
-        return f"rgba({self.r},{self.g},{self.b},{self.a/255})"
\ No newline at end of file
+        return f"rgba({self.r},{self.g},{self.b},{self.a/255})"
+
+# Istanze condivise per i colori compattati, da non modificare
+_packed_colors: Dict[int, Color] = {}
+_MAX_PACKED_COLORS = 4096
@@ -0,0 +1,198 @@
+from typing import Dict, Iterable, List, Tuple, Iterator, Optional
+from array import array
+import numpy as np
+
+# Codici operativi dei comandi di disegno
+OP_CLEAR = 0
+OP_RECT = 1
+OP_TEXT = 2
+OP_SET_CLIP = 3
+OP_RESET_CLIP = 4
+
+# Ogni comando occupa 4 coordinate (x, y, width, height) e 3 argomenti interi
+# (id colore, parametro, id testo); il parametro è il raggio per i rettangoli
+# e l'id del font per il testo
+_COORDS = 4
+_ARGS = 3
+
+Command = Tuple[int, float, float, float, float, int, int, Optional[str]]
+
+class ResourceTable:
+    """
+    Tabella di internamento per colori (0xRRGGBBAA), font e testi.
+
+    Va condivisa tra i frame dello stesso renderer, così gli id restano
+    stabili e due display list si confrontano direttamente sugli array.
+    Le tabelle crescono a ogni nuovo testo o colore: compact() le riduce
+    alle risorse usate dalle display list ancora conservate.
+    """
+
+    def __init__(self):
+        self.colors: List[int] = []
+        self.fonts: List[int] = []
+        self.texts: List[str] = []
+        self._color_ids: Dict[int, int] = {}
+        self._font_ids: Dict[int, int] = {}
+        self._text_ids: Dict[str, int] = {}
+
+    def color_id(self, packed: int) -> int:
+        color_id = self._color_ids.get(packed)
+        if color_id is None:
+            color_id = self._color_ids[packed] = len(self.colors)
+            self.colors.append(packed)
+        return color_id
+
+    def font_id(self, font_size: int) -> int:
+        font_id = self._font_ids.get(font_size)
+        if font_id is None:
+            font_id = self._font_ids[font_size] = len(self.fonts)
+            self.fonts.append(font_size)
+        return font_id
+
+    def text_id(self, text: str) -> int:
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = self._text_ids[text] = len(self.texts)
+            self.texts.append(text)
+        return text_id
+
+    def __len__(self) -> int:
+        return len(self.colors) + len(self.fonts) + len(self.texts)
+
+    def compact(self, display_lists: Iterable['DisplayList']):
+        """
+        Tiene solo colori, font e testi usati dalle display list indicate e
+        ne rinumera gli id. Le liste che usano questa tabella e non sono
+        indicate diventano non valide.
+        """
+        lists = list({id(display_list): display_list for display_list in display_lists
+                      if display_list is not None and display_list.resources is self}.values())
+        used_colors = np.zeros(len(self.colors), dtype=bool)
+        used_fonts = np.zeros(len(self.fonts), dtype=bool)
+        used_texts = np.zeros(len(self.texts), dtype=bool)
+        views = []
+        for display_list in lists:
+            ops = np.frombuffer(display_list.ops, dtype=np.uint8)
+            args = np.frombuffer(display_list.args, dtype=np.intc).reshape(-1, _ARGS).copy()
+            is_text = ops == OP_TEXT
+            colors, fonts, texts = args[:, 0], args[is_text, 1], args[:, 2]
+            used_colors[colors[colors >= 0]] = True
+            used_fonts[fonts] = True
+            used_texts[texts[texts >= 0]] = True
+            views.append((display_list, args, is_text))
+
+        color_map = self._compact_table(self.colors, self._color_ids, used_colors)
+        font_map = self._compact_table(self.fonts, self._font_ids, used_fonts)
+        text_map = self._compact_table(self.texts, self._text_ids, used_texts)
+
+        for display_list, args, is_text in views:
+            colors = args[:, 0]
+            args[:, 0] = np.where(colors >= 0, color_map[colors], colors)
+            args[is_text, 1] = font_map[args[is_text, 1]]
+            texts = args[:, 2]
+            args[:, 2] = np.where(texts >= 0, text_map[texts], texts)
+            display_list.args = array('i', args.tobytes())
+
+    @staticmethod
+    def _compact_table(values: List, ids: Dict, used: np.ndarray) -> np.ndarray:
+        # Restituisce la mappa vecchio id -> nuovo id (-1 per le voci eliminate);
+        # la voce in più rende valido anche l'indice -1 dei comandi senza risorsa
+        kept = np.flatnonzero(used)
+        mapping = np.full(len(values) + 1, -1, dtype=np.intc)
+        mapping[kept] = np.arange(len(kept), dtype=np.intc)
+        values[:] = [values[index] for index in kept.tolist()]
+        ids.clear()
+        ids.update((value, index) for index, value in enumerate(values))
+        return mapping
+
+class DisplayList:
+    """
+    Lista compatta di comandi di disegno registrati da un frame.
+
+    I comandi sono memorizzati in array paralleli (opcode, coordinate,
+    argomenti interi) e fanno riferimento a colori, font e testi tramite
+    gli id della ResourceTable. Qualsiasi backend può riprodurla con
+    Canvas.replay().
+    """
+
+    def __init__(self, resources: ResourceTable = None):
+        self.resources = resources if resources is not None else ResourceTable()
+        self.ops = array('B')
+        self.coords = array('d')
+        self.args = array('i')
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DisplayList):
+            return NotImplemented
+        if self.resources is other.resources:
+            return self.ops == other.ops and self.coords == other.coords and self.args == other.args
+        # Tabelle diverse: confronta i comandi risolti
+        return len(self) == len(other) and list(self.commands()) == list(other.commands())
+
+    def slice(self, start: int, end: int = None) -> 'DisplayList':
+        """Copia dei comandi da start a end, con la stessa tabella delle risorse"""
+        end = len(self.ops) if end is None else end
+        result = DisplayList(self.resources)
+        result.ops = self.ops[start:end]
+        result.coords = self.coords[start * _COORDS:end * _COORDS]
+        result.args = self.args[start * _ARGS:end * _ARGS]
+        return result
+
+    def extend(self, other: 'DisplayList'):
+        """Accoda i comandi di un'altra lista che condivide la tabella delle risorse"""
+        if other.resources is not self.resources:
+            raise ValueError("Le display list devono condividere la stessa ResourceTable")
+        self.ops.extend(other.ops)
+        self.coords.extend(other.coords)
+        self.args.extend(other.args)
+
+    def clear(self):
+        """Svuota la lista mantenendo la tabella delle risorse"""
+        del self.ops[:]
+        del self.coords[:]
+        del self.args[:]
+
+    def _append(self, op: int, x: float, y: float, width: float, height: float,
+                color_id: int = -1, param: int = 0, text_id: int = -1):
+        self.ops.append(op)
+        self.coords.extend((x, y, width, height))
+        self.args.extend((color_id, param, text_id))
+
+    def clear_rect(self, x: float, y: float, width: float, height: float):
+        self._append(OP_CLEAR, x, y, width, height)
+
+    def rectangle(self, x: float, y: float, width: float, height: float, color: int, radius: int = 0):
+        """Registra un rettangolo pieno; color è un intero 0xRRGGBBAA"""
+        self._append(OP_RECT, x, y, width, height, self.resources.color_id(color), radius)
+
+    def text(self, text: str, x: float, y: float, color: int, font_size: int = 14):
+        self._append(OP_TEXT, x, y, 0, 0, self.resources.color_id(color),
+                     self.resources.font_id(font_size), self.resources.text_id(text))
+
+    def set_clip(self, x: float, y: float, width: float, height: float):
+        self._append(OP_SET_CLIP, x, y, width, height)
+
+    def reset_clip(self):
+        self._append(OP_RESET_CLIP, 0, 0, 0, 0)
+
+    def commands(self, start: int = 0, end: int = None) -> Iterator[Command]:
+        """
+        Restituisce i comandi come (op, x, y, width, height, colore, parametro, testo)
+        con colore come intero 0xRRGGBBAA e, per il testo, la dimensione del font
+        """
+        resources = self.resources
+        ops, coords, args = self.ops, self.coords, self.args
+        end = len(ops) if end is None else end
+        for index in range(start, end):
+            c = index * _COORDS
+            a = index * _ARGS
+            op = ops[index]
+            color_id, param, text_id = args[a], args[a + 1], args[a + 2]
+            color = resources.colors[color_id] if color_id >= 0 else 0
+            if op == OP_TEXT:
+                param = resources.fonts[param]
+            text = resources.texts[text_id] if text_id >= 0 else None
+            yield (op, coords[c], coords[c + 1], coords[c + 2], coords[c + 3], color, param, text)
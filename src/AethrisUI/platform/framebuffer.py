@@ -0,0 +1,107 @@
+from typing import Tuple, List, Optional
+import numpy as np
+from .color import Color
+from .graphics import Canvas
+
+class FramebufferCanvas(Canvas):
+    """
+    Canvas headless basato su un framebuffer NumPy RGBA.
+
+    Mantiene lo stesso contratto di Canvas (clear, draw_rectangle,
+    draw_rounded_rectangle, draw_text, update) ma non richiede un HDC:
+    i riempimenti sono assegnazioni vettoriali su slice dell'array.
+    """
+
+    BACKGROUND = (255, 255, 255, 255)
+    retains_contents = True
+
+    def __init__(self, size: Tuple[int, int]):
+        super().__init__(size)
+        self.pixels = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        # Il testo non viene rasterizzato: le chiamate vengono registrate
+        # come (text, x, y, rgba, font_size) per test e benchmark
+        self.text_runs: List[Tuple[str, int, int, Tuple[int, int, int, int], int]] = []
+        self.frame_count = 0
+        self._clip_rect: Optional[Tuple[int, int, int, int]] = None
+        self.clear()
+
+    @property
+    def buffer(self) -> memoryview:
+        """Vista zero-copy sul framebuffer (righe x colonne x RGBA)"""
+        return memoryview(self.pixels)
+
+    def _clip(self, x: int, y: int, width: int, height: int) -> Tuple[int, int, int, int]:
+        """Limita un rettangolo all'area del framebuffer e al clip corrente"""
+        x0 = max(0, int(x))
+        y0 = max(0, int(y))
+        x1 = min(self.width, int(x) + int(width))
+        y1 = min(self.height, int(y) + int(height))
+        if self._clip_rect:
+            cx, cy, cw, ch = self._clip_rect
+            x0, y0 = max(x0, cx), max(y0, cy)
+            x1, y1 = min(x1, cx + cw), min(y1, cy + ch)
+        return x0, y0, x1, y1
+
+    def set_clip(self, rect: Tuple[int, int, int, int]):
+        """Limita i disegni successivi al rettangolo (x, y, width, height)"""
+        self._clip_rect = tuple(int(v) for v in rect)
+
+    def reset_clip(self):
+        self._clip_rect = None
+
+    def clear(self, rect: Tuple[int, int, int, int] = None):
+        """Pulisce l'intero framebuffer o solo il rettangolo (x, y, width, height)"""
+        if rect is None:
+            self.pixels[:] = self.BACKGROUND
+            self.text_runs.clear()
+            return
+
+        x0, y0, x1, y1 = self._clip(*rect)
+        if x0 < x1 and y0 < y1:
+            self.pixels[y0:y1, x0:x1] = self.BACKGROUND
+        # Scarta il testo la cui origine cade nell'area pulita
+        self.text_runs[:] = [
+            run for run in self.text_runs
+            if not (x0 <= run[1] < x1 and y0 <= run[2] < y1)
+        ]
+
+    def draw_rectangle(self, x: int, y: int, width: int, height: int, color: Color, radius: int = 0):
+        """Disegna un rettangolo, eventualmente con angoli arrotondati"""
+        if radius > 0:
+            self.draw_rounded_rectangle(x, y, width, height, radius, color)
+            return
+
+        x0, y0, x1, y1 = self._clip(x, y, width, height)
+        if x0 < x1 and y0 < y1:
+            self.pixels[y0:y1, x0:x1] = color.to_rgba()
+
+    def draw_rounded_rectangle(self, x: int, y: int, width: int, height: int, radius: int, color: Color):
+        """Disegna un rettangolo con angoli arrotondati"""
+        x0, y0, x1, y1 = self._clip(x, y, width, height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        radius = max(0, min(int(radius), int(width) // 2, int(height) // 2))
+        if radius == 0:
+            self.pixels[y0:y1, x0:x1] = color.to_rgba()
+            return
+
+        # Coordinate dei centri dei pixel rispetto al rettangolo, poi distanza
+        # dal centro dell'angolo più vicino: fuori dal raggio il pixel resta invariato
+        ys = np.arange(y0, y1, dtype=np.float32)[:, None] - y + 0.5
+        xs = np.arange(x0, x1, dtype=np.float32)[None, :] - x + 0.5
+        dx = np.maximum(np.maximum(radius - xs, xs - (width - radius)), 0)
+        dy = np.maximum(np.maximum(radius - ys, ys - (height - radius)), 0)
+        mask = dx * dx + dy * dy <= radius * radius
+
+        self.pixels[y0:y1, x0:x1][mask] = color.to_rgba()
+
+    def draw_text(self, text: str, x: int, y: int, color: Color, font_size: int = 14):
+        if self._clip_rect:
+            cx, cy, cw, ch = self._clip_rect
+            if not (cx <= x < cx + cw and cy <= y < cy + ch):
+                return
+        self.text_runs.append((text, x, y, color.to_rgba(), font_size))
+
+    def update(self):
+        self.frame_count += 1
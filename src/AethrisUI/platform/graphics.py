@@ -1,32 +1,114 @@
-from typing import Tuple, Union
-import win32gui
-import win32ui
-import win32con
-import win32api
+from typing import Tuple, Union, Dict
 from .color import Color
+from .display_list import DisplayList, OP_CLEAR, OP_RECT, OP_TEXT, OP_SET_CLIP, OP_RESET_CLIP
 import math
-from ctypes import byref, create_string_buffer, windll
+
+try:
+    import win32gui
+    import win32ui
+    import win32con
+    import win32api
+    from ctypes import byref, create_string_buffer, windll
+except ImportError:
+    # pywin32 non disponibile: Canvas resta senza HDC, usare FramebufferCanvas
+    win32gui = win32ui = win32con = win32api = None
 
 class Canvas:
+    # Indica se il contenuto disegnato resta valido tra un frame e l'altro:
+    # in tal caso il renderer può saltare la riproduzione di un frame identico
+    retains_contents = False
+    # Pennelli GDI conservati al massimo, uno per colore
+    MAX_BRUSHES = 256
+    
     def __init__(self, size: Tuple[int, int]):
         self.width = size[0]
         self.height = size[1]
         self.hdc = None
+        # Oggetti GDI riutilizzati tra i disegni, per colore 0xRRGGBBAA e dimensione del font
+        self._brushes: Dict[int, int] = {}
+        self._fonts: Dict[int, int] = {}
         
     def set_device_context(self, hdc):
         self.hdc = hdc
+    
+    def _get_brush(self, color: Color) -> int:
+        packed = color.to_packed()
+        brush = self._brushes.get(packed)
+        if brush is None:
+            if len(self._brushes) >= self.MAX_BRUSHES:
+                # I pennelli non restano selezionati nel DC: si possono eliminare tutti
+                for handle in self._brushes.values():
+                    win32gui.DeleteObject(handle)
+                self._brushes.clear()
+            brush = self._brushes[packed] = win32gui.CreateSolidBrush(color.to_windows_color())
+        return brush
+    
+    def _get_font(self, font_size: int) -> int:
+        font = self._fonts.get(font_size)
+        if font is None:
+            # Crea la struttura LOGFONT
+            lf = win32gui.LOGFONT()
+            lf.lfHeight = font_size
+            lf.lfWidth = 0
+            lf.lfWeight = win32con.FW_NORMAL
+            lf.lfItalic = 0
+            lf.lfUnderline = 0
+            lf.lfStrikeOut = 0
+            lf.lfCharSet = win32con.ANSI_CHARSET
+            lf.lfOutPrecision = win32con.OUT_DEFAULT_PRECIS
+            lf.lfClipPrecision = win32con.CLIP_DEFAULT_PRECIS
+            lf.lfQuality = win32con.DEFAULT_QUALITY
+            lf.lfPitchAndFamily = win32con.DEFAULT_PITCH | win32con.FF_DONTCARE
+            lf.lfFaceName = "Segoe UI"
+            font = self._fonts[font_size] = win32gui.CreateFontIndirect(lf)
+        return font
+    
+    def release_resources(self):
+        """Elimina gli oggetti GDI in cache (da chiamare alla chiusura della finestra)"""
+        if win32gui is not None:
+            for handle in list(self._brushes.values()) + list(self._fonts.values()):
+                win32gui.DeleteObject(handle)
+        self._brushes.clear()
+        self._fonts.clear()
+    
+    def replay(self, display_list: DisplayList, start: int = 0, end: int = None):
+        """Riproduce i comandi di una display list su questo canvas"""
+        from_packed = Color.from_packed
+        for op, x, y, width, height, color, param, text in display_list.commands(start, end):
+            if op == OP_RECT:
+                self.draw_rectangle(x, y, width, height, from_packed(color), param)
+            elif op == OP_TEXT:
+                self.draw_text(text, x, y, from_packed(color), param)
+            elif op == OP_CLEAR:
+                self.clear((x, y, width, height))
+            elif op == OP_SET_CLIP:
+                self.set_clip((x, y, width, height))
+            elif op == OP_RESET_CLIP:
+                self.reset_clip()
         
-    def clear(self):
+    def clear(self, rect: Tuple[int, int, int, int] = None):
+        """Pulisce l'intero canvas o solo il rettangolo (x, y, width, height)"""
         if self.hdc:
-            brush = win32gui.CreateSolidBrush(Color("#FFFFFF").to_windows_color())
-            win32gui.FillRect(self.hdc, (0, 0, self.width, self.height), brush)
-            win32gui.DeleteObject(brush)
+            x, y, width, height = (int(v) for v in rect) if rect else (0, 0, self.width, self.height)
+            win32gui.FillRect(self.hdc, (x, y, x + width, y + height), self._get_brush(Color.from_packed(0xFFFFFFFF)))
+    
+    def set_clip(self, rect: Tuple[int, int, int, int]):
+        """Limita i disegni successivi al rettangolo (x, y, width, height)"""
+        if self.hdc:
+            x, y, width, height = (int(v) for v in rect)
+            windll.gdi32.SelectClipRgn(self.hdc, None)
+            windll.gdi32.IntersectClipRect(self.hdc, x, y, x + width, y + height)
+    
+    def reset_clip(self):
+        if self.hdc:
+            windll.gdi32.SelectClipRgn(self.hdc, None)
             
     def draw_rounded_rectangle(self, x: int, y: int, width: int, height: int, radius: int, color: Color):
         """Disegna un rettangolo con angoli arrotondati"""
         if self.hdc:
-            # Crea il pennello per il colore di riempimento
-            brush = win32gui.CreateSolidBrush(color.to_windows_color())
+            x, y, width, height = int(x), int(y), int(width), int(height)
+            # Pennello in cache per il colore di riempimento
+            old_brush = win32gui.SelectObject(self.hdc, self._get_brush(color))
             
             # Crea il percorso per il rettangolo arrotondato
             points = []
@@ -73,8 +155,8 @@ class Canvas:
             win32gui.EndPath(self.hdc)
             win32gui.FillPath(self.hdc)
             
-            # Pulisci le risorse
-            win32gui.DeleteObject(brush)
+            # Ripristina il pennello originale
+            win32gui.SelectObject(self.hdc, old_brush)
             
     def draw_rectangle(self, x: int, y: int, width: int, height: int, color: Color, radius: int = 0):
         """Disegna un rettangolo, eventualmente con angoli arrotondati"""
@@ -82,36 +164,18 @@ class Canvas:
             self.draw_rounded_rectangle(x, y, width, height, radius, color)
         else:
             if self.hdc:
-                brush = win32gui.CreateSolidBrush(color.to_windows_color())
-                win32gui.FillRect(self.hdc, (x, y, x + width, y + height), brush)
-                win32gui.DeleteObject(brush)
+                x, y, width, height = int(x), int(y), int(width), int(height)
+                win32gui.FillRect(self.hdc, (x, y, x + width, y + height), self._get_brush(color))
     
     def draw_text(self, text: str, x: int, y: int, color: Color, font_size: int = 14):
         if self.hdc:
-            # Crea la struttura LOGFONT
-            lf = win32gui.LOGFONT()
-            lf.lfHeight = font_size
-            lf.lfWidth = 0
-            lf.lfWeight = win32con.FW_NORMAL
-            lf.lfItalic = 0
-            lf.lfUnderline = 0
-            lf.lfStrikeOut = 0
-            lf.lfCharSet = win32con.ANSI_CHARSET
-            lf.lfOutPrecision = win32con.OUT_DEFAULT_PRECIS
-            lf.lfClipPrecision = win32con.CLIP_DEFAULT_PRECIS
-            lf.lfQuality = win32con.DEFAULT_QUALITY
-            lf.lfPitchAndFamily = win32con.DEFAULT_PITCH | win32con.FF_DONTCARE
-            lf.lfFaceName = "Segoe UI"
-            
-            # Crea il font
-            font = win32gui.CreateFontIndirect(lf)
-            
+            x, y = int(x), int(y)
             # Imposta il colore del testo
             win32gui.SetTextColor(self.hdc, color.to_windows_color())
             win32gui.SetBkMode(self.hdc, win32con.TRANSPARENT)
             
-            # Seleziona il font
-            old_font = win32gui.SelectObject(self.hdc, font)
+            # Seleziona il font in cache
+            old_font = win32gui.SelectObject(self.hdc, self._get_font(font_size))
             
             # Disegna il testo
             win32gui.DrawText(
@@ -120,9 +184,8 @@ class Canvas:
                 win32con.DT_LEFT | win32con.DT_TOP | win32con.DT_SINGLELINE
             )
             
-            # Ripristina il font originale e pulisci le risorse
+            # Ripristina il font originale
             win32gui.SelectObject(self.hdc, old_font)
-            win32gui.DeleteObject(font)
     
     def update(self):
         pass
\ No newline at end of file
@@ -3,11 +3,13 @@ import win32gui
 import win32con
 import win32api
 import logging
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, Callable, Union
 from ..core import VirtualNode
+from ..core.scheduler import FrameScheduler
+from ..animation.ticker import AnimationTicker
 from .graphics import Canvas
 from .events import Event
-from ctypes import Structure, c_ulong, POINTER, byref, WINFUNCTYPE, sizeof, windll
+from ctypes import Structure, c_ulong, c_long, POINTER, byref, WINFUNCTYPE, sizeof, windll
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +31,23 @@ class TRACKMOUSEEVENT(Structure):
         ('dwHoverTime', c_ulong),
     ]
 
+class RECT(Structure):
+    _fields_ = [
+        ('left', c_long),
+        ('top', c_long),
+        ('right', c_long),
+        ('bottom', c_long),
+    ]
+
 class NativeWindow:
     _window_class_registered = False
     _window_class_name = "ModernGUIClass"
     _windows = {}
+    # Id del timer Win32 che scandisce i frame dello scheduler
+    FRAME_TIMER_ID = 1
     
-    def __init__(self, title: str = "Modern GUI Window", size: Tuple[int, int] = (800, 600)):
+    def __init__(self, title: str = "Modern GUI Window", size: Tuple[int, int] = (800, 600),
+                 target_fps: float = 60.0):
         logger.debug("Initializing NativeWindow")
         if not sys.platform == "win32":
             raise OSError("Platform not supported")
@@ -47,7 +60,15 @@ class NativeWindow:
         self._needs_render = False
         self._is_painting = False
         self._current_node = None
+        self._pending_root: Union[VirtualNode, Callable[[], VirtualNode], None] = None
         self._renderer = None
+        self._frame_timer_active = False
+        # Raccoglie render e invalidazioni e li esegue al più una volta per frame
+        self.scheduler = FrameScheduler(target_fps)
+        self.scheduler.set_wake_handler(self._start_frame_timer)
+        # Le animazioni avviate senza ticker avanzano con i frame di questa finestra
+        self.animation_ticker = AnimationTicker(self.scheduler)
+        AnimationTicker.set_current(self.animation_ticker)
         NativeWindow._windows[id(self)] = self
         self._setup_native_window()
         
@@ -68,7 +89,7 @@ class NativeWindow:
     def _init_renderer(self):
         """Inizializza il renderer dopo che la finestra è stata creata"""
         from ..core.renderer import Renderer
-        self._renderer = Renderer(self.canvas)
+        self._renderer = Renderer(self.canvas, self.scheduler, animation_ticker=self.animation_ticker)
         self._renderer.set_window(self)
     
     def _window_proc(self, hwnd: int, msg: int, wparam: int, lparam: int) -> Optional[int]:
@@ -80,6 +101,8 @@ class NativeWindow:
                 
             elif msg == win32con.WM_DESTROY:
                 logger.debug("WM_DESTROY received")
+                self._stop_frame_timer()
+                self.canvas.release_resources()
                 win32gui.PostQuitMessage(0)
                 return 0
                 
@@ -88,6 +111,12 @@ class NativeWindow:
                 self._paint()
                 return 0
                 
+            elif msg == win32con.WM_TIMER and wparam == self.FRAME_TIMER_ID:
+                self.scheduler.tick()
+                if not self.scheduler.has_pending:
+                    self._stop_frame_timer()
+                return 0
+                
             elif msg == win32con.WM_MOUSEMOVE:
                 if not self._tracking_mouse:
                     # Inizia il tracking del mouse
@@ -115,13 +144,11 @@ class NativeWindow:
                 x = win32api.LOWORD(lparam)
                 y = win32api.HIWORD(lparam)
                 if self._renderer:
-                    self._renderer._active_node = self._renderer._hovered_node
-                    self._renderer.render(self._current_node)
+                    self._renderer.set_active_node(self._renderer._hovered_node)
             
             elif msg == win32con.WM_LBUTTONUP:
                 if self._renderer:
-                    self._renderer._active_node = None
-                    self._renderer.render(self._current_node)
+                    self._renderer.set_active_node(None)
                     # Gestisci il click
                     x = win32api.LOWORD(lparam)
                     y = win32api.HIWORD(lparam)
@@ -198,13 +225,28 @@ class NativeWindow:
         logger.debug("Painting window")
         try:
             self._is_painting = True
+            # Area invalidata (dal sistema o dal renderer) da ridisegnare
+            update = RECT()
+            has_update = windll.user32.GetUpdateRect(self.handle, byref(update), False)
             hdc = win32gui.GetDC(self.handle)
             if hdc:
                 try:
                     self.canvas.set_device_context(hdc)
-                    self.canvas.clear()
                     if self._current_node:
-                        self._renderer.render(self._current_node)
+                        if self._renderer._current_tree is self._current_node:
+                            # Albero invariato: ridisegna solo le aree sporche
+                            if has_update:
+                                self._renderer.invalidate((
+                                    update.left, update.top,
+                                    update.right - update.left,
+                                    update.bottom - update.top
+                                ))
+                            self._renderer.repaint()
+                        else:
+                            self.canvas.clear()
+                            self._renderer.render(self._current_node)
+                    else:
+                        self.canvas.clear()
                 finally:
                     win32gui.ReleaseDC(self.handle, hdc)
                     rect = win32gui.GetClientRect(self.handle)
@@ -217,16 +259,46 @@ class NativeWindow:
             
         return 0
     
-    def render(self, node: VirtualNode):
+    def render(self, node: Union[VirtualNode, Callable[[], VirtualNode]]):
+        """
+        Richiede il ridisegno con il nuovo albero al prossimo frame. Accetta
+        anche una funzione che costruisce l'albero, chiamata una volta per frame:
+        più richieste tra due frame producono un solo render
+        """
         logger.debug("Rendering node")
-        if self._is_painting:
+        self._pending_root = node
+        self.scheduler.schedule(self._commit_render)
+    
+    def _commit_render(self):
+        root, self._pending_root = self._pending_root, None
+        if callable(root):
+            root = root()
+        if root is None:
             return
-            
-        self._current_node = node
+        self._current_node = root
         if self.handle:
             rect = win32gui.GetClientRect(self.handle)
             win32gui.InvalidateRect(self.handle, rect, True)
     
+    def _start_frame_timer(self, delay: float):
+        if self._frame_timer_active or not self.handle:
+            return
+        # Il timer scatta a ogni intervallo finché lo scheduler ha lavoro in attesa
+        interval = max(1, int(self.scheduler.frame_interval * 1000))
+        windll.user32.SetTimer(self.handle, self.FRAME_TIMER_ID, interval, None)
+        self._frame_timer_active = True
+    
+    def _stop_frame_timer(self):
+        if self._frame_timer_active:
+            windll.user32.KillTimer(self.handle, self.FRAME_TIMER_ID)
+            self._frame_timer_active = False
+    
+    def invalidate_rect(self, rect: Tuple[int, int, int, int]):
+        """Invalida solo il rettangolo (x, y, width, height) della client area"""
+        if self.handle:
+            x, y, width, height = rect
+            win32gui.InvalidateRect(self.handle, (x, y, x + width, y + height), False)
+    
     def run(self):
         logger.debug("Starting message loop")
         try:
@@ -1,3 +1,3 @@
 from .event_emitter import EventEmitter
 from .layout import compute_layout
-from .reconciler import reconcile 
\ No newline at end of file
+from .reconciler import reconcile
\ No newline at end of file
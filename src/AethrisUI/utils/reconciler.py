@@ -1,20 +1,178 @@
-from typing import Dict, Any, Optional
-from ..core import VirtualNode
-
-def reconcile(old_node: Optional[VirtualNode], 
-             new_node: Optional[VirtualNode], 
-             patches: Dict[str, Any]) -> None:
-    """
-    Confronta il vecchio e il nuovo albero virtuale
-    e genera le patch necessarie per l'aggiornamento
-    """
-    if old_node is None and new_node is not None:
-        patches["create"] = new_node
-    elif old_node is not None and new_node is None:
-        patches["delete"] = old_node
-    elif old_node is not None and new_node is not None:
-        if old_node.component_type != new_node.component_type:
-            patches["replace"] = new_node
-        else:
-            if old_node.props != new_node.props:
-                patches["update"] = new_node.props 
\ No newline at end of file
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass
+from ..core import VirtualNode
+
+@dataclass
+class Patch:
+    """
+    Singola operazione generata dalla riconciliazione.
+
+    op:     "create", "delete", "replace", "update", "insert", "move", "remove"
+    path:   indici dei figli dalla radice del nuovo albero; per insert, move
+            e remove è il percorso del genitore
+    node:   nodo del nuovo albero interessato dall'operazione
+    old:    nodo corrispondente del vecchio albero
+    props:  per "update", le props aggiunte o cambiate
+    removed: per "update", le chiavi delle props eliminate
+    before: per insert/move, il fratello davanti al quale posizionare il nodo:
+            il nodo del vecchio albero se già presente, altrimenti il nodo
+            inserito da una patch precedente; None significa in coda
+    """
+    op: str
+    path: Tuple[int, ...] = ()
+    node: Optional[VirtualNode] = None
+    old: Optional[VirtualNode] = None
+    props: Optional[Dict[str, Any]] = None
+    removed: Tuple[str, ...] = ()
+    before: Optional[VirtualNode] = None
+
+def reconcile(old_node: Optional[VirtualNode],
+             new_node: Optional[VirtualNode],
+             patches: Optional[List[Patch]] = None) -> List[Patch]:
+    """
+    Confronta il vecchio e il nuovo albero virtuale
+    e genera la lista ordinata di patch necessarie per l'aggiornamento.
+
+    I figli sono identificati dalla prop "key" (o dalla posizione se assente),
+    gli spostamenti sono ridotti al minimo tramite la sottosequenza crescente
+    più lunga e i sottoalberi identici per riferimento vengono saltati.
+    """
+    if patches is None:
+        patches = []
+
+    if old_node is None and new_node is not None:
+        patches.append(Patch("create", (), node=new_node))
+    elif old_node is not None and new_node is None:
+        patches.append(Patch("delete", (), old=old_node))
+    elif old_node is not None and new_node is not None:
+        _diff_node(old_node, new_node, (), patches)
+    return patches
+
+def _key(node: VirtualNode, index: int) -> Any:
+    key = node.props.get("key")
+    return ("#", index) if key is None else key
+
+def _diff_node(old: VirtualNode, new: VirtualNode, path: Tuple[int, ...], patches: List[Patch]):
+    # Stesso oggetto: l'intero sottoalbero è invariato
+    if old is new:
+        return
+
+    if old.component_type != new.component_type or old.props.get("key") != new.props.get("key"):
+        patches.append(Patch("replace", path, node=new, old=old))
+        return
+
+    if old.props is not new.props:
+        # "children" nelle props viene confrontato come lista dei figli
+        changed = {k: v for k, v in new.props.items()
+                   if k != "children" and (k not in old.props or old.props[k] is not v and old.props[k] != v)}
+        removed = tuple(k for k in old.props if k not in new.props and k != "children")
+        if changed or removed:
+            patches.append(Patch("update", path, node=new, old=old, props=changed, removed=removed))
+
+    if old.children is not new.children:
+        _diff_children(old.children or [], new.children or [], path, patches)
+
+def _diff_children(old_children: List[VirtualNode], new_children: List[VirtualNode],
+                   path: Tuple[int, ...], patches: List[Patch]):
+    # Coppie (vecchio, nuovo, indice) confrontate solo dopo aver emesso le
+    # operazioni su questo livello, così i percorsi dei figli sono già validi
+    matched: List[Tuple[VirtualNode, VirtualNode, int]] = []
+    _match_children(old_children, new_children, path, patches, matched)
+    for old, new, index in matched:
+        _diff_node(old, new, path + (index,), patches)
+
+def _match_children(old_children: List[VirtualNode], new_children: List[VirtualNode],
+                    path: Tuple[int, ...], patches: List[Patch],
+                    matched: List[Tuple[VirtualNode, VirtualNode, int]]):
+    start = 0
+    old_end = len(old_children) - 1
+    new_end = len(new_children) - 1
+
+    # Prefisso comune
+    while (start <= old_end and start <= new_end and
+           _key(old_children[start], start) == _key(new_children[start], start)):
+        matched.append((old_children[start], new_children[start], start))
+        start += 1
+
+    # Suffisso comune
+    while (start <= old_end and start <= new_end and
+           _key(old_children[old_end], old_end) == _key(new_children[new_end], new_end)):
+        matched.append((old_children[old_end], new_children[new_end], new_end))
+        old_end -= 1
+        new_end -= 1
+
+    # Primo fratello del suffisso comune, già presente nel vecchio albero
+    anchor = old_children[old_end + 1] if old_end + 1 < len(old_children) else None
+
+    # Solo inserimenti
+    if start > old_end:
+        for j in range(start, new_end + 1):
+            patches.append(Patch("insert", path, node=new_children[j], before=anchor))
+        return
+
+    # Solo rimozioni
+    if start > new_end:
+        for i in range(start, old_end + 1):
+            patches.append(Patch("remove", path, old=old_children[i]))
+        return
+
+    # Parte centrale: abbina i vecchi figli ai nuovi tramite chiave
+    new_index: Dict[Any, int] = {}
+    for j in range(start, new_end + 1):
+        new_index.setdefault(_key(new_children[j], j), j)
+
+    sources = [-1] * (new_end - start + 1)  # nuovo indice -> vecchio indice
+    for i in range(start, old_end + 1):
+        j = new_index.get(_key(old_children[i], i))
+        if j is None or sources[j - start] != -1:
+            patches.append(Patch("remove", path, old=old_children[i]))
+        else:
+            sources[j - start] = i
+
+    # I nodi nella sottosequenza crescente più lunga restano al loro posto
+    stable = _longest_increasing_subsequence(sources)
+
+    # Da destra verso sinistra, così il fratello successivo è già al suo posto
+    for offset in range(len(sources) - 1, -1, -1):
+        j = start + offset
+        child = new_children[j]
+        i = sources[offset]
+        if i == -1:
+            patches.append(Patch("insert", path, node=child, before=anchor))
+        else:
+            matched.append((old_children[i], child, j))
+            if offset not in stable:
+                patches.append(Patch("move", path, node=child, old=old_children[i], before=anchor))
+        anchor = child if i == -1 else old_children[i]
+
+def _longest_increasing_subsequence(sequence: List[int]) -> set:
+    """
+    Restituisce gli indici di una sottosequenza strettamente crescente di
+    lunghezza massima, ignorando i valori negativi (nodi nuovi)
+    """
+    tails: List[int] = []  # indice in sequence dell'ultimo elemento per lunghezza
+    previous = [-1] * len(sequence)
+
+    for index, value in enumerate(sequence):
+        if value < 0:
+            continue
+        low, high = 0, len(tails)
+        while low < high:
+            mid = (low + high) // 2
+            if sequence[tails[mid]] < value:
+                low = mid + 1
+            else:
+                high = mid
+        if low > 0:
+            previous[index] = tails[low - 1]
+        if low == len(tails):
+            tails.append(index)
+        else:
+            tails[low] = index
+
+    result = set()
+    index = tails[-1] if tails else -1
+    while index != -1:
+        result.add(index)
+        index = previous[index]
+    return result
@@ -13,6 +13,8 @@ class ButtonComponent:
         self._elevation = ElevationEffect(1, Color("#000000"))
         self._is_hovered = False
         self._is_pressed = False
+        # Finestra da aggiornare ai cambi di stato (opzionale)
+        self._window = props.get("window")
         self._setup_styles()
     
     def _setup_styles(self):
@@ -109,28 +111,30 @@ class ButtonComponent:
             }
         })
     
+    def _request_render(self):
+        # Il render viene eseguito dallo scheduler della finestra al prossimo
+        # frame: più eventi tra due frame producono un solo albero
+        if self._window:
+            self._window.render(self.render)
+    
     def _handle_mouse_enter(self, e):
         self._is_hovered = True
-        if self._window:
-            self._window.render(self.render())
+        self._request_render()
     
     def _handle_mouse_leave(self, e):
         self._is_hovered = False
         self._is_pressed = False
-        if self._window:
-            self._window.render(self.render())
+        self._request_render()
     
     def _handle_mouse_down(self, e):
         self._is_pressed = True
         ripple = RippleEffect(e.x, e.y)
         self._ripples.append(ripple)
-        if self._window:
-            self._window.render(self.render())
+        self._request_render()
     
     def _handle_mouse_up(self, e):
         self._is_pressed = False
-        if self._window:
-            self._window.render(self.render())
+        self._request_render()
 
 def Button(props: Dict[str, Any]) -> VirtualNode:
     return ButtonComponent(props).render()
\ No newline at end of file